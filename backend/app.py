@@ -2,7 +2,7 @@ from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import os
-import tempfile
+import asyncio
 from typing import Optional, Dict, List
 import uuid
 import sys
@@ -56,6 +56,7 @@ try:
     from ml.ml_scorer import get_ml_scanner
     from ml.embeddings import get_embedding_model
     from ml.semantic_matcher import get_semantic_matcher
+    from ml.model_registry import get_model_registry
     ML_AVAILABLE = True
     logger.info("✅ ML modules loaded successfully (optional feature)")
 except ImportError as e:
@@ -71,8 +72,30 @@ except ImportError as e:
     def get_semantic_matcher():
         return None
 
+# ============= EXECUTION LAYER - KEEPS CPU WORK OFF THE EVENT LOOP =============
+from ml.workers import (
+    shutdown_worker_pool, WORKER_POOL_SIZE, ML_THREAD_POOL_SIZE,
+    parse_text_async, parse_batch_async, score_resume_async,
+    analyze_job_async, scan_async, run_in_ml_thread
+)
+
+from ml.job_queue import ScanJobQueue
+from ml.parse_cache import get_parse_cache, document_cache_key, text_cache_key
+from ml.result_cache import get_result_cache, result_cache_key
+from ml.embedding_cache import get_embedding_cache
+from ml.pdf_extractors import DocumentTooLargeError, check_document_size
+from ml.sandbox import DocumentRejectedError, get_sandbox, start_sandbox_server
+from ml.parser import resolve_parser_mode
+from ml.jd_analysis import JDAnalysis
+
+# Upper bound on resumes accepted by one batch request
+MAX_BATCH_SIZE = int(os.environ.get("ATS_MAX_BATCH_SIZE", 500))
+
 app = FastAPI(title="Indian ATS Resume Scanner API")
 
+# Full scan responses keyed by (resume digest, JD digest, scorer/model version)
+result_cache = get_result_cache()
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -82,8 +105,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize components
-parser = IndianResumeParser()
+# Extraction sandbox children fork from a clean server process - start it before any model loads
+start_sandbox_server()
+
+# Initialize components (parsing runs in the worker processes, each with its own parser)
 scanner = ATSScanner()
 logger.info("✅ Core components initialized")
 
@@ -117,11 +142,13 @@ def read_root():
 async def scan_resume(
     file: UploadFile = File(...),
     job_description: str = Form(""),
-    job_title: Optional[str] = Form("")
+    job_title: Optional[str] = Form(""),
+    parser_mode: Optional[str] = Form(None)
 ):
     """
     Analyze resume against job description with debug logging
     """
+    parser_mode = _parser_mode_or_400(parser_mode)
     request_id = str(uuid.uuid4())[:8]
     logger.info(f"[{request_id}] ===== SCAN REQUEST STARTED =====")
     logger.info(f"[{request_id}] File: {file.filename}")
@@ -129,7 +156,7 @@ async def scan_resume(
     logger.info(f"[{request_id}] JD length: {len(job_description)}")
     
     try:
-        # Save uploaded file temporarily
+        # Validate file type
         file_extension = file.filename.split('.')[-1].lower()
         logger.info(f"[{request_id}] File extension: {file_extension}")
         
@@ -140,57 +167,41 @@ async def scan_resume(
                 content={"error": "Only PDF and DOCX files are supported"}
             )
         
-        # Create temp file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f'.{file_extension}')
         content = await file.read()
-        temp_file.write(content)
-        temp_file.close()
-        logger.info(f"[{request_id}] Temp file created: {temp_file.name}")
-        
-        # Parse resume
-        logger.info(f"[{request_id}] Extracting text from file...")
-        text = parser.extract_text(temp_file.name, file_extension)
-        logger.info(f"[{request_id}] Extracted text length: {len(text)}")
-        
-        logger.info(f"[{request_id}] Parsing resume...")
-        resume_data = parser.parse_resume(text)
-        logger.info(f"[{request_id}] Parsed - Sections: {list(resume_data.get('sections', {}).keys())}")
-        logger.info(f"[{request_id}] Parsed - Skills: {len(resume_data.get('skills', []))}")
-        logger.info(f"[{request_id}] Parsed - Experience: {len(resume_data.get('experience', []))}")
-        
-        # Clean up temp file
-        os.unlink(temp_file.name)
-        logger.info(f"[{request_id}] Temp file cleaned up")
-        
-        # Calculate ATS score
+        
         if not job_description:
             job_description = "Looking for a skilled professional with relevant experience."
             logger.info(f"[{request_id}] Using default job description")
         
-        logger.info(f"[{request_id}] Calculating ATS score...")
-        ats_results = scanner.calculate_ats_score(resume_data, job_description)
-        logger.info(f"[{request_id}] Score calculated: {ats_results.get('overall_score')}")
+        # Extract + parse in the worker pool, then score (result cache first)
+        logger.info(f"[{request_id}] Analyzing resume...")
+        analysis = await _analyze_resume(
+            job_description, content=content, file_type=file_extension, parser_mode=parser_mode)
+        logger.info(f"[{request_id}] Parsed - Sections: {analysis['parsed_data']['sections_found']}")
+        logger.info(f"[{request_id}] Parsed - Skills: {len(analysis['parsed_data']['skills'])}")
+        logger.info(f"[{request_id}] Parsed - Experience: {len(analysis['parsed_data']['experience'])}")
+        logger.info(f"[{request_id}] Score calculated: {analysis['ats_analysis'].get('overall_score')}")
         
         # Prepare response
         response = {
             "resume_id": str(uuid.uuid4()),
             "file_name": file.filename,
-            "parsed_data": {
-                "skills": resume_data.get("skills", []),
-                "experience": resume_data.get("experience", []),
-                "sections_found": list(resume_data.get("sections", {}).keys()),
-                "indian_info": resume_data.get("indian_specific", {})
-            },
-            "ats_analysis": ats_results,
-            "recommendations": _generate_recommendations(ats_results, resume_data)
+            **analysis
         }
         
         logger.info(f"[{request_id}] ===== SCAN REQUEST COMPLETED SUCCESSFULLY =====\n")
         return response
         
+    except DocumentTooLargeError as e:
+        logger.warning(f"[{request_id}] Rejected oversized upload: {str(e)}")
+        raise HTTPException(status_code=413, detail=str(e))
+        
+    except DocumentRejectedError as e:
+        logger.warning(f"[{request_id}] Rejected by extraction sandbox ({e.reason}): {str(e)}")
+        raise HTTPException(status_code=422, detail=f"Could not process this document: {str(e)}")
+        
     except KeyError as e:
         logger.error(f"[{request_id}] ❌ KeyError: {str(e)}")
-        logger.error(f"[{request_id}] Resume data keys: {resume_data.keys() if 'resume_data' in locals() else 'Not available'}")
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Missing key: {str(e)}")
         
@@ -202,11 +213,13 @@ async def scan_resume(
 @app.post("/api/analyze-text")
 async def analyze_resume_text(
     resume_text: str = Form(...),
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    parser_mode: Optional[str] = Form(None)
 ):
     """
     Analyze resume text directly with debug logging
     """
+    parser_mode = _parser_mode_or_400(parser_mode)
     request_id = str(uuid.uuid4())[:8]
     logger.info(f"[{request_id}] ===== ANALYZE-TEXT REQUEST STARTED =====")
     logger.info(f"[{request_id}] Resume length: {len(resume_text)}")
@@ -224,30 +237,16 @@ async def analyze_resume_text(
             logger.warning(f"[{request_id}] Job description is too short: {len(job_description)}")
             raise HTTPException(status_code=400, detail="Job description is too short")
         
-        # Parse resume from text
-        logger.info(f"[{request_id}] Parsing resume text...")
-        resume_data = parser.parse_resume(resume_text)
-        logger.info(f"[{request_id}] Parsed - Sections: {list(resume_data.get('sections', {}).keys())}")
-        logger.info(f"[{request_id}] Parsed - Skills: {len(resume_data.get('skills', []))}")
-        logger.info(f"[{request_id}] Parsed - Experience: {len(resume_data.get('experience', []))}")
-        logger.info(f"[{request_id}] Parsed - Education: {len(resume_data.get('education', []))}")
+        # Parse + score (result cache first)
+        logger.info(f"[{request_id}] Analyzing resume text...")
+        analysis = await _analyze_resume(job_description, text=resume_text, parser_mode=parser_mode)
+        logger.info(f"[{request_id}] Parsed - Sections: {analysis['parsed_data']['sections_found']}")
+        logger.info(f"[{request_id}] Parsed - Skills: {len(analysis['parsed_data']['skills'])}")
+        logger.info(f"[{request_id}] Parsed - Experience: {len(analysis['parsed_data']['experience'])}")
+        logger.info(f"[{request_id}] Score calculated: {analysis['ats_analysis'].get('overall_score')}")
+        logger.info(f"[{request_id}] Component scores: {analysis['ats_analysis'].get('component_scores', {})}")
         
-        # Calculate ATS score
-        logger.info(f"[{request_id}] Calculating ATS score...")
-        ats_results = scanner.calculate_ats_score(resume_data, job_description)
-        logger.info(f"[{request_id}] Score calculated: {ats_results.get('overall_score')}")
-        logger.info(f"[{request_id}] Component scores: {ats_results.get('component_scores', {})}")
-        
-        response = {
-            "parsed_data": {
-                "skills": resume_data.get("skills", []),
-                "experience": resume_data.get("experience", []),
-                "sections_found": list(resume_data.get("sections", {}).keys()),
-                "indian_info": resume_data.get("indian_specific", {})
-            },
-            "ats_analysis": ats_results,
-            "recommendations": _generate_recommendations(ats_results, resume_data)
-        }
+        response = dict(analysis)
         
         logger.info(f"[{request_id}] ===== ANALYZE-TEXT REQUEST COMPLETED SUCCESSFULLY =====\n")
         return response
@@ -257,7 +256,6 @@ async def analyze_resume_text(
         
     except KeyError as e:
         logger.error(f"[{request_id}] ❌ KeyError: {str(e)}")
-        logger.error(f"[{request_id}] Resume data keys: {resume_data.keys() if 'resume_data' in locals() else 'Not available'}")
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Missing key: {str(e)}")
         
@@ -266,6 +264,337 @@ async def analyze_resume_text(
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/scan/batch")
+async def scan_resume_batch(
+    files: List[UploadFile] = File(None),
+    resume_texts: List[str] = Form(None),
+    job_description: str = Form(""),
+    job_title: Optional[str] = Form(""),
+    parser_mode: Optional[str] = Form(None)
+):
+    """
+    Rank many resumes against one job description.
+    The JD is analyzed once; parsing and scoring fan out over the worker pool.
+    parser_mode="fast" skips spaCy NER for high-volume screening.
+    """
+    parser_mode = _parser_mode_or_400(parser_mode)
+    request_id = str(uuid.uuid4())[:8]
+    files = files or []
+    resume_texts = resume_texts or []
+    logger.info(f"[{request_id}] ===== BATCH SCAN STARTED =====")
+    logger.info(f"[{request_id}] Files: {len(files)}, texts: {len(resume_texts)}, JD length: {len(job_description)}")
+    
+    total = len(files) + len(resume_texts)
+    if total == 0:
+        raise HTTPException(status_code=400, detail="Provide at least one resume file or resume text")
+    if total > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch too large: {total} resumes (max {MAX_BATCH_SIZE})")
+    
+    if not job_description:
+        job_description = "Looking for a skilled professional with relevant experience."
+        logger.info(f"[{request_id}] Using default job description")
+    
+    try:
+        # JD-only work happens exactly once for the whole batch
+        jd_analysis = await analyze_job_async(scanner, job_description)
+        logger.info(f"[{request_id}] JD analyzed once for {total} resumes ({WORKER_POOL_SIZE} workers)")
+        
+        # Collect inputs before fanning out
+        items = []
+        for upload in files:
+            file_extension = upload.filename.split('.')[-1].lower()
+            items.append({
+                "name": upload.filename,
+                "kind": "file",
+                "file_type": file_extension,
+                "content": await upload.read()
+            })
+        for index, text in enumerate(resume_texts):
+            items.append({"name": f"resume_text_{index + 1}", "kind": "text", "file_type": None, "content": text})
+        
+        # Parse every resume without a cached result in one go - NER runs in nlp.pipe batches
+        to_parse = []
+        for item in items:
+            if item["kind"] == "file" and item["file_type"] not in ['pdf', 'docx']:
+                continue
+            if item["kind"] == "text":
+                cache_key = _analysis_cache_key(job_description, text=item["content"], parser_mode=parser_mode)
+            else:
+                cache_key = _analysis_cache_key(
+                    job_description, content=item["content"], file_type=item["file_type"], parser_mode=parser_mode)
+            if not result_cache.contains(cache_key):
+                to_parse.append(item)
+        
+        parsed = await parse_batch_async([
+            {"text": item["content"]} if item["kind"] == "text"
+            else {"content": item["content"], "file_type": item["file_type"]}
+            for item in to_parse
+        ], mode=parser_mode)
+        for item, resume_data in zip(to_parse, parsed):
+            item["parsed"] = resume_data
+        logger.info(f"[{request_id}] Bulk-parsed {len(to_parse)} resumes")
+        
+        async def _process(item: Dict) -> Dict:
+            try:
+                if item["kind"] == "file" and item["file_type"] not in ['pdf', 'docx']:
+                    raise ValueError("Only PDF and DOCX files are supported")
+                
+                resume_data = item.get("parsed")
+                if isinstance(resume_data, Exception):
+                    raise resume_data
+                
+                if item["kind"] == "text":
+                    analysis = await _analyze_resume(
+                        job_description, jd_analysis, text=item["content"],
+                        resume_data=resume_data, parser_mode=parser_mode)
+                else:
+                    analysis = await _analyze_resume(
+                        job_description, jd_analysis,
+                        content=item["content"], file_type=item["file_type"],
+                        resume_data=resume_data, parser_mode=parser_mode)
+                
+                return {
+                    "resume_id": str(uuid.uuid4()),
+                    "file_name": item["name"],
+                    **analysis
+                }
+            except Exception as e:
+                logger.error(f"[{request_id}] ❌ Failed on {item['name']}: {type(e).__name__}: {str(e)}")
+                return {"file_name": item["name"], "error": str(e)}
+        
+        outcomes = await asyncio.gather(*[_process(item) for item in items])
+        
+        results = [o for o in outcomes if "error" not in o]
+        errors = [o for o in outcomes if "error" in o]
+        results.sort(key=lambda r: r["ats_analysis"].get("overall_score", 0), reverse=True)
+        for rank, result in enumerate(results, start=1):
+            result["rank"] = rank
+        
+        logger.info(f"[{request_id}] ===== BATCH SCAN COMPLETED: {len(results)} ranked, {len(errors)} failed =====\n")
+        return {
+            "job_title": job_title,
+            "total": total,
+            "results": results,
+            "errors": errors
+        }
+        
+    except HTTPException:
+        raise
+        
+    except Exception as e:
+        logger.error(f"[{request_id}] ❌ Error in batch scan: {type(e).__name__}: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=f"Error processing batch: {str(e)}")
+
+@app.post("/api/analyze-text/batch")
+async def analyze_resume_against_jobs(
+    resume_text: str = Form(...),
+    job_descriptions: List[str] = Form(...),
+    job_titles: List[str] = Form(None),
+    parser_mode: Optional[str] = Form(None)
+):
+    """
+    Score one resume against many job descriptions.
+    The resume is parsed and embedded once, then scored against every JD.
+    """
+    parser_mode = _parser_mode_or_400(parser_mode)
+    request_id = str(uuid.uuid4())[:8]
+    job_titles = job_titles or []
+    logger.info(f"[{request_id}] ===== MULTI-JD ANALYZE STARTED =====")
+    logger.info(f"[{request_id}] Resume length: {len(resume_text)}, JDs: {len(job_descriptions)}")
+    
+    if not resume_text or len(resume_text.strip()) < 10:
+        raise HTTPException(status_code=400, detail="Resume text is too short")
+    if not job_descriptions:
+        raise HTTPException(status_code=400, detail="Provide at least one job description")
+    if len(job_descriptions) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Too many job descriptions: {len(job_descriptions)} (max {MAX_BATCH_SIZE})")
+    
+    try:
+        # Resume work happens exactly once for all JDs
+        resume_key = text_cache_key(resume_text, parser_mode)
+        resume_data = await parse_text_async(resume_text, parser_mode)
+        if scanner.semantic_matcher is not None:
+            await run_in_ml_thread(scanner.semantic_matcher.get_embedding, resume_text)
+        logger.info(f"[{request_id}] Resume parsed once - Skills: {len(resume_data.get('skills', []))}")
+        
+        async def _process(index: int, job_description: str) -> Dict:
+            entry = {
+                "index": index,
+                "job_title": job_titles[index] if index < len(job_titles) else ""
+            }
+            if not job_description or len(job_description.strip()) < 10:
+                entry["error"] = "Job description is too short"
+                return entry
+            try:
+                cache_key = result_cache_key(resume_key, job_description, scanner.scoring_signature())
+                analysis = result_cache.get(cache_key)
+                if analysis is None:
+                    ats_results = await score_resume_async(scanner, resume_data, job_description)
+                    analysis = _build_analysis_response(resume_data, ats_results)
+                    result_cache.put(cache_key, analysis)
+                ats_results = analysis["ats_analysis"]
+                entry.update({
+                    "overall_score": ats_results.get("overall_score"),
+                    "missing_keywords": ats_results.get("missing_keywords", []),
+                    "ats_analysis": ats_results,
+                    "recommendations": analysis["recommendations"]
+                })
+            except Exception as e:
+                logger.error(f"[{request_id}] ❌ Failed on JD #{index}: {type(e).__name__}: {str(e)}")
+                entry["error"] = str(e)
+            return entry
+        
+        results = await asyncio.gather(*[
+            _process(index, jd) for index, jd in enumerate(job_descriptions)
+        ])
+        
+        scored = [r for r in results if "error" not in r]
+        best = max(scored, key=lambda r: r["overall_score"] or 0) if scored else None
+        
+        logger.info(f"[{request_id}] ===== MULTI-JD ANALYZE COMPLETED: {len(scored)}/{len(results)} scored =====\n")
+        return {
+            "parsed_data": _format_parsed_data(resume_data),
+            "results": results,
+            "best_match_index": best["index"] if best else None
+        }
+        
+    except HTTPException:
+        raise
+        
+    except Exception as e:
+        logger.error(f"[{request_id}] ❌ Error in multi-JD analyze: {type(e).__name__}: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ============= ASYNC SCAN JOBS - SUBMIT NOW, POLL FOR RESULTS =============
+async def _run_scan_job(payload: Dict) -> Dict:
+    """Process one queued scan - same output as /api/scan or /api/analyze-text"""
+    job_description = payload["job_description"] or "Looking for a skilled professional with relevant experience."
+    
+    parser_mode = payload.get("parser_mode")
+    if payload["kind"] == "text":
+        return dict(await _analyze_resume(job_description, text=payload["content"], parser_mode=parser_mode))
+    
+    analysis = await _analyze_resume(
+        job_description, content=payload["content"], file_type=payload["file_type"], parser_mode=parser_mode)
+    return {
+        "resume_id": str(uuid.uuid4()),
+        "file_name": payload["file_name"],
+        **analysis
+    }
+
+scan_jobs = ScanJobQueue(_run_scan_job)
+
+@app.post("/api/jobs", status_code=202)
+async def submit_scan_job(
+    file: UploadFile = File(None),
+    resume_text: Optional[str] = Form(None),
+    job_description: str = Form(""),
+    job_title: Optional[str] = Form(""),
+    parser_mode: Optional[str] = Form(None)
+):
+    """
+    Queue a scan and return a job id immediately.
+    Poll GET /api/jobs/{job_id} for the status and result.
+    """
+    parser_mode = _parser_mode_or_400(parser_mode)
+    if file is not None:
+        file_extension = file.filename.split('.')[-1].lower()
+        if file_extension not in ['pdf', 'docx']:
+            raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+        payload = {
+            "kind": "file",
+            "file_name": file.filename,
+            "file_type": file_extension,
+            "content": await file.read()
+        }
+        try:
+            check_document_size(payload["content"])
+        except DocumentTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+    elif resume_text and len(resume_text.strip()) >= 10:
+        payload = {"kind": "text", "content": resume_text}
+    else:
+        raise HTTPException(status_code=400, detail="Provide a resume file or resume text")
+    
+    payload.update({"job_description": job_description, "job_title": job_title, "parser_mode": parser_mode})
+    
+    try:
+        job = scan_jobs.submit(payload)
+    except asyncio.QueueFull:
+        logger.warning("⚠️ Scan job queue is full - rejecting submission")
+        raise HTTPException(status_code=503, detail="Scan queue is full, please retry shortly")
+    
+    logger.info(f"Queued scan job {job['job_id']} ({payload['kind']})")
+    job["poll_url"] = f"/api/jobs/{job['job_id']}"
+    return job
+
+@app.get("/api/jobs/{job_id}")
+async def get_scan_job(job_id: str):
+    """Return a queued scan's status, plus its result once finished"""
+    job = scan_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or result expired")
+    return job
+
+def _parser_mode_or_400(parser_mode: Optional[str]) -> str:
+    """Resolve a request's parser_mode form field ("full"/"fast", default from ATS_PARSER_MODE)"""
+    try:
+        return resolve_parser_mode(parser_mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _analysis_cache_key(job_description: str, content: Optional[bytes] = None,
+                        file_type: Optional[str] = None, text: Optional[str] = None,
+                        parser_mode: Optional[str] = None) -> str:
+    """Result cache key for one resume (file bytes or text) against one JD"""
+    if text is not None:
+        resume_key = text_cache_key(text, parser_mode)
+    else:
+        resume_key = document_cache_key(content, file_type, parser_mode)
+    return result_cache_key(resume_key, job_description, scanner.scoring_signature())
+
+async def _analyze_resume(job_description: str, jd_analysis: Optional[JDAnalysis] = None,
+                          content: Optional[bytes] = None, file_type: Optional[str] = None,
+                          text: Optional[str] = None, resume_data: Optional[Dict] = None,
+                          parser_mode: Optional[str] = None) -> Dict:
+    """
+    Parse + score one resume (file bytes or text) behind the result cache.
+    resume_data skips parsing when the caller already has it.
+    Returns parsed_data / ats_analysis / recommendations - shared when cached, do not mutate.
+    """
+    cache_key = _analysis_cache_key(job_description, content, file_type, text, parser_mode)
+    
+    analysis = result_cache.get(cache_key)
+    if analysis is not None:
+        logger.debug("Result cache hit")
+        return analysis
+    
+    resume_data, ats_results = await scan_async(
+        scanner, job_description, jd_analysis, content=content, file_type=file_type, text=text,
+        resume_data=resume_data, parser_mode=parser_mode)
+    analysis = _build_analysis_response(resume_data, ats_results)
+    result_cache.put(cache_key, analysis)
+    return analysis
+
+def _format_parsed_data(resume_data: Dict) -> Dict:
+    """Client-facing summary of a parsed resume"""
+    return {
+        "skills": resume_data.get("skills", []),
+        "experience": resume_data.get("experience", []),
+        "sections_found": list(resume_data.get("sections", {}).keys()),
+        "indian_info": resume_data.get("indian_specific", {})
+    }
+
+def _build_analysis_response(resume_data: Dict, ats_results: Dict) -> Dict:
+    """Shape parsed data + ATS results the same way for every scan endpoint"""
+    return {
+        "parsed_data": _format_parsed_data(resume_data),
+        "ats_analysis": ats_results,
+        "recommendations": _generate_recommendations(ats_results, resume_data)
+    }
+
 def _generate_recommendations(ats_results: Dict, resume_data: Dict) -> List[str]:
     """Generate specific recommendations"""
     recommendations = []
@@ -324,7 +653,7 @@ async def ml_analyze_resume(
     
     try:
         # Parse resume using YOUR EXISTING parser (reuse, don't rewrite)
-        resume_data = parser.parse_resume(resume_text)
+        resume_data = await parse_text_async(resume_text)
         logger.info(f"[{request_id}] Parsed resume for ML - Skills: {len(resume_data.get('skills', []))}")
         
         # Extract skills from JD using simple method
@@ -343,10 +672,11 @@ async def ml_analyze_resume(
         logger.info(f"[{request_id}] Extracted {len(jd_skills)} skills from JD")
         
         # Get ML insights
-        ml_insights = ml_scanner.get_ml_insights(
-            resume_text=resume_text[:5000],  # Limit length
-            job_text=job_description[:5000],
-            resume_skills=resume_data.get("skills", [])
+        ml_insights = await run_in_ml_thread(
+            ml_scanner.get_ml_insights,
+            resume_text[:5000],  # Limit length
+            job_description[:5000],
+            resume_data.get("skills", [])
         )
         
         logger.info(f"[{request_id}] ML insights generated successfully")
@@ -381,7 +711,7 @@ async def ml_semantic_similarity(
         }
     
     try:
-        similarity = embedding_model.calculate_semantic_similarity(text1, text2)
+        similarity = await run_in_ml_thread(embedding_model.calculate_semantic_similarity, text1, text2)
         return {
             "similarity": round(similarity * 100, 2),
             "interpretation": _interpret_similarity(similarity)
@@ -421,6 +751,37 @@ def _interpret_similarity(score: float) -> str:
     else:
         return "⚠️ Very low semantic match"
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the server-side caches"""
+    return {
+        "parse_cache": get_parse_cache().stats(),
+        "embedding_cache": get_embedding_cache().stats(),
+        "result_cache": result_cache.stats(),
+        "scoring_signature": scanner.scoring_signature()
+    }
+
+@app.post("/api/cache/invalidate")
+async def invalidate_result_cache(scoring_signature: Optional[str] = Form(None)):
+    """
+    Drop cached scan results - call after changing weights or lexicons.
+    Pass a scoring_signature to drop only results from that scorer/model version.
+    """
+    removed = result_cache.invalidate(scoring_signature)
+    logger.info(f"Result cache invalidated ({removed} entries removed)")
+    return {"removed": removed, "result_cache": result_cache.stats()}
+
+@app.on_event("startup")
+async def _start_scan_jobs():
+    """Start the background scan job workers"""
+    await scan_jobs.start()
+
+@app.on_event("shutdown")
+async def _shutdown_workers():
+    """Stop background job workers and worker processes with the API"""
+    await scan_jobs.stop()
+    shutdown_worker_pool()
+
 # ============= HEALTH CHECK ENDPOINT =============
 @app.get("/api/health")
 async def health_check():
@@ -428,15 +789,22 @@ async def health_check():
     return {
         "status": "healthy",
         "core_ats": {
-            "parser": "loaded",
             "scanner": "loaded",
+            "term_statistics": scanner.term_stats.describe(),
             "status": "operational"
         },
+        "execution": {
+            "worker_processes": WORKER_POOL_SIZE,
+            "ml_threads": ML_THREAD_POOL_SIZE,
+            "extraction_sandbox": get_sandbox().stats(),
+            "scan_jobs": scan_jobs.stats()
+        },
         "ml_features": {
             "available": ML_AVAILABLE,
             "ml_scanner": ml_scanner is not None if ML_AVAILABLE else False,
             "embedding_model": embedding_model is not None if ML_AVAILABLE else False,
             "semantic_matcher": semantic_matcher is not None if ML_AVAILABLE else False,
+            "models": get_model_registry().stats() if ML_AVAILABLE else None,
             "status": "operational" if ML_AVAILABLE and ml_scanner else "not_available",
             "message": "Optional feature - core ATS works without it"
         },
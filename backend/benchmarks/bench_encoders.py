@@ -0,0 +1,86 @@
+"""
+Encoder benchmark - throughput of the PyTorch and int8 ONNX sentence encoders on
+CPU, plus the ONNX encoder's drift from PyTorch on the same texts.
+
+Usage (from backend/):
+    python -m ml.onnx_encoder export          # once, creates the ONNX export
+    python benchmarks/bench_encoders.py [path/to/texts] [--batch-sizes 1,8,32] [--repeat 3]
+
+The corpus is a directory of .txt files (one text per non-empty line); without
+one the fixed drift corpus is used. If ONNX is faster and drift stays within
+tolerance, set ATS_ENCODER_BACKEND=onnx.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml.model_registry import DEFAULT_MODEL_NAME
+from ml.onnx_encoder import DRIFT_CORPUS, OnnxEncoder, drift_report, onnx_model_dir
+
+def _load_texts(corpus: str) -> list:
+    texts = []
+    for name in sorted(os.listdir(corpus)):
+        if name.lower().endswith('.txt'):
+            with open(os.path.join(corpus, name), encoding='utf-8', errors='ignore') as f:
+                texts.extend(line.strip() for line in f if line.strip())
+    return texts
+
+def _throughput(encoder, texts: list, batch_size: int, repeat: int) -> float:
+    """Best-of-repeat texts per second; batch size 1 encodes one string per call"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if batch_size == 1:
+            for text in texts:
+                encoder.encode(text)
+        else:
+            encoder.encode(texts, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark PyTorch vs int8 ONNX sentence encoders")
+    arg_parser.add_argument("corpus", nargs="?", help="Directory of .txt files (default: fixed drift corpus)")
+    arg_parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    arg_parser.add_argument("--batch-sizes", default="1,8,32")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per encoder per batch size")
+    args = arg_parser.parse_args()
+
+    texts = _load_texts(args.corpus) if args.corpus else list(DRIFT_CORPUS)
+    if not texts:
+        print(f"No texts found in {args.corpus}")
+        return 1
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    from sentence_transformers import SentenceTransformer
+
+    encoders = {"torch": SentenceTransformer(args.model, device="cpu")}
+    try:
+        encoders["onnx-int8"] = OnnxEncoder(onnx_model_dir(args.model))
+    except Exception as e:
+        # Missing runtime or export, but also onnxruntime's own NoSuchFile/Fail/InvalidGraph
+        print(f"ONNX encoder not available ({type(e).__name__}: {e}) - timing PyTorch only")
+
+    for encoder in encoders.values():
+        encoder.encode(texts[:8])  # warm-up
+    print(f"Model: {args.model} | Texts: {len(texts)} | Repeat: {args.repeat}")
+
+    print(f"\n{'encoder':<10} {'batch':>5} {'texts/s':>9} {'ms/text':>8} {'speedup':>8}")
+    baseline = {}
+    for name, encoder in encoders.items():
+        for batch_size in batch_sizes:
+            rate = _throughput(encoder, texts, batch_size, args.repeat)
+            baseline.setdefault(batch_size, rate)
+            print(f"{name:<10} {batch_size:>5} {rate:>9.1f} {1000 / rate:>8.2f} {rate / baseline[batch_size]:>7.2f}x")
+
+    if "onnx-int8" in encoders:
+        report = drift_report(encoders["torch"], encoders["onnx-int8"], texts)
+        print(f"\nDrift vs PyTorch: min cosine {report['min_cosine']} | mean cosine {report['mean_cosine']} | "
+              f"max score error {report['max_score_error']} | mean score error {report['mean_score_error']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+PDF engine benchmark - times every installed extraction engine on a resume corpus
+and compares its text against pdfplumber (the reference engine).
+
+Usage (from backend/):
+    python benchmarks/bench_pdf_engines.py path/to/resume_pdfs [--repeat 3]
+
+Pick the fastest engine whose word overlap with pdfplumber stays high, then set
+ATS_PDF_ENGINE (e.g. "pypdfium2" or "pdfminer,pdfplumber").
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml.pdf_extractors import EXTRACTORS, join_pages
+
+def _words(text: str) -> set:
+    return set(re.findall(r'[a-z0-9+#.]+', text.lower()))
+
+def _overlap(text: str, reference: str) -> float:
+    """Jaccard overlap of word sets - 1.0 means the same vocabulary as the reference"""
+    a, b = _words(text), _words(reference)
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark PDF text extraction engines")
+    arg_parser.add_argument("corpus", help="Directory containing PDF resumes")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per file per engine")
+    args = arg_parser.parse_args()
+
+    paths = sorted(
+        os.path.join(args.corpus, name) for name in os.listdir(args.corpus)
+        if name.lower().endswith('.pdf')
+    )
+    if not paths:
+        print(f"No PDFs found in {args.corpus}")
+        return 1
+
+    documents = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            documents[path] = f.read()
+
+    engines = [extractor for extractor in EXTRACTORS.values() if extractor.available()]
+    print(f"Corpus: {len(documents)} PDFs | Engines: {', '.join(e.name for e in engines)} | Repeat: {args.repeat}")
+
+    # Reference text for the accuracy column
+    reference = {}
+    if EXTRACTORS["pdfplumber"].available():
+        for path, content in documents.items():
+            reference[path] = join_pages(EXTRACTORS["pdfplumber"].extract_pages(content))
+
+    print(f"\n{'engine':<12} {'files':>5} {'pages':>6} {'mean ms':>9} {'p95 ms':>8} {'pages/s':>9} {'overlap':>8} {'errors':>6}")
+    for extractor in engines:
+        timings, overlaps = [], []
+        pages_total, errors = 0, 0
+        for path, content in documents.items():
+            try:
+                runs = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    pages = extractor.extract_pages(content)
+                    runs.append(time.perf_counter() - start)
+                timings.append(min(runs))
+                pages_total += len(pages)
+                if path in reference:
+                    overlaps.append(_overlap(join_pages(pages), reference[path]))
+            except Exception as e:
+                errors += 1
+                print(f"  {extractor.name} failed on {os.path.basename(path)}: {e}")
+
+        if not timings:
+            print(f"{extractor.name:<12} {'-':>5} {'-':>6} {'-':>9} {'-':>8} {'-':>9} {'-':>8} {errors:>6}")
+            continue
+
+        timings_ms = sorted(t * 1000 for t in timings)
+        p95 = timings_ms[min(len(timings_ms) - 1, int(len(timings_ms) * 0.95))]
+        pages_per_sec = pages_total / sum(timings) if sum(timings) else 0
+        overlap = f"{statistics.mean(overlaps):.3f}" if overlaps else "n/a"
+        print(f"{extractor.name:<12} {len(timings):>5} {pages_total:>6} {statistics.mean(timings_ms):>9.1f} "
+              f"{p95:>8.1f} {pages_per_sec:>9.1f} {overlap:>8} {errors:>6}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Phrase Automaton - Aho-Corasick multi-pattern matcher for resume lexicons
+All phrases are compiled into one trie with failure links, so every occurrence
+of every phrase is found in a single pass over the text - cost grows with the
+text length and the number of matches, not with the size of the lexicon.
+"""
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+class PhraseAutomaton:
+    """
+    Case-insensitive phrase matcher with regex-style word boundaries.
+    A boundary is only required on a side of the phrase that starts/ends with a
+    word character, so "c++", ".net" and "node.js" match the way \\b would.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (phrase length, starts with word char, ends with word char, payload)
+        self._out: List[List[Tuple[int, bool, bool, Any]]] = [[]]
+        self._built = True
+        self.phrase_count = 0
+
+    def add(self, phrase: str, payload: Any = None):
+        """Register a phrase; payload (default: the phrase) is reported with each match"""
+        key = phrase.lower()
+        if not key:
+            return
+        node = 0
+        for ch in key:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append((
+            len(key), _is_word_char(key[0]), _is_word_char(key[-1]),
+            phrase if payload is None else payload
+        ))
+        self.phrase_count += 1
+        self._built = False
+
+    def build(self):
+        """Compute failure links breadth-first (called automatically before matching)"""
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            queue.append(node)
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                # Inherit the outputs of the longest proper suffix state
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (start, end, payload) for every boundary-respecting match, in end order.
+        Offsets index into the original text."""
+        if not self._built:
+            self.build()
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Rare characters lowercase to several code points - keep offsets aligned
+            lowered = ''.join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+        text = lowered
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        node = 0
+        for index, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = index + 1
+            for phrase_length, word_start, word_end, payload in out[node]:
+                start = end - phrase_length
+                if word_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if word_end and end < length and _is_word_char(text[end]):
+                    continue
+                yield start, end, payload
+
+    def find_all(self, text: str) -> List[Tuple[int, int, Any]]:
+        """All matches as (start, end, payload) tuples"""
+        return list(self.iter_matches(text))
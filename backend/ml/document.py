@@ -0,0 +1,121 @@
+"""
+Resume Document - Single-pass line model shared by every parser stage
+Built once per parse: stripped lines with their upper/lower forms, offsets and
+bullet flags, plus section spans, so extractors stop re-splitting and
+re-uppercasing the text and all agree on where each section starts and ends.
+"""
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional
+
+BULLET_PREFIXES = ('•', '-', '*')
+
+# Name of the pseudo-section before the first recognised header
+PREAMBLE = "header"
+
+class DocumentLine(NamedTuple):
+    index: int
+    start: int                  # offset of the raw line in the document text
+    text: str                   # stripped line
+    upper: str
+    lower: str
+    is_bullet: bool
+    is_numbered: bool           # "1. ..." style list item
+    section: str                # section this line belongs to (PREAMBLE before any header)
+    is_section_header: bool
+
+class SectionSpan(NamedTuple):
+    name: str
+    header_line: int            # index of the header line
+    start_line: int             # first line after the header
+    end_line: int               # exclusive
+    start: int                  # offset of the first content line
+    end: int                    # offset just past the section
+
+def _header_section(text: str, upper: str, section_headers: Dict[str, List[str]]) -> Optional[str]:
+    """
+    Section a line introduces, if any. The header phrase must open the line,
+    or the line must be short or all caps - so prose like "5 years of
+    experience in Java" is not mistaken for a heading.
+    """
+    words = len(upper.split())
+    opening = upper.lstrip(' •-*#:|')
+    for section, headers in section_headers.items():
+        for header in headers:
+            if header in upper and (opening.startswith(header) or words <= 4 or text == upper):
+                return section
+    return None
+
+class ResumeDocument:
+    """Lines, offsets and section spans of one resume, computed in a single pass"""
+
+    def __init__(self, text: str, section_headers: Dict[str, List[str]]):
+        self.text = text
+        self.lines: List[DocumentLine] = []
+        self.sections: List[SectionSpan] = []
+        self._line_starts: List[int] = []
+
+        current_section = PREAMBLE
+        header_line, section_start_line = None, 0
+        offset = 0
+        for index, raw in enumerate(text.split('\n')):
+            stripped = raw.strip()
+            upper = stripped.upper()
+            section = _header_section(stripped, upper, section_headers) if stripped else None
+            if section is not None:
+                if header_line is not None:
+                    self._close_section(current_section, header_line, section_start_line, index, offset)
+                current_section, header_line, section_start_line = section, index, index + 1
+
+            self._line_starts.append(offset)
+            self.lines.append(DocumentLine(
+                index=index,
+                start=offset,
+                text=stripped,
+                upper=upper,
+                lower=stripped.lower(),
+                is_bullet=stripped.startswith(BULLET_PREFIXES),
+                is_numbered=stripped[:1].isdigit() and stripped[1:2] == '.',
+                section=current_section,
+                is_section_header=section is not None
+            ))
+            offset += len(raw) + 1
+
+        if header_line is not None:
+            self._close_section(current_section, header_line, section_start_line, len(self.lines), len(text))
+
+    def _close_section(self, name: str, header_line: int, start_line: int, end_line: int, end: int):
+        start = self._line_starts[start_line] if start_line < len(self._line_starts) else end
+        self.sections.append(SectionSpan(name, header_line, start_line, end_line, start, min(end, len(self.text))))
+
+    @property
+    def content_lines(self) -> List[DocumentLine]:
+        """Non-empty lines"""
+        return [line for line in self.lines if line.text]
+
+    def line_index_at(self, offset: int) -> int:
+        """Index of the line containing a character offset"""
+        return bisect_right(self._line_starts, offset) - 1
+
+    def section_lines(self, name: str) -> List[DocumentLine]:
+        """Non-empty lines of the first section with this name"""
+        for span in self.sections:
+            if span.name == name:
+                return [line for line in self.lines[span.start_line:span.end_line] if line.text]
+        return []
+
+    def section_texts(self) -> Dict[str, str]:
+        """
+        Section name -> newline-joined non-empty lines. A repeated section keeps
+        its last non-empty occurrence; the preamble is only reported when the
+        document has no recognised headers at all.
+        """
+        if not self.sections:
+            preamble = [line.text for line in self.lines if line.text]
+            return {PREAMBLE: '\n'.join(preamble)} if preamble else {}
+
+        texts = {}
+        for span in self.sections:
+            content = [line.text for line in self.lines[span.start_line:span.end_line] if line.text]
+            if content:
+                texts[span.name] = '\n'.join(content)
+        return texts
@@ -0,0 +1,223 @@
+"""
+Embedding Cache - One bounded cache of text embeddings shared by every model wrapper
+Keys are the model id plus a SHA-256 digest of the exact text that was encoded,
+so different texts never share a vector and two models never mix. Memory is
+bounded by an LRU byte budget; an optional SQLite tier is shared by every
+worker process on the node and survives restarts.
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# In-memory budget for cached vectors (384-dim float32 ~ 1.5 KB each)
+EMBEDDING_CACHE_MAX_BYTES = int(os.environ.get("ATS_EMBEDDING_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+
+# Optional SQLite file for the persistent tier (disabled when unset)
+EMBEDDING_STORE_PATH = os.environ.get("ATS_EMBEDDING_STORE_PATH", "")
+
+# Approximate per-entry bookkeeping (key string, OrderedDict node, array header)
+_ENTRY_OVERHEAD_BYTES = 256
+
+def embedding_cache_key(model_id: str, text: str) -> str:
+    """Cache key for the embedding of exactly this text under this model"""
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return f"{model_id}|{digest}"
+
+class EmbeddingStore:
+    """
+    SQLite table of float32 vectors keyed like the memory cache. WAL mode lets
+    every worker process read concurrently while one writes; each thread (and
+    each forked process) opens its own connection.
+    """
+
+    # SQLite caps bound parameters per statement
+    _CHUNK = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.writes = 0
+        self.errors = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection (reopened after a fork)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Stored vectors for whichever keys exist (read-only arrays)"""
+        found = {}
+        try:
+            conn = self._connect()
+            for start in range(0, len(keys), self._CHUNK):
+                chunk = keys[start:start + self._CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk)
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"Embedding store read error: {e}")
+        return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        """Persist vectors in one transaction (existing keys are left alone)"""
+        if not vectors:
+            return
+        now = time.time()
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in vectors.items()]
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany("INSERT OR IGNORE INTO embeddings (key, vector, created) VALUES (?, ?, ?)", rows)
+            self.writes += len(rows)
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"Embedding store write error: {e}")
+
+    def stats(self) -> Dict:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        return {"path": self.path, "bytes": size, "writes": self.writes, "errors": self.errors}
+
+class EmbeddingCache:
+    """Thread-safe LRU (by bytes) cache of embedding vectors with an optional SQLite tier"""
+
+    def __init__(self, max_bytes: int = EMBEDDING_CACHE_MAX_BYTES, store_path: str = EMBEDDING_STORE_PATH):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.store = None
+        if store_path:
+            try:
+                self.store = EmbeddingStore(store_path)
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️ Embedding store disabled ({store_path}): {e}")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached vector (read-only, shared), checking memory and then disk"""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """get() for several keys - one lock for memory, one query for disk"""
+        with self._lock:
+            vectors = []
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                vectors.append(vector)
+
+        missing = [key for key, vector in zip(keys, vectors) if vector is None]
+        found = self.store.get_many(list(dict.fromkeys(missing))) if self.store and missing else {}
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                if vectors[index] is not None:
+                    continue
+                vector = found.get(key)
+                if vector is not None:
+                    self.disk_hits += 1
+                    self._store(key, vector)
+                    vectors[index] = vector
+                else:
+                    self.misses += 1
+        return vectors
+
+    def put(self, key: str, vector: np.ndarray) -> np.ndarray:
+        """Cache a vector and return the stored read-only copy"""
+        return self.put_many({key: vector})[key]
+
+    def put_many(self, vectors: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Cache several vectors (one disk transaction) and return the stored read-only copies"""
+        stored = {}
+        for key, vector in vectors.items():
+            copy = np.array(vector, copy=True)
+            copy.setflags(write=False)
+            stored[key] = copy
+        with self._lock:
+            for key, copy in stored.items():
+                self._store(key, copy)
+        if self.store:
+            self.store.put_many(stored)
+        return stored
+
+    def clear(self):
+        """Drop every in-memory entry (disk tier is left alone)"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes
+            }
+        stats["disk_tier"] = self.store.stats() if self.store else None
+        return stats
+
+    def _store(self, key: str, vector: np.ndarray):
+        """Insert into the LRU and evict until under budget (lock must be held)"""
+        size = vector.nbytes + _ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._current_bytes -= old.nbytes + _ENTRY_OVERHEAD_BYTES
+        self._entries[key] = vector
+        self._current_bytes += size
+        while self._current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._current_bytes -= evicted.nbytes + _ENTRY_OVERHEAD_BYTES
+            self.evictions += 1
+
+# Singleton instance - shared by ResumeEmbeddingModel and SemanticMatcher
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the embedding cache singleton"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingCache()
+    return _embedding_cache
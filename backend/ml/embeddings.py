@@ -2,7 +2,6 @@
 ML Embeddings Module - Completely separate from your existing parser
 Add this as a new file, does not affect working code
 """
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 import pickle
@@ -11,35 +10,43 @@ from typing import List, Dict, Any
 import warnings
 warnings.filterwarnings('ignore')
 
+from .embedding_cache import embedding_cache_key, get_embedding_cache
+from .model_registry import DEFAULT_MODEL_NAME, get_model_registry
+
 class ResumeEmbeddingModel:
     """ML-powered semantic analysis - OPTIONAL enhancement"""
     
     def __init__(self):
         """Initialize the ML model (lazy loading)"""
         self.model = None
-        self.embedding_cache = {}
+        self.model_name = DEFAULT_MODEL_NAME
+        self.model_id = None  # set on load - backend-specific
+        # Shared, bounded embedding cache (keyed by model + full-text digest)
+        self.embedding_cache = get_embedding_cache()
         self._model_loaded = False
     
     def _load_model(self):
         """Lazy load the model only when needed"""
         if not self._model_loaded:
-            print("🔄 Loading ML model (first time only)...")
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Shared with SemanticMatcher - one copy of the weights per process
+            registry = get_model_registry()
+            self.model = registry.encoder(self.model_name)
+            self.model_id = registry.model_id(self.model_name)
             self._model_loaded = True
-            print("✅ ML model loaded successfully!")
     
     def get_embedding(self, text: str) -> np.ndarray:
         """Convert text to vector embedding"""
         self._load_model()
         
-        # Cache to avoid recomputing
-        cache_key = hash(text[:500])  # Use first 500 chars as key
-        if cache_key in self.embedding_cache:
-            return self.embedding_cache[cache_key]
+        encoded = text[:5000]  # Limit text length
+        
+        # Cache to avoid recomputing (keyed on exactly the text that gets encoded)
+        cache_key = embedding_cache_key(self.model_id, encoded)
+        embedding = self.embedding_cache.get(cache_key)
+        if embedding is not None:
+            return embedding
         
-        embedding = self.model.encode(text[:5000])  # Limit text length
-        self.embedding_cache[cache_key] = embedding
-        return embedding
+        return self.embedding_cache.put(cache_key, self.model.encode(encoded))
     
     def calculate_semantic_similarity(self, resume_text: str, job_text: str) -> float:
         """ML-powered semantic similarity - NOT affecting your keyword matching"""
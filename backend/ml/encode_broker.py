@@ -0,0 +1,139 @@
+"""
+Encode Broker - Dynamic micro-batching of encode calls across concurrent requests
+Every in-flight scan on the ML thread pool calls encode() on the same shared
+model. The broker queues those calls, waits up to a few milliseconds for others
+to arrive, runs them as one padded forward pass, and hands each caller its rows.
+The wait only applies under load (the last batch merged several callers), so a
+lone request is encoded straight away.
+"""
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict, List, Union
+
+import numpy as np
+
+# Most texts merged into one forward pass (1 disables brokering)
+ENCODE_MAX_BATCH = int(os.environ.get("ATS_ENCODE_MAX_BATCH", 64))
+
+# Longest a call waits for others to join its batch (0: never wait - calls that
+# arrive while a batch is running still share the next one)
+ENCODE_MAX_WAIT_MS = float(os.environ.get("ATS_ENCODE_MAX_WAIT_MS", 5))
+
+class _EncodeRequest:
+    """One caller's texts and, once its batch has run, its rows"""
+    __slots__ = ("texts", "done", "result", "error")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class EncodeBroker:
+    """Wraps an encoder with the same encode() interface and batches concurrent calls"""
+
+    def __init__(self, model, max_batch_size: int = ENCODE_MAX_BATCH, max_wait_ms: float = ENCODE_MAX_WAIT_MS):
+        self.model = model
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max(max_wait_ms, 0) / 1000
+        self._start_lock = threading.Lock()
+        self._pid = None
+        # Did the last batch merge several callers? Only then is waiting for company worth it
+        self._under_load = False
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+        self.largest_batch = 0
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Same result as model.encode - 1-D for one string, one row per string for a list"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        # Non-default options (and empty input) go straight to the model
+        if kwargs or not texts:
+            return self.model.encode(sentences, batch_size=batch_size, **kwargs)
+
+        request = _EncodeRequest(texts)
+        self._ensure_dispatcher()
+        with self._ready:
+            self._pending.append(request)
+            self._pending_texts += len(texts)
+            self._ready.notify()
+        request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+        return request.result[0] if single else request.result
+
+    def _ensure_dispatcher(self):
+        """Start the dispatcher thread - again in a forked child, whose copy has no thread"""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._ready = threading.Condition()
+            self._pending = deque()
+            self._pending_texts = 0
+            threading.Thread(target=self._dispatch_loop, name="encode-broker", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _dispatch_loop(self):
+        while True:
+            with self._ready:
+                while not self._pending:
+                    self._ready.wait()
+
+                # Under load, give concurrent callers up to max_wait to join unless the batch is full
+                deadline = time.monotonic() + (self.max_wait if self._under_load else 0)
+                while self._pending_texts < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._ready.wait(remaining)
+
+                batch, size = [], 0
+                while self._pending and (not batch or size + len(self._pending[0].texts) <= self.max_batch_size):
+                    request = self._pending.popleft()
+                    batch.append(request)
+                    size += len(request.texts)
+                self._pending_texts -= size
+                self._under_load = len(batch) > 1
+
+            self._run_batch(batch, size)
+
+    def _run_batch(self, batch: List[_EncodeRequest], size: int):
+        """One forward pass for the whole batch, then fan the rows back out"""
+        try:
+            texts = [text for request in batch for text in request.texts]
+            embeddings = np.asarray(self.model.encode(texts, batch_size=self.max_batch_size))
+            offset = 0
+            for request in batch:
+                request.result = embeddings[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        finally:
+            self.requests += len(batch)
+            self.batches += 1
+            self.texts += size
+            self.largest_batch = max(self.largest_batch, size)
+            for request in batch:
+                request.done.set()
+
+    def stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "texts": self.texts,
+            "mean_batch_texts": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000
+        }
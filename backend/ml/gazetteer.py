@@ -0,0 +1,82 @@
+"""
+Gazetteer - One compiled lookup for Indian degrees, employers and locations
+Every surface form is loaded into a single PhraseAutomaton, so one pass over a
+resume finds all of them - the employer list can grow to tens of thousands of
+companies without the per-pattern regex scans slowing down.
+"""
+import os
+import re
+from typing import Iterable, List, NamedTuple, Optional
+
+from .automaton import PhraseAutomaton
+
+# Optional employer list, one company per line: "Canonical Name|Alias|Alias"
+EXTRA_COMPANIES_FILE = os.environ.get("ATS_EXTRA_COMPANIES_FILE", "")
+
+DEGREE = "degree"
+COMPANY = "company"
+LOCATION = "location"
+
+class GazetteerMatch(NamedTuple):
+    kind: str
+    key: str
+    start: int
+    end: int
+    text: str
+    canonical: Optional[str]
+
+def expand_pattern(pattern: str) -> List[str]:
+    """
+    Literal surface forms of a simple lexicon pattern - alternations ("A|B") and
+    optional dots (r"B\\.?Tech" -> "BTech", "B.Tech") are all the lexicons use
+    """
+    forms = []
+    for alternative in pattern.split('|'):
+        variants = ['']
+        for token in re.findall(r'\\\.\?|\\\.|.', alternative.strip(), re.DOTALL):
+            if token == '\\.?':
+                variants = [v + suffix for v in variants for suffix in ('', '.')]
+            else:
+                literal = '.' if token == '\\.' else token
+                variants = [v + literal for v in variants]
+        forms.extend(v for v in variants if v)
+    return list(dict.fromkeys(forms))
+
+class Gazetteer:
+    """Degrees, employers and locations compiled into one word-boundary automaton"""
+
+    def __init__(self):
+        self._automaton = PhraseAutomaton()
+        self.entry_counts = {DEGREE: 0, COMPANY: 0, LOCATION: 0}
+
+    def add(self, kind: str, key: str, surface_forms: Iterable[str], canonical: Optional[str] = None):
+        """Register surface forms that all resolve to one (kind, key) entry"""
+        for form in surface_forms:
+            self._automaton.add(form, (kind, key, canonical))
+            self.entry_counts[kind] += 1
+
+    def load_companies(self, path: str):
+        """Add employers from a "Canonical Name|Alias|Alias" file"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    names = [name.strip() for name in line.split('|') if name.strip()]
+                    if names and not names[0].startswith('#'):
+                        key = re.sub(r'\W+', '_', names[0].lower()).strip('_')
+                        self.add(COMPANY, key, names, canonical=names[0])
+        except OSError as e:
+            print(f"⚠️ Could not load company list {path}: {e}")
+
+    def build(self):
+        self._automaton.build()
+
+    def find_all(self, text: str) -> List[GazetteerMatch]:
+        """Every degree/employer/location mention in one pass, in text order"""
+        if not text:
+            return []
+        matches = [
+            GazetteerMatch(kind, key, start, end, text[start:end], canonical)
+            for start, end, (kind, key, canonical) in self._automaton.iter_matches(text)
+        ]
+        matches.sort(key=lambda m: (m.start, -m.end))
+        return matches
@@ -0,0 +1,80 @@
+"""
+JD Analysis - Everything derived from one job description, computed once per request
+Cleaned text, sentences and their embeddings, the document embedding, ranked key
+phrases, the year requirement, the skill bitset and TF-IDF term weights. Every
+ATSScanner and MLEnhancedScanner component reads them from here instead of
+re-splitting and re-encoding the JD.
+"""
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Key phrases ranked per JD - the most any component asks for (shorter lists are prefixes)
+KEY_PHRASE_COUNT = 20
+
+# Top JD terms kept for missing-keyword ranking
+TERM_WEIGHT_COUNT = 30
+
+class JDAnalysis:
+    """Request-scoped analysis of one job description (picklable - sent to worker processes)"""
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self.lower = self.text.lower()
+        # preprocess_text() form when built with a semantic matcher
+        self.cleaned = self.lower
+
+        years_match = re.search(r'(\d+)[\+]?\s*(?:years?|yrs?|yr)', self.lower)
+        self.required_years = int(years_match.group(1)) if years_match else 2
+        self.years_mentioned: List[str] = re.findall(r'(\d+)[\+]?\s*(?:years?|yrs?)', self.lower)
+        self.is_fresher_role = 'fresher' in self.lower or '0 years' in self.lower
+        self.mentions_cloud = any(word in self.lower for word in ['aws', 'azure', 'gcp', 'cloud'])
+
+        self.skill_mask = 0
+        self.term_weights: List[Tuple[str, float]] = []
+        self.term_vector = None                     # TF-IDF row - keyword scoring only
+
+        # Semantic fields - empty without a semantic matcher
+        self.sentences: List[str] = []
+        self.sentence_embeddings: Optional[np.ndarray] = None   # first 20 sentences
+        self.doc_embedding: Optional[np.ndarray] = None
+        self.probe_embedding: Optional[np.ndarray] = None       # first 1000 chars - what skills are compared against
+        self.key_phrases: List[str] = []                        # ranked, KEY_PHRASE_COUNT at most
+
+def build_jd_analysis(text: str, skill_taxonomy=None, term_stats=None, semantic_matcher=None,
+                      keyword_vector: bool = False) -> JDAnalysis:
+    """
+    Analyse a JD once. Pass whichever components the caller scores with - the
+    skill taxonomy (bitset), term statistics (weights, plus the TF-IDF row when
+    keyword_vector is set) and the semantic matcher (sentences, embeddings and
+    key phrases).
+    """
+    analysis = JDAnalysis(text)
+
+    if skill_taxonomy is not None:
+        analysis.skill_mask = skill_taxonomy.text_mask(analysis.lower)
+
+    if term_stats is not None:
+        try:
+            analysis.term_weights = term_stats.term_weights(analysis.lower, top_k=TERM_WEIGHT_COUNT)
+            if keyword_vector and analysis.text:
+                analysis.term_vector = term_stats.transform([analysis.text])
+        except Exception as e:
+            print(f"JD keyword weighting error: {e}")
+
+    if semantic_matcher is not None and analysis.text:
+        try:
+            analysis.cleaned = semantic_matcher.preprocess_text(analysis.text)
+            analysis.doc_embedding = semantic_matcher.get_embedding(analysis.text)
+            analysis.probe_embedding = semantic_matcher.get_embedding(analysis.text[:1000])
+            analysis.sentences = semantic_matcher.split_sentences(analysis.text)
+            if analysis.sentences:
+                analysis.sentence_embeddings = semantic_matcher.embed_sentences(analysis.sentences)
+                analysis.key_phrases = semantic_matcher.rank_key_phrases(
+                    analysis.sentences, analysis.sentence_embeddings, analysis.doc_embedding, KEY_PHRASE_COUNT
+                )
+        except Exception as e:
+            print(f"JD analysis error: {e}")
+
+    return analysis
@@ -0,0 +1,153 @@
+"""
+Scan Job Queue - Accepts scans immediately and processes them in the background
+Clients get a job id back right away and poll for the result, so bursts are
+queued instead of timing out. Finished results are kept for a limited time.
+"""
+import os
+import time
+import uuid
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of jobs processed concurrently
+JOB_WORKERS = int(os.environ.get("ATS_JOB_WORKERS", 4))
+
+# Max jobs waiting in the queue before new submissions are rejected
+MAX_QUEUED_JOBS = int(os.environ.get("ATS_MAX_QUEUED_JOBS", 1000))
+
+# How long finished (completed or failed) results are retained, in seconds
+JOB_RESULT_TTL = int(os.environ.get("ATS_JOB_RESULT_TTL", 3600))
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+class ScanJobQueue:
+    """In-process queue of scan jobs with polling and TTL-based result retention"""
+
+    def __init__(self, handler: Callable[[Dict], Awaitable[Dict]],
+                 workers: int = JOB_WORKERS,
+                 max_queued: int = MAX_QUEUED_JOBS,
+                 result_ttl: int = JOB_RESULT_TTL):
+        self.handler = handler
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start the background workers (call once the event loop is running)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+        logger.info(f"✅ Scan job queue started ({self.workers} workers, {self.max_queued} max queued)")
+
+    async def stop(self):
+        """Cancel the background workers"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, payload: Dict) -> Dict:
+        """Queue a job and return its public view. Raises asyncio.QueueFull when saturated."""
+        if self._queue is None:
+            raise RuntimeError("Scan job queue is not running")
+        self._purge_expired()
+
+        job_id = str(uuid.uuid4())
+        job = {
+            "job_id": job_id,
+            "status": QUEUED,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "expires_at": None,
+            "result": None,
+            "error": None,
+            "payload": payload
+        }
+        self._queue.put_nowait(job_id)
+        self.jobs[job_id] = job
+        return self._public_view(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the job's status/result, or None if unknown or expired"""
+        self._purge_expired()
+        job = self.jobs.get(job_id)
+        return self._public_view(job) if job else None
+
+    def stats(self) -> Dict:
+        """Queue depth and job counts by status"""
+        counts = {QUEUED: 0, RUNNING: 0, COMPLETED: 0, FAILED: 0}
+        for job in self.jobs.values():
+            counts[job["status"]] += 1
+        return {
+            "running": bool(self._tasks),
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queued": self.max_queued,
+            "result_ttl_seconds": self.result_ttl,
+            "jobs": counts
+        }
+
+    async def _worker(self, index: int):
+        """Pull jobs off the queue forever"""
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            try:
+                if job is None:
+                    continue
+                job["status"] = RUNNING
+                job["started_at"] = time.time()
+                try:
+                    job["result"] = await self.handler(job["payload"])
+                    job["status"] = COMPLETED
+                except Exception as e:
+                    logger.error(f"❌ Scan job {job_id} failed: {type(e).__name__}: {str(e)}")
+                    job["error"] = str(e)
+                    job["status"] = FAILED
+                finally:
+                    # Input bytes are no longer needed once the job has run
+                    job["payload"] = None
+                    job["finished_at"] = time.time()
+                    job["expires_at"] = job["finished_at"] + self.result_ttl
+            finally:
+                self._queue.task_done()
+
+    def _purge_expired(self):
+        """Drop finished jobs whose retention window has passed"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job["expires_at"] is not None and job["expires_at"] <= now
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def _public_view(self, job: Dict) -> Dict:
+        """Strip internal fields before returning a job to clients"""
+        view = {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+            "expires_at": job["expires_at"]
+        }
+        if job["status"] == COMPLETED:
+            view["result"] = job["result"]
+        elif job["status"] == FAILED:
+            view["error"] = job["error"]
+        return view
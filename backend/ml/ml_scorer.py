@@ -2,10 +2,12 @@
 ML-Enhanced ATS Scorer - Updated with semantic matching capabilities
 """
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import numpy as np
 from .embeddings import get_embedding_model
 from .semantic_matcher import get_semantic_matcher  # NEW import
+from .jd_analysis import JDAnalysis, build_jd_analysis
+from .term_stats import get_term_statistics
 
 class MLEnhancedScanner:
     """
@@ -58,27 +60,49 @@ class MLEnhancedScanner:
                 'weight': 0.6
             }
         }
+        
+        # Category skills with their taxonomy bitsets, computed once for gap suggestions
+        taxonomy = self.semantic_matcher.skill_taxonomy
+        self.category_skill_masks = {
+            category: [(skill, taxonomy.text_mask(skill)) for skill in data['skills']]
+            for category, data in self.skill_categories.items()
+        }
+        self.category_skill_list = [skill for skills in self.category_skill_masks.values() for skill, _ in skills]
+    
+    def analyze_job(self, job_text: str) -> JDAnalysis:
+        """Analyse the JD once - pass the result to every insight method of one request"""
+        return build_jd_analysis(
+            job_text,
+            skill_taxonomy=self.semantic_matcher.skill_taxonomy,
+            term_stats=get_term_statistics(),
+            semantic_matcher=self.semantic_matcher
+        )
     
-    def get_semantic_score(self, resume_text: str, job_text: str) -> Dict[str, Any]:
+    def get_semantic_score(self, resume_text: str, job_text: str,
+                           jd_analysis: Optional[JDAnalysis] = None) -> Dict[str, Any]:
         """Enhanced ML-based semantic understanding using semantic matcher"""
+        if jd_analysis is None:
+            jd_analysis = self.analyze_job(job_text)
         
         # Get semantic similarity from the matcher
-        similarity = self.semantic_matcher.calculate_semantic_similarity(resume_text, job_text)
+        similarity = self.semantic_matcher.calculate_semantic_similarity(
+            resume_text, job_text, job_embedding=jd_analysis.doc_embedding
+        )
         
         # Get key phrases from resume
         key_phrases = self.semantic_matcher.extract_key_phrases(resume_text, 5)
         
         # Get job key phrases for comparison
-        job_phrases = self.semantic_matcher.extract_key_phrases(job_text, 5)
+        job_phrases = jd_analysis.key_phrases[:5]
         
-        # Calculate section-wise scores
+        # Calculate section-wise scores - first 10 sentences, embedded in one batch
         section_scores = {}
-        sentences = resume_text.split('.')
-        for sentence in sentences[:10]:  # Check first 10 sentences
-            if len(sentence.strip()) > 30:
-                sent_sim = self.semantic_matcher.calculate_semantic_similarity(sentence, job_text)
+        sentences = [sentence for sentence in resume_text.split('.')[:10] if len(sentence.strip()) > 30]
+        if sentences and jd_analysis.doc_embedding is not None:
+            sent_sims = self.semantic_matcher.similarities_to(sentences, jd_analysis.doc_embedding)
+            for sentence, sent_sim in zip(sentences, sent_sims):
                 if sent_sim > 0.6:
-                    section_scores[sentence[:50]] = round(sent_sim * 100, 1)
+                    section_scores[sentence[:50]] = round(float(sent_sim) * 100, 1)
         
         return {
             "semantic_similarity": round(similarity * 100, 2),
@@ -89,7 +113,8 @@ class MLEnhancedScanner:
             "ml_version": self.ml_version
         }
     
-    def get_skill_intelligence(self, resume_skills: List[str], job_text: str) -> Dict[str, Any]:
+    def get_skill_intelligence(self, resume_skills: List[str], job_text: str,
+                               jd_analysis: Optional[JDAnalysis] = None) -> Dict[str, Any]:
         """Enhanced skill intelligence using semantic matching"""
         
         if not resume_skills:
@@ -102,39 +127,74 @@ class MLEnhancedScanner:
             }
         
         # Extract potential skills from job description using semantic matcher
-        job_phrases = self.semantic_matcher.extract_key_phrases(job_text, 20)
+        if jd_analysis is None:
+            jd_analysis = self.analyze_job(job_text)
+        job_phrases = jd_analysis.key_phrases[:20]
         
         skill_gaps = []
         skill_suggestions = []
         matched_skills = []
+        best_score = 0
         
-        # Check each job phrase against resume skills
+        # Resume skills as taxonomy bitsets, once - each phrase is then a bitwise and per skill
+        taxonomy = self.semantic_matcher.skill_taxonomy
+        resume_skill_masks = [(skill, skill.lower(), taxonomy.text_mask(skill)) for skill in resume_skills if skill]
+        
+        # Taxonomy matches first: resume skill matched by each job phrase (None = no bitset hit)
+        phrase_matches = []
         for phrase in job_phrases:
-            found = False
-            best_match = None
-            best_score = 0
-            
-            for res_skill in resume_skills:
-                # Use semantic matching to find related skills
-                if self.semantic_matcher.find_similar_skills(phrase, res_skill, threshold=0.65):
-                    found = True
-                    matched_skills.append({
-                        'job_skill': phrase,
-                        'resume_skill': res_skill,
-                        'match_score': best_score
-                    })
-                    break
-            
-            if not found:
+            phrase_lower = phrase.lower()
+            phrase_mask = taxonomy.mask(phrase)
+            phrase_matches.append(next((skill for skill, skill_lower, mask in resume_skill_masks
+                                        if phrase_mask & mask or phrase_lower in skill_lower), None))
+        
+        # Use semantic matching for the rest - one similarity matrix against all resume skills
+        pending = [index for index, match in enumerate(phrase_matches) if match is None]
+        if pending and resume_skill_masks:
+            try:
+                similarities = self.semantic_matcher.similarity_matrix(
+                    [job_phrases[index] for index in pending],
+                    [skill[:1000] for skill, _, _ in resume_skill_masks]
+                )
+                for row, index in enumerate(pending):
+                    hits = np.flatnonzero(similarities[row] > 0.65)
+                    if hits.size:
+                        phrase_matches[index] = resume_skill_masks[hits[0]][0]
+            except Exception as e:
+                print(f"Semantic similarity error: {e}")
+        
+        for phrase, res_skill in zip(job_phrases, phrase_matches):
+            if res_skill is not None:
+                matched_skills.append({
+                    'job_skill': phrase,
+                    'resume_skill': res_skill,
+                    'match_score': best_score
+                })
+            else:
                 skill_gaps.append(phrase)
-                
-                # Suggest related skills from categories
-                for category, data in self.skill_categories.items():
-                    category_skills = data['skills'] if isinstance(data, dict) else data
-                    for cat_skill in category_skills:
-                        if self.semantic_matcher.find_similar_skills(phrase, cat_skill, threshold=0.5):
-                            skill_suggestions.append(cat_skill)
-                            break
+        
+        # Suggest related skills from categories - bitsets first, then one matrix for the gaps
+        gap_similarities = None
+        if skill_gaps:
+            try:
+                gap_similarities = self.semantic_matcher.similarity_matrix(skill_gaps, self.category_skill_list)
+            except Exception as e:
+                print(f"Semantic similarity error: {e}")
+        
+        for row, phrase in enumerate(skill_gaps):
+            phrase_lower = phrase.lower()
+            phrase_mask = taxonomy.mask(phrase)
+            offset = 0
+            for category_skills in self.category_skill_masks.values():
+                suggestion = next((skill for skill, mask in category_skills
+                                   if phrase_mask & mask or phrase_lower in skill), None)
+                if suggestion is None and gap_similarities is not None:
+                    hits = np.flatnonzero(gap_similarities[row, offset:offset + len(category_skills)] > 0.5)
+                    if hits.size:
+                        suggestion = category_skills[hits[0]][0]
+                if suggestion is not None:
+                    skill_suggestions.append(suggestion)
+                offset += len(category_skills)
         
         # Calculate overall skill match score
         total_relevant = len(job_phrases)
@@ -150,8 +210,11 @@ class MLEnhancedScanner:
             "detailed_matches": matched_skills[:5]
         }
     
-    def get_experience_insights(self, resume_text: str, job_text: str) -> Dict[str, Any]:
+    def get_experience_insights(self, resume_text: str, job_text: str,
+                                jd_analysis: Optional[JDAnalysis] = None) -> Dict[str, Any]:
         """Enhanced experience analysis using semantic matching"""
+        if jd_analysis is None:
+            jd_analysis = self.analyze_job(job_text)
         
         # Extract experience-related sentences
         exp_keywords = ['experience', 'worked', 'work', 'developed', 'led', 'managed', 'created']
@@ -163,19 +226,21 @@ class MLEnhancedScanner:
                 exp_sentences.append(sentence.strip())
         
         # Check job for experience requirements
-        job_has_exp = any(kw in job_text.lower() for kw in ['experience', 'years', 'yr'])
+        job_has_exp = any(kw in jd_analysis.lower for kw in ['experience', 'years', 'yr'])
         
         # Calculate experience relevance score
         exp_relevance = 0
         if exp_sentences:
             # Get embedding of experience section
             exp_text = '. '.join(exp_sentences[:3])
-            exp_relevance = self.semantic_matcher.calculate_semantic_similarity(exp_text, job_text)
+            exp_relevance = self.semantic_matcher.calculate_semantic_similarity(
+                exp_text, job_text, job_embedding=jd_analysis.doc_embedding
+            )
         
         # Extract years of experience mentioned
         years_pattern = r'(\d+)[\+]?\s*(?:years?|yrs?)'
         resume_years = re.findall(years_pattern, resume_text.lower())
-        job_years = re.findall(years_pattern, job_text.lower())
+        job_years = jd_analysis.years_mentioned
         
         return {
             "has_experience_section": len(exp_sentences) > 0,
@@ -187,8 +252,11 @@ class MLEnhancedScanner:
             "experience_match": exp_relevance > 0.6
         }
     
-    def get_education_insights(self, resume_text: str, job_text: str) -> Dict[str, Any]:
+    def get_education_insights(self, resume_text: str, job_text: str,
+                               jd_analysis: Optional[JDAnalysis] = None) -> Dict[str, Any]:
         """NEW: Education insights using semantic matching"""
+        if jd_analysis is None:
+            jd_analysis = self.analyze_job(job_text)
         
         education_keywords = ['b.tech', 'b.e', 'm.tech', 'mca', 'b.sc', 'm.sc', 'phd', 'bachelor', 'master']
         
@@ -210,13 +278,15 @@ class MLEnhancedScanner:
                 in_edu = False
         
         # Check job for education requirements
-        job_requires_edu = any(kw in job_text.lower() for kw in education_keywords)
+        job_requires_edu = any(kw in jd_analysis.lower for kw in education_keywords)
         
         # Calculate education relevance
         edu_relevance = 0
         if edu_sentences:
             edu_text = ' '.join(edu_sentences)
-            edu_relevance = self.semantic_matcher.calculate_semantic_similarity(edu_text, job_text)
+            edu_relevance = self.semantic_matcher.calculate_semantic_similarity(
+                edu_text, job_text, job_embedding=jd_analysis.doc_embedding
+            )
         
         return {
             "has_education_section": len(edu_sentences) > 0,
@@ -226,22 +296,24 @@ class MLEnhancedScanner:
             "education_match": edu_relevance > 0.5
         }
     
-    def get_semantic_gaps(self, resume_text: str, job_text: str) -> List[Dict[str, Any]]:
+    def get_semantic_gaps(self, resume_text: str, job_text: str,
+                          jd_analysis: Optional[JDAnalysis] = None) -> List[Dict[str, Any]]:
         """NEW: Identify semantic gaps between resume and job"""
+        if jd_analysis is None:
+            jd_analysis = self.analyze_job(job_text)
         
         # Get key phrases from both
         resume_phrases = self.semantic_matcher.extract_key_phrases(resume_text, 10)
-        job_phrases = self.semantic_matcher.extract_key_phrases(job_text, 10)
+        job_phrases = jd_analysis.key_phrases[:10]
+        
+        # Every job phrase against every resume phrase in one similarity matrix
+        if job_phrases and resume_phrases:
+            covered = (self.semantic_matcher.similarity_matrix(job_phrases, resume_phrases) > 0.7).any(axis=1)
+        else:
+            covered = [False] * len(job_phrases)
         
         gaps = []
-        for job_phrase in job_phrases:
-            found = False
-            for res_phrase in resume_phrases:
-                similarity = self.semantic_matcher.calculate_semantic_similarity(job_phrase, res_phrase)
-                if similarity > 0.7:
-                    found = True
-                    break
-            
+        for job_phrase, found in zip(job_phrases, covered):
             if not found:
                 # Find related skills to suggest
                 suggestions = []
@@ -260,14 +332,19 @@ class MLEnhancedScanner:
         return gaps[:5]
     
     def get_comprehensive_insights(self, resume_text: str, job_text: str,
-                                  resume_skills: List[str]) -> Dict[str, Any]:
+                                  resume_skills: List[str],
+                                  jd_analysis: Optional[JDAnalysis] = None) -> Dict[str, Any]:
         """NEW: Comprehensive analysis combining all insights"""
         
-        semantic = self.get_semantic_score(resume_text, job_text)
-        skills = self.get_skill_intelligence(resume_skills, job_text)
-        experience = self.get_experience_insights(resume_text, job_text)
-        education = self.get_education_insights(resume_text, job_text)
-        gaps = self.get_semantic_gaps(resume_text, job_text)
+        # The JD is split, embedded and ranked once for all five analyses
+        if jd_analysis is None:
+            jd_analysis = self.analyze_job(job_text)
+        
+        semantic = self.get_semantic_score(resume_text, job_text, jd_analysis)
+        skills = self.get_skill_intelligence(resume_skills, job_text, jd_analysis)
+        experience = self.get_experience_insights(resume_text, job_text, jd_analysis)
+        education = self.get_education_insights(resume_text, job_text, jd_analysis)
+        gaps = self.get_semantic_gaps(resume_text, job_text, jd_analysis)
         
         # Calculate overall match score
         match_score = (
@@ -304,22 +381,24 @@ class MLEnhancedScanner:
             return "⚠️ Very low semantic match - resume needs major restructuring"
     
     def get_ml_insights(self, resume_text: str, job_text: str, 
-                       resume_skills: List[str]) -> Dict[str, Any]:
+                       resume_skills: List[str],
+                       jd_analysis: Optional[JDAnalysis] = None) -> Dict[str, Any]:
         """
         Main method - returns comprehensive ML insights
         Call this alongside your existing scanner for enhanced analysis
         """
-        return self.get_comprehensive_insights(resume_text, job_text, resume_skills)
+        return self.get_comprehensive_insights(resume_text, job_text, resume_skills, jd_analysis)
 
 # For backward compatibility - simple insights
 def get_simple_ml_insights(resume_text: str, job_text: str, 
                           resume_skills: List[str]) -> Dict[str, Any]:
     """Simpler version for backward compatibility"""
     scanner = get_ml_scanner()
+    jd_analysis = scanner.analyze_job(job_text)
     return {
-        "semantic_analysis": scanner.get_semantic_score(resume_text, job_text),
-        "skill_intelligence": scanner.get_skill_intelligence(resume_skills, job_text),
-        "experience_insights": scanner.get_experience_insights(resume_text, job_text),
+        "semantic_analysis": scanner.get_semantic_score(resume_text, job_text, jd_analysis),
+        "skill_intelligence": scanner.get_skill_intelligence(resume_skills, job_text, jd_analysis),
+        "experience_insights": scanner.get_experience_insights(resume_text, job_text, jd_analysis),
         "ml_version": scanner.ml_version,
         "note": "ML-powered insights using semantic understanding"
     }
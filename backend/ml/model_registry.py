@@ -0,0 +1,155 @@
+"""
+Model Registry - One lazily loaded sentence encoder per model name, per process
+ResumeEmbeddingModel and SemanticMatcher both ask the registry for their encoder,
+so a worker holds a single copy of the weights and tokenizer however many
+wrappers use it. stats() reports what each loaded model costs this worker.
+ATS_ENCODER_BACKEND=onnx swaps in the int8 ONNX Runtime encoder where an export
+exists (see onnx_encoder), falling back to PyTorch otherwise. encoder() puts
+the model behind an EncodeBroker so concurrent requests share forward passes.
+"""
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+from sentence_transformers import SentenceTransformer
+
+from .encode_broker import ENCODE_MAX_BATCH, EncodeBroker
+
+# Default sentence encoder (hub id without the "sentence-transformers/" org prefix)
+DEFAULT_MODEL_NAME = os.environ.get("ATS_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+
+# "torch" (SentenceTransformer) or "onnx" (int8 ONNX Runtime, needs an export)
+ENCODER_BACKEND = os.environ.get("ATS_ENCODER_BACKEND", "torch").strip().lower()
+
+# Suffix on model ids of ONNX-encoded vectors - they differ slightly, so never share cache entries
+ONNX_MODEL_SUFFIX = "+onnx-int8"
+
+_HUB_PREFIX = "sentence-transformers/"
+
+def canonical_model_name(model_name: str) -> str:
+    """'sentence-transformers/all-MiniLM-L6-v2' and 'all-MiniLM-L6-v2' are the same model"""
+    name = model_name.strip()
+    return name[len(_HUB_PREFIX):] if name.startswith(_HUB_PREFIX) else name
+
+def process_rss_bytes() -> int:
+    """Resident set size of this process (0 where it cannot be read)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def _weight_bytes(model) -> int:
+    """Bytes held by the model's parameters and buffers"""
+    if hasattr(model, "weight_bytes"):
+        return model.weight_bytes
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors)
+    except Exception:
+        return 0
+
+class ModelRegistry:
+    """Thread-safe map of model name -> loaded encoder, loaded on first use"""
+
+    def __init__(self, backend: str = ENCODER_BACKEND):
+        self.backend = backend
+        self._models: Dict[str, object] = {}
+        self._model_ids: Dict[str, str] = {}
+        self._brokers: Dict[str, EncodeBroker] = {}
+        self._info: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str = DEFAULT_MODEL_NAME):
+        """The shared encoder for model_name, loading it the first time"""
+        name = canonical_model_name(model_name)
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+                self._models[name] = model
+        return model
+
+    def encoder(self, model_name: str = DEFAULT_MODEL_NAME):
+        """What wrappers call encode() on - the shared model behind its encode broker"""
+        model = self.get(model_name)
+        if ENCODE_MAX_BATCH <= 1:
+            return model
+
+        name = canonical_model_name(model_name)
+        broker = self._brokers.get(name)
+        if broker is None:
+            with self._lock:
+                broker = self._brokers.setdefault(name, EncodeBroker(model))
+        return broker
+
+    def model_id(self, model_name: str = DEFAULT_MODEL_NAME) -> str:
+        """Identifies the vectors the loaded encoder produces - use it in cache keys and signatures"""
+        name = canonical_model_name(model_name)
+        self.get(name)
+        return self._model_ids[name]
+
+    def _load(self, name: str):
+        """Load one encoder and record its footprint (lock must be held)"""
+        print(f"🔄 Loading sentence encoder {name} (once per process)...")
+        rss_before = process_rss_bytes()
+        start = time.perf_counter()
+        model, backend = None, "torch"
+        if self.backend == "onnx":
+            try:
+                from .onnx_encoder import OnnxEncoder, onnx_model_dir
+
+                model, backend = OnnxEncoder(onnx_model_dir(name)), "onnx-int8"
+            except Exception as e:
+                # Missing runtime or export, but also onnxruntime's own NoSuchFile/Fail/InvalidGraph
+                print(f"⚠️ ONNX encoder unavailable for {name}, using PyTorch: {type(e).__name__}: {e}")
+        if model is None:
+            model = SentenceTransformer(name)
+        load_seconds = time.perf_counter() - start
+
+        self._model_ids[name] = name + ONNX_MODEL_SUFFIX if backend == "onnx-int8" else name
+        self._info[name] = {
+            "backend": backend,
+            "dimension": model.get_sentence_embedding_dimension(),
+            "weight_bytes": _weight_bytes(model),
+            "rss_delta_bytes": max(process_rss_bytes() - rss_before, 0),
+            "load_seconds": round(load_seconds, 2)
+        }
+        print(f"✅ Sentence encoder {name} ({backend}) loaded in {load_seconds:.1f}s")
+        return model
+
+    def stats(self) -> Dict:
+        """Loaded models and this worker's memory footprint"""
+        with self._lock:
+            models = {name: dict(info) for name, info in self._info.items()}
+            for name, broker in self._brokers.items():
+                models[name]["batching"] = broker.stats()
+        return {
+            "pid": os.getpid(),
+            "models": models,
+            "weight_bytes": sum(info["weight_bytes"] for info in models.values()),
+            "process_rss_bytes": process_rss_bytes()
+        }
+
+# Singleton instance - one registry (and so one copy of each model) per process
+_model_registry: Optional[ModelRegistry] = None
+_model_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create the model registry singleton"""
+    global _model_registry
+    if _model_registry is None:
+        with _model_registry_lock:
+            if _model_registry is None:
+                _model_registry = ModelRegistry()
+    return _model_registry
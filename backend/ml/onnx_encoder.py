@@ -0,0 +1,213 @@
+"""
+ONNX Encoder - int8-quantized sentence encoder under ONNX Runtime for CPU nodes
+Drop-in for SentenceTransformer.encode: same tokenizer, mean pooling and
+normalization, with the transformer exported once to ONNX and dynamically
+quantized to int8. Enable with ATS_ENCODER_BACKEND=onnx (see model_registry).
+
+Export, then check drift against the PyTorch encoder (from backend/):
+    python -m ml.onnx_encoder export [--model all-MiniLM-L6-v2]
+    python -m ml.onnx_encoder check [--model all-MiniLM-L6-v2] [--min-cosine 0.98]
+"""
+import os
+import json
+import argparse
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+# Bump when the exported layout changes - older exports are refused
+ONNX_ENCODER_FORMAT = 1
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+
+# One sub-directory per model name
+ONNX_MODELS_DIR = os.environ.get("ATS_ONNX_MODELS_DIR", os.path.join(MODELS_DIR, "onnx"))
+
+# Intra-op threads per session (0 = ONNX Runtime default, one per core)
+ONNX_THREADS = int(os.environ.get("ATS_ONNX_THREADS", 0))
+
+QUANTIZED_FILE = "model.int8.onnx"
+CONFIG_FILE = "encoder.json"
+
+# Fixed corpus for the drift check - resume lines, JD lines and bare skills
+DRIFT_CORPUS = [
+    "Python developer with 3 years of experience in Django and REST APIs",
+    "Built data pipelines on AWS using Lambda, S3 and Glue",
+    "Frontend engineer skilled in React, TypeScript and Redux",
+    "Managed Kubernetes clusters and CI/CD pipelines with Jenkins",
+    "B.Tech in Computer Science from VIT Vellore, CGPA 8.4",
+    "Fresher looking for a software engineering role",
+    "Trained machine learning models with scikit-learn and TensorFlow",
+    "Designed MySQL and MongoDB schemas for an e-commerce platform",
+    "Led a team of 5 engineers delivering a payments microservice in Java Spring Boot",
+    "Internship at Infosys working on SAP ABAP reports",
+    "We are hiring a backend engineer with strong Python and SQL skills",
+    "Experience with cloud platforms such as AWS, Azure or GCP is required",
+    "The candidate should have 2+ years of experience in Node.js and Express",
+    "Knowledge of Docker, Terraform and infrastructure as code is a plus",
+    "Looking for a data analyst proficient in Excel, Power BI and Tableau",
+    "Strong communication skills and ability to work in an agile team",
+    "Responsibilities include building dashboards and writing ETL jobs",
+    "Immediate joiners preferred, location Bengaluru, hybrid",
+    "python", "java", "react", "aws", "machine learning", "kubernetes",
+    "data structures and algorithms", "project management", "c++", "node.js",
+]
+
+def onnx_model_dir(model_name: str) -> str:
+    """Export directory for a model name"""
+    return os.path.join(ONNX_MODELS_DIR, model_name)
+
+class OnnxEncoder:
+    """int8 ONNX Runtime encoder with the SentenceTransformer.encode interface"""
+
+    def __init__(self, model_dir: str, threads: int = ONNX_THREADS):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        config_path = os.path.join(model_dir, CONFIG_FILE)
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(f"no ONNX export at {model_dir} (run: python -m ml.onnx_encoder export)")
+        with open(config_path) as f:
+            config = json.load(f)
+        if config.get("format") != ONNX_ENCODER_FORMAT:
+            raise ValueError(f"ONNX export {model_dir} has format {config.get('format')}, expected {ONNX_ENCODER_FORMAT}")
+
+        self.model_name = config["model_name"]
+        self.max_seq_length = config["max_seq_length"]
+        self.dimension = config["dimension"]
+        self.normalize = config["normalize"]
+
+        model_path = os.path.join(model_dir, QUANTIZED_FILE)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = [i.name for i in self.session.get_inputs()]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        # Reported by the model registry as this encoder's footprint
+        self.weight_bytes = os.path.getsize(model_path)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """float32 embeddings - 1-D for one string, one row per string for a list"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+
+        # Longest first so each batch pads to similar lengths
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        for start in range(0, len(texts), batch_size):
+            indices = order[start:start + batch_size]
+            embeddings[indices] = self._encode_batch([texts[i] for i in indices])
+
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        tokens = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_seq_length, return_tensors="np"
+        )
+        feeds = {name: tokens[name].astype(np.int64) for name in self._input_names}
+        hidden = self.session.run(None, feeds)[0]
+
+        # Mean pooling over real tokens, as the sentence-transformers Pooling module does
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+# ============= EXPORT AND DRIFT CHECK (offline) =============
+
+def export_onnx_encoder(model_name: str, output_dir: Optional[str] = None, opset: int = 14) -> str:
+    """Export a mean-pooling SentenceTransformer to int8 ONNX and return the export directory"""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    output_dir = output_dir or onnx_model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    model = SentenceTransformer(model_name, device="cpu")
+    modules = list(model)
+    transformer, pooling = modules[0], modules[1]
+    if not getattr(pooling, "pooling_mode_mean_tokens", False):
+        raise ValueError(f"{model_name} does not use mean pooling - only mean-pooled encoders can be exported")
+
+    auto_model = transformer.auto_model.eval()
+    sample = transformer.tokenizer(["export sample sentence"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            auto_model, tuple(sample[name] for name in input_names), fp32_path,
+            input_names=input_names, output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes, opset_version=opset, do_constant_folding=True,
+            dynamo=False  # TorchScript exporter - dynamic_axes, no onnxscript dependency
+        )
+    quantize_dynamic(fp32_path, os.path.join(output_dir, QUANTIZED_FILE), weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+
+    transformer.tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, CONFIG_FILE), "w") as f:
+        json.dump({
+            "format": ONNX_ENCODER_FORMAT,
+            "model_name": model_name,
+            "max_seq_length": model.max_seq_length,
+            "dimension": model.get_sentence_embedding_dimension(),
+            "normalize": any(type(module).__name__ == "Normalize" for module in modules),
+        }, f, indent=2)
+    return output_dir
+
+def drift_report(reference, candidate, texts: List[str] = DRIFT_CORPUS) -> Dict:
+    """Compare two encoders on texts - per-text cosine and the error in pairwise (cos+1)/2 scores"""
+    a = np.asarray(reference.encode(list(texts)), dtype=np.float32)
+    b = np.asarray(candidate.encode(list(texts)), dtype=np.float32)
+    a /= np.clip(np.linalg.norm(a, axis=1, keepdims=True), 1e-12, None)
+    b /= np.clip(np.linalg.norm(b, axis=1, keepdims=True), 1e-12, None)
+
+    cosines = (a * b).sum(axis=1)
+    # What the scorers consume: normalised similarity between texts
+    score_error = np.abs((a @ a.T + 1) / 2 - (b @ b.T + 1) / 2)
+    return {
+        "texts": len(texts),
+        "min_cosine": round(float(cosines.min()), 4),
+        "mean_cosine": round(float(cosines.mean()), 4),
+        "max_score_error": round(float(score_error.max()), 4),
+        "mean_score_error": round(float(score_error.mean()), 4),
+    }
+
+def main():
+    from .model_registry import DEFAULT_MODEL_NAME
+
+    parser = argparse.ArgumentParser(description="Export and check the int8 ONNX sentence encoder")
+    parser.add_argument("command", choices=["export", "check"])
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--output", default=None, help="Export directory (default: ATS_ONNX_MODELS_DIR/<model>)")
+    parser.add_argument("--min-cosine", type=float, default=0.98, help="check: fail below this per-text cosine")
+    args = parser.parse_args()
+
+    model_dir = args.output or onnx_model_dir(args.model)
+    if args.command == "export":
+        export_onnx_encoder(args.model, model_dir)
+        print(f"✅ Exported int8 ONNX encoder for {args.model} -> {model_dir}")
+
+    # Every export is checked straight away
+    from sentence_transformers import SentenceTransformer
+
+    report = drift_report(SentenceTransformer(args.model, device="cpu"), OnnxEncoder(model_dir))
+    print(json.dumps(report, indent=2))
+    if report["min_cosine"] < args.min_cosine:
+        print(f"❌ Drift too high: min cosine {report['min_cosine']} < {args.min_cosine}")
+        return 1
+    print("✅ ONNX encoder within drift tolerance")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+"""
+Parse Cache - Content-addressed cache for parsed resumes
+Keys are SHA-256 digests of the uploaded bytes (or pasted text) plus the
+parser version, so re-uploading the same resume skips extraction and parsing.
+Memory is bounded by an LRU byte budget; an optional on-disk tier survives restarts.
+"""
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .parser import PARSER_VERSION, resolve_parser_mode
+from .pdf_extractors import PDF_ENGINE
+
+# In-memory budget for cached parse results
+PARSE_CACHE_MAX_BYTES = int(os.environ.get("ATS_PARSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Optional directory for the on-disk tier (disabled when unset)
+PARSE_CACHE_DIR = os.environ.get("ATS_PARSE_CACHE_DIR", "")
+
+def document_cache_key(content: bytes, file_type: str, mode: Optional[str] = None) -> str:
+    """Cache key for an uploaded file (PDF keys include the engine chain, which shapes the text)"""
+    digest = hashlib.sha256(content).hexdigest()
+    version = f"{PARSER_VERSION}.{resolve_parser_mode(mode)}"
+    if file_type == 'pdf':
+        engine = PDF_ENGINE.replace(',', '+')
+        return f"{version}-pdf.{engine}-{digest}"
+    return f"{version}-{file_type}-{digest}"
+
+def text_cache_key(text: str, mode: Optional[str] = None) -> str:
+    """Cache key for pasted resume text (fast and full parses are cached separately)"""
+    digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    return f"{PARSER_VERSION}.{resolve_parser_mode(mode)}-text-{digest}"
+
+class ParseCache:
+    """Thread-safe LRU (by bytes) cache of parse results with an optional disk tier"""
+
+    def __init__(self, max_bytes: int = PARSE_CACHE_MAX_BYTES, cache_dir: str = PARSE_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached parse result, checking memory first and then disk"""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(blob)
+
+        blob = self._read_disk(key)
+        if blob is not None:
+            with self._lock:
+                self.disk_hits += 1
+                self._store(key, blob)
+            return json.loads(blob)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, resume_data: Dict):
+        """Cache a parse result (empty parses are not cached)"""
+        if not resume_data or not resume_data.get("raw_text"):
+            return
+        try:
+            blob = json.dumps(resume_data).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            print(f"Parse cache serialization error: {e}")
+            return
+
+        with self._lock:
+            self._store(key, blob)
+        self._write_disk(key, blob)
+
+    def clear(self):
+        """Drop every in-memory entry (disk tier is left alone)"""
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+                "disk_tier": bool(self.cache_dir),
+                "parser_version": PARSER_VERSION
+            }
+
+    def _store(self, key: str, blob: bytes):
+        """Insert into the LRU and evict until under budget (lock must be held)"""
+        if len(blob) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._current_bytes -= len(old)
+        self._entries[key] = blob
+        self._current_bytes += len(blob)
+        while self._current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._current_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"Parse cache disk read error: {e}")
+            return None
+
+    def _write_disk(self, key: str, blob: bytes):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(blob)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Parse cache disk write error: {e}")
+
+# Singleton instance
+_parse_cache = None
+
+def get_parse_cache() -> ParseCache:
+    """Get or create the parse cache singleton"""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+    return _parse_cache
@@ -1,19 +1,76 @@
-import pdfplumber
-import docx
+import os
 import re
-from typing import Dict, List, Optional
-import spacy
+import time
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
+from .automaton import PhraseAutomaton
+from .document import ResumeDocument
+from .gazetteer import (
+    COMPANY, DEGREE, EXTRA_COMPANIES_FILE, LOCATION, Gazetteer, GazetteerMatch, expand_pattern
+)
+from .pdf_extractors import extract_document_text
+from .skill_taxonomy import SkillTaxonomy
+
+# Bump whenever parse output changes - invalidates cached parse results
+PARSER_VERSION = "1.5.0"
+
+# "full" uses spaCy NER for PERSON/ORG/GPE/DATE; "fast" never imports spaCy and
+# uses regex + gazetteer entities instead (same output schema)
+PARSER_MODES = ("full", "fast")
+PARSER_MODE = os.environ.get("ATS_PARSER_MODE", "full").lower()
+
+# Download the spaCy model when missing (otherwise fall back to fast entities)
+SPACY_AUTO_DOWNLOAD = os.environ.get("ATS_SPACY_AUTO_DOWNLOAD", "0").lower() in ("1", "true", "yes")
+
+# spaCy model used for PERSON/ORG/GPE/DATE entities
+SPACY_MODEL = "en_core_web_sm"
+
+# Components entity extraction never reads - excluded at load time
+NON_NER_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter", "morphologizer"]
+
+# Characters of each resume fed to NER
+NER_MAX_CHARS = 10000
+
+# nlp.pipe settings for bulk parsing (n_process > 1 only outside the worker pool)
+NER_BATCH_SIZE = int(os.environ.get("ATS_NER_BATCH_SIZE", 32))
+NER_N_PROCESS = int(os.environ.get("ATS_NER_N_PROCESS", 1))
+
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+PHONE_PATTERN = r'\b(?:\+91[\-\s]?)?[6789]\d{9}\b'  # Indian phone numbers
+DATE_PATTERN = re.compile(
+    r'\b(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?\s+)?(?:19|20)\d{2}\b'
+    r'|\b(?:Present|Current)\b',
+    re.IGNORECASE
+)
+INSTITUTION_PATTERN = re.compile(
+    r'\b(?:IIT|NIT|IIIT|BITS|VIT|SRM|LPU)\s+[A-Z][a-z]+'
+    r'|\b(?:University|College|Institute)\s+of\s+[A-Z][\w]*(?:\s+[A-Z][\w]*)*'
+    r'|\b[A-Z][\w]*(?:\s+[A-Z][\w]*)*\s+(?:University|College|Institute)\b'
+)
+
+def resolve_parser_mode(mode: Optional[str] = None) -> str:
+    """Validate a requested parser mode, defaulting to ATS_PARSER_MODE"""
+    resolved = (mode or PARSER_MODE).lower()
+    if resolved not in PARSER_MODES:
+        raise ValueError(f"Unknown parser mode '{mode}' - expected one of {', '.join(PARSER_MODES)}")
+    return resolved
+
 class IndianResumeParser:
-    def __init__(self):
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            print("⚠️ spaCy model not found. Downloading...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+    def __init__(self, pdf_engine: Optional[str] = None, mode: Optional[str] = None):
+        # PDF engine chain ("auto", or e.g. "pypdfium2,pdfplumber"); None = ATS_PDF_ENGINE
+        self.pdf_engine = pdf_engine
+        
+        # Default parser mode; "fast" processes never load spaCy unless a request asks for "full"
+        self.mode = resolve_parser_mode(mode)
+        
+        # Per-stage wall times (ms) of the most recent parse_resume call
+        self.last_stage_timings: Dict[str, float] = {}
+        
+        self.nlp = None
+        self._nlp_unavailable = False
+        if self.mode == "full":
+            self._get_nlp()
         
         # Enhanced section patterns with ML-like scoring
         self.section_patterns = {
@@ -96,7 +153,7 @@ class IndianResumeParser:
             'capgemini': r'Capgemini',
             'ibm': r'IBM|International Business Machines',
             'microsoft': r'Microsoft',
-            'amazon': r'Amazon|AWS',
+            'amazon': r'Amazon',
             'google': r'Google',
             'flipkart': r'Flipkart',
             'paytm': r'Paytm|One97',
@@ -271,53 +328,176 @@ class IndianResumeParser:
             "testing": ["JUnit", "Selenium", "PyTest", "Jest", "Mocha"]
         }
     
-    def extract_text(self, file_path: str, file_type: str) -> str:
-        """Extract text from PDF or DOCX with better error handling"""
-        text = ""
+        # Extended skill database with categories
+        self.skill_database = {
+            'programming_languages': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'typescript', 'php', 'scala', 'r'],
+            'web_frameworks': ['django', 'flask', 'fastapi', 'spring', 'spring boot', 'react', 'angular', 'vue', 'node.js', 'express', 'asp.net', 'rails'],
+            'databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'redis', 'cassandra', 'elasticsearch', 'dynamodb', 'mariadb'],
+            'cloud': ['aws', 'azure', 'gcp', 'cloud', 'lambda', 'ec2', 's3', 'cloudformation', 'terraform'],
+            'devops': ['docker', 'kubernetes', 'jenkins', 'gitlab ci', 'github actions', 'ansible', 'prometheus', 'grafana', 'elk'],
+            'data_science': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'tableau', 'power bi'],
+            'mobile': ['android', 'ios', 'flutter', 'react native', 'xamarin', 'kotlin', 'swift'],
+            'tools': ['git', 'github', 'gitlab', 'jira', 'confluence', 'postman', 'vscode', 'intellij', 'eclipse'],
+            'testing': ['junit', 'selenium', 'pytest', 'jest', 'mocha', 'cypress', 'testng'],
+            'soft_skills': ['communication', 'leadership', 'teamwork', 'problem solving', 'analytical', 'critical thinking', 'time management']
+        }
+        
+        # Original skill list (reported with its original casing) for backward compatibility
+        self.indian_tech_skills = [
+            'Java', 'Python', 'JavaScript', 'React', 'Angular', 'Node.js',
+            'Spring Boot', 'Django', 'Flask', 'MySQL', 'MongoDB', 'Oracle',
+            'AWS', 'Azure', 'Docker', 'Kubernetes', 'Git', 'Jenkins',
+            'Machine Learning', 'Data Science', 'Android', 'iOS',
+            'HTML', 'CSS', 'Bootstrap', 'jQuery', 'REST API', 'Microservices'
+        ]
+        
+        # Section headings recognised by the document model
+        self.section_headers = {
+            'summary': ['SUMMARY', 'PROFESSIONAL SUMMARY', 'CAREER SUMMARY', 'PROFILE'],
+            'skills': ['SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES', 'TECHNOLOGIES'],
+            'experience': ['EXPERIENCE', 'WORK EXPERIENCE', 'EMPLOYMENT', 'PROFESSIONAL EXPERIENCE'],
+            'education': ['EDUCATION', 'ACADEMIC BACKGROUND', 'QUALIFICATIONS'],
+            'projects': ['PROJECTS', 'KEY PROJECTS', 'PERSONAL PROJECTS'],
+            'certifications': ['CERTIFICATIONS', 'CERTIFICATES', 'LICENSES'],
+            'achievements': ['ACHIEVEMENTS', 'AWARDS', 'HONORS'],
+            'publications': ['PUBLICATIONS', 'PAPERS', 'RESEARCH'],
+            'languages': ['LANGUAGES', 'LANGUAGE PROFICIENCY']
+        }
+        
+        # Synonym index - expand_skills is a hash lookup per skill
+        self.skill_taxonomy = SkillTaxonomy(self.skill_synonyms, related_size=4)
         
+        # Every skill compiled into one automaton - matched in a single pass per resume
+        self.skill_automaton = self._build_skill_automaton()
+        
+        # Degrees, employers and cities compiled together - one scan per resume
+        self.gazetteer = self._build_gazetteer()
+    
+    def _build_skill_automaton(self) -> PhraseAutomaton:
+        """Compile skill_database and indian_tech_skills into a word-boundary phrase automaton"""
+        automaton = PhraseAutomaton()
+        for skills in self.skill_database.values():
+            for skill in skills:
+                automaton.add(skill, skill)
+        for skill in self.indian_tech_skills:
+            automaton.add(skill, skill)
+        automaton.build()
+        return automaton
+    
+    def _build_gazetteer(self) -> Gazetteer:
+        """Compile degree patterns, company patterns and city variations into one gazetteer"""
+        gazetteer = Gazetteer()
+        for pattern in self.indian_degree_patterns:
+            gazetteer.add(DEGREE, pattern, expand_pattern(pattern))
+        for company_key, pattern in self.indian_company_patterns.items():
+            gazetteer.add(COMPANY, company_key, expand_pattern(pattern))
+        for city, variations in self.indian_cities.items():
+            gazetteer.add(LOCATION, city, variations)
+        if EXTRA_COMPANIES_FILE:
+            gazetteer.load_companies(EXTRA_COMPANIES_FILE)
+        gazetteer.build()
+        return gazetteer
+    
+    def _get_nlp(self):
+        """The NER pipeline, loaded on first use - None when spaCy is unavailable"""
+        if self.nlp is None and not self._nlp_unavailable:
+            try:
+                self.nlp = self._load_ner_pipeline()
+            except (ImportError, OSError) as e:
+                print(f"⚠️ spaCy NER unavailable ({e}) - using fast entity extraction")
+                self._nlp_unavailable = True
+        return self.nlp
+    
+    def _load_ner_pipeline(self):
+        """Load the spaCy model with only the components NER needs"""
+        import spacy
         try:
-            if file_type == 'pdf':
-                with pdfplumber.open(file_path) as pdf:
-                    for page in pdf.pages:
-                        extracted = page.extract_text()
-                        if extracted:
-                            text += extracted + "\n"
-                            
-            elif file_type == 'docx':
-                doc = docx.Document(file_path)
-                for para in doc.paragraphs:
-                    text += para.text + "\n"
-                    
+            nlp = spacy.load(SPACY_MODEL, exclude=NON_NER_COMPONENTS)
+        except OSError:
+            if not SPACY_AUTO_DOWNLOAD:
+                raise
+            print("⚠️ spaCy model not found. Downloading...")
+            import subprocess
+            subprocess.run(["python", "-m", "spacy", "download", SPACY_MODEL])
+            nlp = spacy.load(SPACY_MODEL, exclude=NON_NER_COMPONENTS)
+        
+        # The shared tok2vec only feeds the tagger/parser - drop it unless NER listens to it
+        if "tok2vec" in nlp.pipe_names and not nlp.get_pipe("tok2vec").listening_components:
+            nlp.remove_pipe("tok2vec")
+        return nlp
+    
+    def extract_text(self, source: Union[str, bytes, BinaryIO], file_type: str, layout: bool = False) -> str:
+        """Extract text from PDF or DOCX with better error handling
+        
+        source may be a file path, the raw file bytes, or a binary file-like
+        object - bytes and streams are read in memory without touching disk.
+        PDFs go through the fast engine chain; layout=True forces pdfplumber.
+        """
+        try:
+            return extract_document_text(source, file_type, engine=self.pdf_engine, layout=layout)
         except Exception as e:
             print(f"Error extracting text: {e}")
             return ""
-        
-        return text.strip()
     
-    def parse_resume(self, text: str) -> Dict:
-        """Enhanced resume parsing with improved section detection"""
+    def parse_resumes(self, texts: List[str], batch_size: int = NER_BATCH_SIZE,
+                      n_process: int = NER_N_PROCESS, mode: Optional[str] = None) -> List[Dict]:
+        """Parse many resumes, running NER over all of them in nlp.pipe batches"""
+        if self._use_fast_entities(mode):
+            return [self.parse_resume(text, mode="fast") for text in texts]
+        entities = self.extract_entities_batch(texts, batch_size=batch_size, n_process=n_process)
+        return [self.parse_resume(text, entities=ents, mode=mode) for text, ents in zip(texts, entities)]
+    
+    def parse_resume(self, text: str, entities: Optional[Dict] = None, mode: Optional[str] = None) -> Dict:
+        """Enhanced resume parsing with improved section detection
+        
+        entities may carry a precomputed _extract_entities result (see parse_resumes).
+        mode overrides the parser's default: "full" (spaCy NER) or "fast" (no spaCy).
+        """
         if not text:
             return self._get_empty_response()
         
         try:
-            lines = text.split('\n')
+            fast_entities = self._use_fast_entities(mode)
+
+            timings = {}
+            started = time.perf_counter()
+            
+            # Build the shared line model once - every stage below reads from it
+            doc = self.build_document(text)
+            started = self._record_stage(timings, "document", started)
             
             # Detect sections using improved method
-            sections = self._detect_sections_improved(lines)
+            sections = self._detect_sections_improved(doc)
+            started = self._record_stage(timings, "sections", started)
+            
+            # One gazetteer scan shared by the entity, Indian-info and experience extractors
+            gazetteer_matches = self.gazetteer.find_all(text)
+            started = self._record_stage(timings, "gazetteer", started)
             
             # Extract entities
-            entities = self._extract_entities(text)
+            if entities is None:
+                if fast_entities:
+                    entities = self._extract_entities_fast(doc, gazetteer_matches)
+                else:
+                    entities = self._extract_entities(text)
+            started = self._record_stage(timings, "entities", started)
             
             # Extract Indian-specific info
-            indian_info = self._extract_indian_info(text)
+            indian_info = self._extract_indian_info(doc, gazetteer_matches)
+            started = self._record_stage(timings, "indian_info", started)
             
             # Extract enhanced data
-            skills = self._extract_skills_enhanced(text)
-            experience = self._extract_experience_improved(text)
-            education = self._extract_education_improved(text)
+            skills = self._extract_skills_enhanced(doc)
+            started = self._record_stage(timings, "skills", started)
+            experience = self._extract_experience_improved(doc, gazetteer_matches)
+            started = self._record_stage(timings, "experience", started)
+            education = self._extract_education_improved(doc)
+            started = self._record_stage(timings, "education", started)
             
             # Expand skills with synonyms
             expanded_skills = self.expand_skills(skills)
+            self._record_stage(timings, "expand_skills", started)
+            self.last_stage_timings = timings
             
             return {
                 "raw_text": text,
@@ -329,7 +509,7 @@ class IndianResumeParser:
                 "experience": experience,
                 "education": education,
                 "stats": {
-                    "total_lines": len(lines),
+                    "total_lines": len(doc.lines),
                     "sections_found": len(sections),
                     "skills_count": len(skills),
                     "experience_count": len(experience)
@@ -339,6 +519,23 @@ class IndianResumeParser:
             print(f"Error parsing resume: {e}")
             return self._get_empty_response()
     
+    def _use_fast_entities(self, mode: Optional[str] = None) -> bool:
+        """True when this call should skip spaCy (fast mode, or spaCy unavailable)"""
+        if resolve_parser_mode(mode or self.mode) == "fast":
+            return True
+        return self._get_nlp() is None
+    
+    def build_document(self, text: str) -> ResumeDocument:
+        """Split, normalize and section the text once for all parser stages"""
+        return ResumeDocument(text, self.section_headers)
+    
+    @staticmethod
+    def _record_stage(timings: Dict[str, float], stage: str, started: float) -> float:
+        """Store a stage's wall time in ms and return the next stage's start time"""
+        now = time.perf_counter()
+        timings[stage] = round((now - started) * 1000, 3)
+        return now
+    
     def _get_empty_response(self) -> Dict:
         """Return empty response structure"""
         return {
@@ -363,144 +560,69 @@ class IndianResumeParser:
             }
         }
     
-    def _detect_sections_improved(self, lines: List[str]) -> Dict[str, str]:
+    def _detect_sections_improved(self, doc: ResumeDocument) -> Dict[str, str]:
         """Improved section detection with hardcoded patterns"""
-        sections = {}
-        current_section = "HEADER"
-        current_content = []
-        
-        # Common section headers in ALL CAPS
-        section_headers = {
-            'summary': ['SUMMARY', 'PROFESSIONAL SUMMARY', 'CAREER SUMMARY', 'PROFILE'],
-            'skills': ['SKILLS', 'TECHNICAL SKILLS', 'CORE COMPETENCIES', 'TECHNOLOGIES'],
-            'experience': ['EXPERIENCE', 'WORK EXPERIENCE', 'EMPLOYMENT', 'PROFESSIONAL EXPERIENCE'],
-            'education': ['EDUCATION', 'ACADEMIC BACKGROUND', 'QUALIFICATIONS'],
-            'projects': ['PROJECTS', 'KEY PROJECTS', 'PERSONAL PROJECTS'],
-            'certifications': ['CERTIFICATIONS', 'CERTIFICATES', 'LICENSES'],
-            'achievements': ['ACHIEVEMENTS', 'AWARDS', 'HONORS'],
-            'publications': ['PUBLICATIONS', 'PAPERS', 'RESEARCH'],
-            'languages': ['LANGUAGES', 'LANGUAGE PROFICIENCY']
-        }
-        
         try:
-            for line in lines:
-                line_strip = line.strip()
-                if not line_strip:
-                    continue
-                    
-                line_upper = line_strip.upper()
-                
-                # Check if this line is a section header
-                found_section = False
-                for section, headers in section_headers.items():
-                    if any(header in line_upper for header in headers):
-                        # Save previous section
-                        if current_section != "HEADER" and current_content:
-                            sections[current_section.lower()] = '\n'.join(current_content)
-                        current_section = section
-                        current_content = []
-                        found_section = True
-                        break
-                
-                if not found_section:
-                    current_content.append(line_strip)
-            
-            # Add last section
-            if current_content and current_section:
-                sections[current_section.lower()] = '\n'.join(current_content)
-                
+            return doc.section_texts()
         except Exception as e:
             print(f"Error in section detection: {e}")
-            
-        return sections
+            return {}
     
-    def _extract_skills_enhanced(self, text: str) -> List[str]:
+    def _extract_skills_enhanced(self, doc: ResumeDocument) -> List[str]:
         """Enhanced skill extraction with context awareness"""
-        if not text:
+        if not doc.text:
             return []
         
         try:
-            # Extended skill database with categories
-            skill_database = {
-                'programming_languages': ['python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'typescript', 'php', 'scala', 'r'],
-                'web_frameworks': ['django', 'flask', 'fastapi', 'spring', 'spring boot', 'react', 'angular', 'vue', 'node.js', 'express', 'asp.net', 'rails'],
-                'databases': ['sql', 'mysql', 'postgresql', 'mongodb', 'oracle', 'redis', 'cassandra', 'elasticsearch', 'dynamodb', 'mariadb'],
-                'cloud': ['aws', 'azure', 'gcp', 'cloud', 'lambda', 'ec2', 's3', 'cloudformation', 'terraform'],
-                'devops': ['docker', 'kubernetes', 'jenkins', 'gitlab ci', 'github actions', 'ansible', 'prometheus', 'grafana', 'elk'],
-                'data_science': ['machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'matplotlib', 'tableau', 'power bi'],
-                'mobile': ['android', 'ios', 'flutter', 'react native', 'xamarin', 'kotlin', 'swift'],
-                'tools': ['git', 'github', 'gitlab', 'jira', 'confluence', 'postman', 'vscode', 'intellij', 'eclipse'],
-                'testing': ['junit', 'selenium', 'pytest', 'jest', 'mocha', 'cypress', 'testng'],
-                'soft_skills': ['communication', 'leadership', 'teamwork', 'problem solving', 'analytical', 'critical thinking', 'time management']
-            }
-            
-            found_skills = set()
-            text_lower = text.lower()
-            
-            # Check each category
-            for category, skills in skill_database.items():
-                for skill in skills:
-                    # Exact match
-                    if skill in text_lower:
-                        found_skills.add(skill)
-                    # Word boundary match for longer skills
-                    elif len(skill) > 4 and re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-                        found_skills.add(skill)
-            
-            # Also check for skills in the original list for backward compatibility
-            indian_tech_skills = [
-                'Java', 'Python', 'JavaScript', 'React', 'Angular', 'Node.js',
-                'Spring Boot', 'Django', 'Flask', 'MySQL', 'MongoDB', 'Oracle',
-                'AWS', 'Azure', 'Docker', 'Kubernetes', 'Git', 'Jenkins',
-                'Machine Learning', 'Data Science', 'Android', 'iOS',
-                'HTML', 'CSS', 'Bootstrap', 'jQuery', 'REST API', 'Microservices'
-            ]
-            
-            for skill in indian_tech_skills:
-                if skill.lower() in text_lower:
-                    found_skills.add(skill)
-            
-            return sorted(list(found_skills))
+            return sorted({skill for _, _, skill in self.find_skill_mentions(doc.text)})
             
         except Exception as e:
             print(f"Error in skill extraction: {e}")
             return []
     
-    def _extract_experience_improved(self, text: str) -> List[Dict]:
+    def find_skill_mentions(self, text: str) -> List[Tuple[int, int, str]]:
+        """Every skill occurrence as (start, end, skill) in one pass over the text"""
+        if not text:
+            return []
+        return self.skill_automaton.find_all(text)
+    
+    def _extract_experience_improved(self, doc: ResumeDocument,
+                                     gazetteer_matches: Optional[List[GazetteerMatch]] = None) -> List[Dict]:
         """Improved experience extraction with proper job parsing"""
         experience = []
         
-        if not text:
+        if not doc.text:
             return experience
             
         try:
-            lines = text.split('\n')
+            if gazetteer_matches is None:
+                gazetteer_matches = self.gazetteer.find_all(doc.text)
+            
             in_experience = False
             current_job = {}
             current_desc = []
             
-            # List of known companies to identify job lines
-            known_companies = ['AMAZON', 'FLIPKART', 'TCS', 'INFOSYS', 'WIPRO', 'MICROSOFT', 'GOOGLE', 'IBM', 'ACCENTURE', 'COGNIZANT']
-            
-            for line in lines:
-                line_strip = line.strip()
-                if not line_strip:
-                    continue
-                
-                line_upper = line_strip.upper()
+            # Lines naming a known employer -> whether the employer opens the line
+            employer_lines = {}
+            for match in gazetteer_matches:
+                if match.kind == COMPANY:
+                    index = doc.line_index_at(match.start)
+                    opens_line = not doc.text[doc.lines[index].start:match.start].strip()
+                    employer_lines[index] = employer_lines.get(index, False) or opens_line
+            has_experience_section = any(span.name == 'experience' for span in doc.sections)
+            
+            for line in doc.content_lines:
+                line_strip = line.text
                 
-                # Check if this is a job header (contains company name and possibly role)
-                is_job_header = False
-                for company in known_companies:
-                    if company in line_upper:
-                        is_job_header = True
-                        break
-                
-                # Also check for patterns like "Company - Role" or "Company | Role"
-                if '|' in line_strip or ' - ' in line_strip or '–' in line_strip:
-                    parts = re.split(r'[|\-–]', line_strip)
-                    if len(parts) >= 2 and any(company in parts[0].upper() for company in known_companies):
-                        is_job_header = True
+                # A job header names an employer (and possibly "Company - Role"); list items never do.
+                # Outside an experience section only a resume without one may have a header, and
+                # only when the employer opens the line - "Deployed ... on AWS" in PROJECTS is not a job
+                is_job_header = (
+                    line.index in employer_lines
+                    and not (line.is_bullet or line.is_numbered)
+                    and (line.section == 'experience'
+                         or (not has_experience_section and employer_lines[line.index]))
+                )
                 
                 if is_job_header:
                     # Save previous job
@@ -519,16 +641,21 @@ class IndianResumeParser:
                     current_desc = []
                     in_experience = True
                 
+                # Any other section heading ends the job descriptions
+                elif line.is_section_header:
+                    if line.section != 'experience':
+                        in_experience = False
+                
                 # Check for duration (years pattern)
                 elif in_experience and re.search(r'20\d{2}\s*[-–]\s*(Present|20\d{2}|Current)', line_strip):
                     current_job['duration'] = line_strip
                 
                 # Add bullet points or description lines
-                elif in_experience and (line_strip.startswith(('•', '-', '*')) or line_strip[0].isdigit() and line_strip[1] == '.'):
+                elif in_experience and (line.is_bullet or line.is_numbered):
                     current_desc.append(line_strip)
                 
                 # Add non-empty lines that might be description
-                elif in_experience and len(line_strip) > 10 and not any(section in line_upper for section in ['EDUCATION', 'SKILLS', 'PROJECTS']):
+                elif in_experience and len(line_strip) > 10:
                     current_desc.append(line_strip)
             
             # Add last job
@@ -541,31 +668,16 @@ class IndianResumeParser:
             
         return experience
     
-    def _extract_education_improved(self, text: str) -> List[Dict]:
+    def _extract_education_improved(self, doc: ResumeDocument) -> List[Dict]:
         """Improved education extraction"""
         education = []
         
-        if not text:
+        if not doc.text:
             return education
             
         try:
-            lines = text.split('\n')
-            in_education = False
-            edu_text = []
-            
-            for line in lines:
-                line_upper = line.upper()
-                
-                if 'EDUCATION' in line_upper:
-                    in_education = True
-                    continue
-                
-                if in_education:
-                    # Stop at next major section
-                    if any(section in line_upper for section in ['EXPERIENCE', 'SKILLS', 'PROJECTS', 'CERTIFICATIONS']):
-                        break
-                    if line.strip():
-                        edu_text.append(line.strip())
+            # Content of the first education section, up to the next heading
+            edu_text = [line.text for line in doc.section_lines('education')]
             
             if edu_text:
                 edu_entry = {}
@@ -625,20 +737,29 @@ class IndianResumeParser:
             expanded = set(skills_list)
             
             for skill in skills_list:
-                if not skill:
-                    continue
-                skill_lower = skill.lower()
-                for category, synonyms in self.skill_synonyms.items():
-                    if skill_lower in category or any(s.lower() in skill_lower for s in synonyms):
-                        expanded.update(synonyms[:4])
-            
-            return list(set(expanded))
+                if skill:
+                    expanded.update(self.skill_taxonomy.related(skill))
+            
+            return list(expanded)
         except Exception as e:
             print(f"Error expanding skills: {e}")
             return skills_list
     
-    def _extract_entities(self, text: str) -> Dict:
-        """Extract named entities using spaCy"""
+    def extract_entities_batch(self, texts: List[str], batch_size: int = NER_BATCH_SIZE,
+                               n_process: int = NER_N_PROCESS) -> List[Dict]:
+        """_extract_entities for many texts, with spaCy streaming them through nlp.pipe"""
+        try:
+            docs = self._get_nlp().pipe(
+                (text[:NER_MAX_CHARS] for text in texts),
+                batch_size=batch_size, n_process=n_process
+            )
+            return [self._extract_entities(text, spacy_doc=doc) for text, doc in zip(texts, docs)]
+        except Exception as e:
+            print(f"Error in batch entity extraction: {e}")
+            return [self._extract_entities(text) for text in texts]
+    
+    def _extract_entities(self, text: str, spacy_doc=None) -> Dict:
+        """Extract named entities using spaCy (spacy_doc: already-processed text[:NER_MAX_CHARS])"""
         entities = {
             "PERSON": [],
             "ORG": [],
@@ -652,7 +773,7 @@ class IndianResumeParser:
             return entities
             
         try:
-            doc = self.nlp(text[:10000])  # Limit text for performance
+            doc = spacy_doc if spacy_doc is not None else self._get_nlp()(text[:NER_MAX_CHARS])  # Limit text for performance
             
             # Extract entities from spaCy
             for ent in doc.ents:
@@ -660,11 +781,54 @@ class IndianResumeParser:
                     entities[ent.label_].append(ent.text)
             
             # Extract email and phone (regex patterns)
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            phone_pattern = r'\b(?:\+91[\-\s]?)?[6789]\d{9}\b'  # Indian phone numbers
+            entities["EMAIL"] = re.findall(EMAIL_PATTERN, text)
+            entities["PHONE"] = re.findall(PHONE_PATTERN, text)
             
-            entities["EMAIL"] = re.findall(email_pattern, text)
-            entities["PHONE"] = re.findall(phone_pattern, text)
+            # Remove duplicates
+            for key in entities:
+                entities[key] = list(set(entities[key]))
+                
+        except Exception as e:
+            print(f"Error extracting entities: {e}")
+            
+        return entities
+    
+    def _extract_entities_fast(self, doc: ResumeDocument,
+                               gazetteer_matches: Optional[List[GazetteerMatch]] = None) -> Dict:
+        """spaCy-free entities: name heuristic, gazetteer orgs/cities, regex dates and contacts"""
+        entities = {
+            "PERSON": [],
+            "ORG": [],
+            "GPE": [],
+            "DATE": [],
+            "EMAIL": [],
+            "PHONE": []
+        }
+        
+        if not doc.text:
+            return entities
+        
+        try:
+            if gazetteer_matches is None:
+                gazetteer_matches = self.gazetteer.find_all(doc.text)
+            text = doc.text[:NER_MAX_CHARS]
+            
+            name = self._guess_candidate_name(doc)
+            if name:
+                entities["PERSON"].append(name)
+            
+            for match in gazetteer_matches:
+                if match.start >= NER_MAX_CHARS:
+                    break
+                if match.kind == COMPANY:
+                    entities["ORG"].append(match.text)
+                elif match.kind == LOCATION:
+                    entities["GPE"].append(match.text)
+            entities["ORG"].extend(INSTITUTION_PATTERN.findall(text))
+            entities["DATE"] = DATE_PATTERN.findall(text)
+            
+            entities["EMAIL"] = re.findall(EMAIL_PATTERN, doc.text)
+            entities["PHONE"] = re.findall(PHONE_PATTERN, doc.text)
             
             # Remove duplicates
             for key in entities:
@@ -675,6 +839,16 @@ class IndianResumeParser:
             
         return entities
     
+    def _guess_candidate_name(self, doc: ResumeDocument) -> Optional[str]:
+        """Resumes open with the candidate's name - the first short, all-alphabetic line"""
+        for line in doc.content_lines[:5]:
+            if line.is_section_header:
+                break
+            words = line.text.replace('.', ' ').split()
+            if 2 <= len(words) <= 4 and all(word.isalpha() and word[0].isupper() for word in words):
+                return line.text
+        return None
+    
     # ===== NORMALIZATION METHODS =====
     
     def normalize_company(self, company_name: Optional[str]) -> str:
@@ -730,7 +904,8 @@ class IndianResumeParser:
             print(f"Error normalizing location: {e}")
             return location or ""
     
-    def _extract_indian_info(self, text: str) -> Dict:
+    def _extract_indian_info(self, doc: ResumeDocument,
+                             gazetteer_matches: Optional[List[GazetteerMatch]] = None) -> Dict:
         """Extract Indian-specific information with normalization"""
         info = {
             "degrees": [],
@@ -743,33 +918,24 @@ class IndianResumeParser:
             }
         }
         
-        if not text:
+        if not doc.text:
             return info
             
         try:
-            # Extract and normalize Indian degrees
-            for pattern in self.indian_degree_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if match:
-                        info["degrees"].append(match)
-                        info["normalized"]["degrees"].append(self.normalize_degree(match))
-            
-            # Extract and normalize Indian companies
-            for company_key, pattern in self.indian_company_patterns.items():
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if match:
-                        info["companies"].append(match)
-                        info["normalized"]["companies"].append(self.normalize_company(match))
-            
-            # Extract and normalize Indian locations
-            for city, variations in self.indian_cities.items():
-                for var in variations:
-                    if var.lower() in text.lower():
-                        info["locations"].append(city.title())
-                        info["normalized"]["locations"].append(self.normalize_location(city))
-                        break
+            if gazetteer_matches is None:
+                gazetteer_matches = self.gazetteer.find_all(doc.text)
+            
+            # Degrees, companies and cities all come from the single gazetteer scan
+            for match in gazetteer_matches:
+                if match.kind == DEGREE:
+                    info["degrees"].append(match.text)
+                    info["normalized"]["degrees"].append(self.normalize_degree(match.text))
+                elif match.kind == COMPANY:
+                    info["companies"].append(match.text)
+                    info["normalized"]["companies"].append(match.canonical or self.normalize_company(match.text))
+                elif match.kind == LOCATION:
+                    info["locations"].append(match.key.title())
+                    info["normalized"]["locations"].append(self.normalize_location(match.key))
             
             # Remove duplicates
             for key in info:
@@ -0,0 +1,260 @@
+"""
+PDF Text Extractors - Pluggable engines for pulling plain text out of PDFs
+pdfplumber computes full character layout, which we throw away for plain-text
+parsing, so faster engines are tried first and pdfplumber is the fallback
+(or the engine of choice when layout features are requested).
+Also home to extract_document_text (PDF + DOCX), which has no spaCy dependency
+so it can run in lightweight extraction processes.
+"""
+import io
+import os
+from typing import BinaryIO, Dict, List, Optional, Union
+
+PDFSource = Union[str, bytes, BinaryIO]
+
+# Engine preference: "auto" or a comma-separated list such as "pypdfium2,pdfplumber"
+PDF_ENGINE = os.environ.get("ATS_PDF_ENGINE", "auto")
+
+# Guards against pathological documents
+MAX_PDF_PAGES = int(os.environ.get("ATS_MAX_PDF_PAGES", 40))
+MAX_DOCUMENT_BYTES = int(os.environ.get("ATS_MAX_DOCUMENT_BYTES", 10 * 1024 * 1024))
+
+class DocumentTooLargeError(ValueError):
+    """Raised for uploads above MAX_DOCUMENT_BYTES"""
+
+def check_document_size(content: bytes):
+    """Reject oversized uploads before any engine touches them"""
+    if len(content) > MAX_DOCUMENT_BYTES:
+        raise DocumentTooLargeError(
+            f"Document is {len(content) // 1024} KB - the limit is {MAX_DOCUMENT_BYTES // 1024} KB"
+        )
+
+class PDFExtractor:
+    """Base class - subclasses return one text string per page"""
+    name = "base"
+
+    def available(self) -> bool:
+        raise NotImplementedError
+
+    def extract_pages(self, source: PDFSource, page_numbers: Optional[List[int]] = None,
+                      max_pages: Optional[int] = None) -> List[str]:
+        """Text per page - the given page indices, else the first max_pages pages"""
+        raise NotImplementedError
+
+    def page_count(self, source: PDFSource) -> int:
+        raise NotImplementedError
+
+def _rewind(source: PDFSource) -> PDFSource:
+    """Engines may read a stream to the end - always hand them a fresh position"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source
+
+class PdfiumExtractor(PDFExtractor):
+    """pypdfium2 (PDFium bindings) - fastest plain-text engine when installed"""
+    name = "pypdfium2"
+
+    def available(self) -> bool:
+        try:
+            import pypdfium2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _open(self, source: PDFSource):
+        import pypdfium2 as pdfium
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return pdfium.PdfDocument(bytes(source))
+        if hasattr(source, 'read'):
+            source.seek(0)
+            return pdfium.PdfDocument(source.read())
+        return pdfium.PdfDocument(source)
+
+    def page_count(self, source: PDFSource) -> int:
+        pdf = self._open(source)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def extract_pages(self, source: PDFSource, page_numbers: Optional[List[int]] = None,
+                      max_pages: Optional[int] = None) -> List[str]:
+        pdf = self._open(source)
+        pages = []
+        try:
+            if page_numbers is not None:
+                indices = page_numbers
+            else:
+                indices = range(min(len(pdf), max_pages) if max_pages else len(pdf))
+            for index in indices:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                # PDFium uses CRLF line endings
+                pages.append(textpage.get_text_range().replace('\r\n', '\n').replace('\r', '\n'))
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+        return pages
+
+class PdfminerExtractor(PDFExtractor):
+    """pdfminer.six low-level interpreter - no pdfplumber object model on top"""
+    name = "pdfminer"
+
+    def available(self) -> bool:
+        try:
+            import pdfminer  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def page_count(self, source: PDFSource) -> int:
+        from pdfminer.pdfpage import PDFPage
+        stream = self._as_stream(source)
+        try:
+            return sum(1 for _ in PDFPage.get_pages(stream))
+        finally:
+            if isinstance(source, str):
+                stream.close()
+
+    def _as_stream(self, source: PDFSource):
+        if isinstance(source, str):
+            return open(source, 'rb')
+        return _rewind(source)
+
+    def extract_pages(self, source: PDFSource, page_numbers: Optional[List[int]] = None,
+                      max_pages: Optional[int] = None) -> List[str]:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        stream = self._as_stream(source)
+        wanted = set(page_numbers) if page_numbers is not None else None
+        resource_manager = PDFResourceManager(caching=True)
+        # Line grouping only - skip vertical text detection and figure text
+        laparams = LAParams(detect_vertical=False, all_texts=False)
+        pages = []
+        try:
+            for index, page in enumerate(PDFPage.get_pages(stream, caching=True)):
+                if wanted is not None and index not in wanted:
+                    continue
+                if wanted is None and max_pages and index >= max_pages:
+                    break
+                output = io.StringIO()
+                device = TextConverter(resource_manager, output, laparams=laparams)
+                PDFPageInterpreter(resource_manager, device).process_page(page)
+                device.close()
+                pages.append(output.getvalue().replace('\x0c', ''))
+        finally:
+            if isinstance(source, str):
+                stream.close()
+        return pages
+
+class PdfplumberExtractor(PDFExtractor):
+    """pdfplumber - slowest, but the reference output and the only layout-aware engine"""
+    name = "pdfplumber"
+
+    def available(self) -> bool:
+        try:
+            import pdfplumber  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def page_count(self, source: PDFSource) -> int:
+        import pdfplumber
+        with pdfplumber.open(_rewind(source)) as pdf:
+            return len(pdf.pages)
+
+    def extract_pages(self, source: PDFSource, page_numbers: Optional[List[int]] = None,
+                      max_pages: Optional[int] = None, layout: bool = False) -> List[str]:
+        import pdfplumber
+        pages = []
+        with pdfplumber.open(_rewind(source), pages=[n + 1 for n in page_numbers] if page_numbers is not None else None) as pdf:
+            selected = pdf.pages if page_numbers is not None or not max_pages else pdf.pages[:max_pages]
+            for page in selected:
+                pages.append(page.extract_text(layout=layout) or "")
+        return pages
+
+# Registry of every known engine, fastest first
+EXTRACTORS: Dict[str, PDFExtractor] = {
+    extractor.name: extractor
+    for extractor in (PdfiumExtractor(), PdfminerExtractor(), PdfplumberExtractor())
+}
+
+def resolve_engines(engine: Optional[str] = None) -> List[PDFExtractor]:
+    """Installed engines to try, in order - pdfplumber is always the last resort"""
+    engine = engine or PDF_ENGINE
+    if engine == "auto":
+        names = list(EXTRACTORS)
+    else:
+        names = [name.strip() for name in engine.split(',') if name.strip()]
+        if "pdfplumber" not in names:
+            names.append("pdfplumber")
+
+    engines = []
+    for name in names:
+        extractor = EXTRACTORS.get(name)
+        if extractor is None:
+            print(f"⚠️ Unknown PDF engine '{name}' - skipping")
+        elif extractor.available():
+            engines.append(extractor)
+    return engines
+
+def join_pages(pages: List[str]) -> str:
+    """Join page texts the way the parser always has: non-empty pages, newline separated"""
+    return "\n".join(page for page in pages if page).strip()
+
+def extract_pdf_pages(source: PDFSource, engine: Optional[str] = None, layout: bool = False,
+                      page_numbers: Optional[List[int]] = None,
+                      max_pages: Optional[int] = MAX_PDF_PAGES) -> List[str]:
+    """Per-page text from the first engine that succeeds with non-empty output.
+    Without explicit page_numbers only the first max_pages pages are read."""
+    if layout:
+        return EXTRACTORS["pdfplumber"].extract_pages(source, page_numbers, max_pages, layout=True)
+
+    last_error = None
+    for extractor in resolve_engines(engine):
+        try:
+            pages = extractor.extract_pages(source, page_numbers, max_pages)
+            if any(page.strip() for page in pages):
+                return pages
+        except Exception as e:
+            print(f"PDF engine {extractor.name} failed: {e}")
+            last_error = e
+
+    if last_error is not None:
+        raise last_error
+    return []
+
+def extract_pdf_text(source: PDFSource, engine: Optional[str] = None, layout: bool = False) -> str:
+    """Plain text of the whole PDF using the configured engine chain"""
+    return join_pages(extract_pdf_pages(source, engine, layout))
+
+def count_pdf_pages(source: PDFSource, engine: Optional[str] = None) -> int:
+    """Page count from the first engine that can open the document"""
+    for extractor in resolve_engines(engine):
+        try:
+            return extractor.page_count(source)
+        except Exception as e:
+            print(f"PDF engine {extractor.name} could not count pages: {e}")
+    return 0
+
+def extract_document_text(source: PDFSource, file_type: str, engine: Optional[str] = None,
+                          layout: bool = False) -> str:
+    """Plain text of a PDF or DOCX given as a path, bytes or binary stream"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    if file_type == 'pdf':
+        return extract_pdf_text(source, engine=engine, layout=layout)
+
+    if file_type == 'docx':
+        import docx
+        doc = docx.Document(source)
+        return "\n".join(para.text for para in doc.paragraphs).strip()
+
+    return ""
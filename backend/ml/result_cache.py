@@ -0,0 +1,111 @@
+"""
+Result Cache - Caches complete scan responses (ATS analysis + recommendations)
+Scoring is deterministic for a given parsed resume, JD and scorer/model version,
+so identical pairs are served from memory instead of being rescored.
+"""
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Max cached responses (LRU beyond this)
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("ATS_RESULT_CACHE_MAX_ENTRIES", 10000))
+
+# Seconds a cached response stays valid
+RESULT_CACHE_TTL = int(os.environ.get("ATS_RESULT_CACHE_TTL", 24 * 3600))
+
+def result_cache_key(resume_key: str, job_description: str, scoring_signature: str) -> str:
+    """
+    Key a response on the resume's content key (which already includes the
+    parser version), the JD digest and the scorer/model signature
+    """
+    jd_digest = hashlib.sha256((job_description or "").encode('utf-8')).hexdigest()
+    return f"{scoring_signature}|{resume_key}|{jd_digest}"
+
+class ResultCache:
+    """Thread-safe TTL + LRU cache of scan responses"""
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES, ttl: int = RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached response, or None if missing or expired.
+        The returned dict is shared - callers must not mutate it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def contains(self, key: str) -> bool:
+        """True if a live entry exists (does not touch LRU order or counters)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def put(self, key: str, response: Dict):
+        """Cache a response, evicting the least recently used beyond the limit"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, scoring_signature: Optional[str] = None) -> int:
+        """
+        Drop cached responses - all of them, or only those produced under one
+        scorer/model signature. Call this whenever weights or lexicons change.
+        """
+        with self._lock:
+            if scoring_signature is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                prefix = f"{scoring_signature}|"
+                stale = [key for key in self._entries if key.startswith(prefix)]
+                for key in stale:
+                    del self._entries[key]
+                removed = len(stale)
+            self.invalidations += 1
+            return removed
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl
+            }
+
+# Singleton instance
+_result_cache = None
+
+def get_result_cache() -> ResultCache:
+    """Get or create the result cache singleton"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache()
+    return _result_cache
@@ -0,0 +1,348 @@
+"""
+Extraction Sandbox - Supervised processes that run PDF/DOCX text extraction
+Every extraction runs in a dedicated child process with a wall-clock deadline and
+an RSS growth budget. A pathological file that hangs, balloons or crashes the
+engine gets its process killed and replaced, and the caller gets a
+DocumentRejectedError instead of a stuck worker.
+"""
+import os
+import sys
+import time
+import queue
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from .pdf_extractors import PDF_ENGINE, count_pdf_pages, extract_document_text, extract_pdf_pages
+
+logger = logging.getLogger(__name__)
+
+# Master switch - when off, extraction runs directly in the worker pool
+SANDBOX_ENABLED = os.environ.get("ATS_SANDBOX_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# Supervised extraction processes (defaults to one per core)
+SANDBOX_POOL_SIZE = int(os.environ.get("ATS_SANDBOX_POOL_SIZE", os.cpu_count() or 2))
+
+# Wall-clock seconds one extraction may take before its process is killed
+SANDBOX_TIMEOUT_SECONDS = float(os.environ.get("ATS_SANDBOX_TIMEOUT_SECONDS", 20))
+
+# Memory an extraction may add on top of its process's idle RSS (0 disables)
+SANDBOX_MAX_RSS_MB = int(os.environ.get("ATS_SANDBOX_MAX_RSS_MB", 512))
+
+# Extractions a process serves before being replaced, to shed leaked memory (0 disables)
+SANDBOX_MAX_JOBS = int(os.environ.get("ATS_SANDBOX_MAX_JOBS", 200))
+
+# Children come from a forkserver (spawn where there is none), never a fork of the API
+# process - it runs ML, broker and SQLite threads, and a forked child can inherit a
+# lock one of them held and hang until the timeout rejects a valid file
+SANDBOX_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# How often the supervisor samples the child's RSS while waiting
+_POLL_INTERVAL = 0.05
+
+class DocumentRejectedError(ValueError):
+    """Raised when a document exceeds the sandbox's time or memory limits, or crashes it"""
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+class SandboxExtractionError(RuntimeError):
+    """Raised when extraction fails in a child the way it would in a worker (unreadable file)"""
+
+def _read_rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of a process, or None where it cannot be read"""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+# ============= CHILD SIDE (runs inside sandbox processes) =============
+
+def _run_request(request: Tuple) -> Any:
+    """Execute one extraction request"""
+    kind = request[0]
+    if kind == "text":
+        _, content, file_type = request
+        return extract_document_text(content, file_type, engine=PDF_ENGINE)
+    if kind == "pages":
+        _, content, start, end = request
+        return extract_pdf_pages(content, engine=PDF_ENGINE, page_numbers=list(range(start, end)))
+    if kind == "count":
+        _, content = request
+        return count_pdf_pages(content)
+    raise ValueError(f"Unknown sandbox request: {kind}")
+
+def _sandbox_main(conn):
+    """Serve extraction requests until the pipe closes"""
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+
+        try:
+            conn.send(("ok", _run_request(request)))
+        except MemoryError:
+            # Heap may be fragmented or half-full - report and exit so we get replaced
+            conn.send(("memory", "Extraction ran out of memory"))
+            return
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+# ============= SUPERVISOR SIDE (runs in the API process) =============
+
+# Serialises child starts while __main__ is hidden
+_start_lock = threading.Lock()
+
+def _sandbox_context():
+    """Start-method context for sandbox children"""
+    context = multiprocessing.get_context(SANDBOX_START_METHOD)
+    if SANDBOX_START_METHOD == "forkserver":
+        # The server imports only what extraction needs - not __main__ (app.py)
+        context.set_forkserver_preload([__name__])
+    return context
+
+def start_sandbox_server():
+    """Start the forkserver now - call at API startup, before the models load"""
+    if SANDBOX_ENABLED and SANDBOX_START_METHOD == "forkserver":
+        from multiprocessing import forkserver
+
+        _sandbox_context()
+        forkserver.ensure_running()
+
+@contextmanager
+def main_hidden():
+    """
+    Forkserver and spawn children re-run the parent's __main__ script before their
+    target. For `python app.py` that would load the parser and models in every
+    child, so hide its path while a child starts - targets live in the ml package.
+    """
+    main = sys.modules.get('__main__')
+    main_path = getattr(main, '__file__', None)
+    with _start_lock:
+        if main_path is not None:
+            del main.__file__
+        try:
+            yield
+        finally:
+            if main_path is not None:
+                main.__file__ = main_path
+
+class _SandboxProcess:
+    """One supervised child process and the parent end of its pipe"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_sandbox_main, args=(child_conn,), daemon=True)
+        with main_hidden():
+            self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        self.dead = False
+
+    def kill(self):
+        self.dead = True
+        try:
+            self.process.kill()
+            self.process.join(timeout=1)
+        except Exception as e:
+            logger.warning(f"Sandbox kill error: {e}")
+        self.conn.close()
+
+    def stop(self):
+        """Ask the child to exit, killing it if it does not"""
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=1)
+        except (OSError, ValueError):
+            pass
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.dead = True
+            self.conn.close()
+
+class ExtractionSandbox:
+    """Pool of supervised extraction processes with per-file time and memory limits"""
+
+    def __init__(self, size: int = SANDBOX_POOL_SIZE, timeout: float = SANDBOX_TIMEOUT_SECONDS,
+                 max_rss_mb: int = SANDBOX_MAX_RSS_MB, max_jobs: int = SANDBOX_MAX_JOBS):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.max_jobs = max_jobs
+        self._context = _sandbox_context()
+        self._idle: "queue.Queue[_SandboxProcess]" = queue.Queue()
+        # One supervisor thread per child - they only block on pipes
+        self._supervisors = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="sandbox")
+        self._started = False
+        self._lock = threading.Lock()
+        self.extractions = 0
+        self.timeouts = 0
+        self.memory_kills = 0
+        self.crashes = 0
+        self.recycled = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if not self._started:
+                for _ in range(self.size):
+                    self._idle.put(_SandboxProcess(self._context))
+                self._started = True
+
+    def run(self, request: Tuple, description: str = "") -> Any:
+        """Run one request in an idle child, enforcing the limits (blocking)"""
+        self._ensure_started()
+        worker = self._idle.get()
+        try:
+            return self._supervise(worker, request, description)
+        finally:
+            self._release(worker)
+
+    def _supervise(self, worker: _SandboxProcess, request: Tuple, description: str) -> Any:
+        pid = worker.process.pid
+        baseline_rss = _read_rss_bytes(pid) if self.max_rss_bytes else None
+        worker.jobs += 1
+        with self._lock:
+            self.extractions += 1
+
+        try:
+            worker.conn.send(request)
+        except (OSError, ValueError):
+            self._reject(worker, "crash", description)
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._reject(worker, "timeout", description)
+
+            if worker.conn.poll(min(_POLL_INTERVAL, remaining)):
+                try:
+                    status, payload = worker.conn.recv()
+                except (EOFError, OSError):
+                    self._reject(worker, "crash", description)
+                break
+
+            if baseline_rss is not None:
+                rss = _read_rss_bytes(pid)
+                if rss is not None and rss - baseline_rss > self.max_rss_bytes:
+                    self._reject(worker, "memory", description)
+
+        if status == "ok":
+            return payload
+        if status == "memory":
+            self._reject(worker, "memory", description)
+        # Ordinary extraction failure - the file is unreadable, not dangerous
+        raise SandboxExtractionError(payload)
+
+    def _reject(self, worker: _SandboxProcess, reason: str, description: str):
+        """Kill the child, record the metric and raise DocumentRejectedError"""
+        worker.kill()
+        with self._lock:
+            if reason == "timeout":
+                self.timeouts += 1
+            elif reason == "memory":
+                self.memory_kills += 1
+            else:
+                self.crashes += 1
+
+        logger.warning(f"🧯 sandbox_kill reason={reason} pid={worker.process.pid} {description}".rstrip())
+        messages = {
+            "timeout": f"Document took longer than {self.timeout:g}s to extract",
+            "memory": f"Document needed more than {self.max_rss_bytes // (1024 * 1024)} MB to extract",
+            "crash": "Document crashed the text extractor",
+        }
+        raise DocumentRejectedError(messages[reason], reason)
+
+    def _release(self, worker: _SandboxProcess):
+        """Return a child to the idle pool, replacing it if it died or is worn out"""
+        if not worker.dead and self.max_jobs and worker.jobs >= self.max_jobs:
+            worker.stop()
+        if worker.dead:
+            with self._lock:
+                self.recycled += 1
+            worker = _SandboxProcess(self._context)
+        self._idle.put(worker)
+
+    async def run_async(self, request: Tuple, description: str = "") -> Any:
+        """run() on a supervisor thread, without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._supervisors, self.run, request, description)
+
+    async def extract_text(self, content: bytes, file_type: str) -> str:
+        """Plain text of a PDF/DOCX upload"""
+        try:
+            text = await self.run_async(("text", content, file_type), f"file_type={file_type} bytes={len(content)}")
+        except SandboxExtractionError as e:
+            # Unreadable file - empty text, as IndianResumeParser.extract_text returns outside the sandbox
+            logger.warning(f"Sandbox extraction error: {e}")
+            return ""
+        return text or ""
+
+    async def extract_pages(self, content: bytes, start: int, end: int) -> List[str]:
+        """Text of PDF pages [start, end) - raises SandboxExtractionError rather than dropping them"""
+        return await self.run_async(("pages", content, start, end), f"pages={start}-{end} bytes={len(content)}")
+
+    async def page_count(self, content: bytes) -> int:
+        """Number of pages in a PDF - raises SandboxExtractionError when it cannot be read"""
+        return await self.run_async(("count", content), f"count bytes={len(content)}")
+
+    def shutdown(self):
+        """Stop every child process"""
+        with self._lock:
+            self._started = False
+        self._supervisors.shutdown(wait=False, cancel_futures=True)
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict:
+        """Extraction and kill counters"""
+        with self._lock:
+            return {
+                "enabled": SANDBOX_ENABLED,
+                "processes": self.size,
+                "timeout_seconds": self.timeout,
+                "max_rss_mb": self.max_rss_bytes // (1024 * 1024),
+                "extractions": self.extractions,
+                "timeouts": self.timeouts,
+                "memory_kills": self.memory_kills,
+                "crashes": self.crashes,
+                "recycled": self.recycled
+            }
+
+# Singleton instance
+_sandbox = None
+
+def get_sandbox() -> ExtractionSandbox:
+    """Get or create the extraction sandbox singleton"""
+    global _sandbox
+    if _sandbox is None:
+        _sandbox = ExtractionSandbox()
+    return _sandbox
+
+def shutdown_sandbox():
+    """Stop sandbox processes (called on API shutdown)"""
+    global _sandbox
+    if _sandbox is not None:
+        _sandbox.shutdown()
+        _sandbox = None
@@ -1,11 +1,12 @@
 import re
-from typing import Dict, List, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import Dict, List, Optional, Tuple
 import numpy as np
-from collections import Counter
 from datetime import datetime
 
+from .skill_taxonomy import SkillTaxonomy
+from .term_stats import get_term_statistics
+from .jd_analysis import JDAnalysis, build_jd_analysis
+
 # Import our new semantic matcher
 try:
     from .semantic_matcher import get_semantic_matcher
@@ -14,15 +15,26 @@ except ImportError:
     SEMANTIC_AVAILABLE = False
     print("⚠️ Semantic matcher not available. Using keyword matching only.")
 
+# Bump whenever weights, thresholds or lexicons change - invalidates cached scan results
+SCORER_VERSION = "1.3.0"
+
+# Technical keywords to prioritize
+TECH_PRIORITY_KEYWORDS = [
+    'python', 'java', 'javascript', 'react', 'angular', 'node',
+    'django', 'flask', 'spring', 'aws', 'azure', 'docker',
+    'kubernetes', 'sql', 'mongodb', 'git', 'jenkins',
+    'machine learning', 'data science', 'tensorflow', 'pytorch'
+]
+
 class ATSScanner:
-    def __init__(self):
+    def __init__(self, use_semantic: bool = True):
         # ATS-critical sections
         self.critical_sections = ['skills', 'experience', 'education']
         self.optional_sections = ['projects', 'certifications', 'achievements', 'summary']
         
         # Initialize semantic matcher if available
         self.semantic_matcher = None
-        if SEMANTIC_AVAILABLE:
+        if SEMANTIC_AVAILABLE and use_semantic:
             try:
                 self.semantic_matcher = get_semantic_matcher()
                 print("✅ Semantic matcher initialized successfully")
@@ -51,17 +63,49 @@ class ATSScanner:
             'git': ['git', 'github', 'gitlab', 'version control'],
             'devops': ['devops', 'ci/cd', 'jenkins', 'github actions'],
         }
+        
+        # Canonical skill ids - skill sets are bitsets over this taxonomy's categories
+        if self.semantic_matcher:
+            self.skill_taxonomy = self.semantic_matcher.skill_taxonomy
+        else:
+            self.skill_taxonomy = SkillTaxonomy(self.skill_variations, related_size=2)
+        
+        # Pre-fitted TF-IDF statistics (loaded once per process, transform only)
+        self.term_stats = get_term_statistics()
     
-    def calculate_ats_score(self, resume_data: Dict, job_description: str) -> Dict:
+    def scoring_signature(self) -> str:
+        """Identifies the scorer, model and term statistics behind a result (used as a cache key part)"""
+        if self.semantic_matcher:
+            model_id = getattr(self.semantic_matcher, 'model_id', 'semantic')
+        else:
+            model_id = "keyword"
+        # Both modes read the fitted term weights (missing keywords, feedback), so a refit invalidates results
+        return f"scorer-{SCORER_VERSION}:{model_id}+{self.term_stats.artifact_id}"
+    
+    def analyze_job_description(self, job_description: str) -> JDAnalysis:
+        """Pre-compute everything that depends only on the JD so it can be reused across resumes"""
+        return build_jd_analysis(
+            job_description,
+            skill_taxonomy=self.skill_taxonomy,
+            term_stats=self.term_stats,
+            semantic_matcher=self.semantic_matcher,
+            # TF-IDF row for keyword similarity, transformed once per JD
+            keyword_vector=self.semantic_matcher is None
+        )
+    
+    def calculate_ats_score(self, resume_data: Dict, job_description: str,
+                            jd_analysis: Optional[JDAnalysis] = None) -> Dict:
         """Calculate comprehensive ATS score using semantic matching if available"""
         resume_text = resume_data['raw_text']
+        if jd_analysis is None:
+            jd_analysis = self.analyze_job_description(job_description)
         
         # Calculate individual scores
         scores = {
             "section_presence": self._section_presence_score(resume_data.get('sections', {})),
             "formatting": self._formatting_score(resume_text),
-            "skill_match": self._skill_match_score(resume_data.get('skills', []), job_description),
-            "experience_match": self._experience_match_score(resume_data.get('experience', []), job_description),
+            "skill_match": self._skill_match_score(resume_data.get('skills', []), job_description, jd_analysis),
+            "experience_match": self._experience_match_score(resume_data.get('experience', []), job_description, jd_analysis),
             "education_match": self._education_match_score(resume_data.get('sections', {}).get('education', '')),
             "certification_match": self._certification_match_score(resume_data.get('certifications', []), job_description)
         }
@@ -69,14 +113,14 @@ class ATSScanner:
         # Add semantic similarity score if available
         if self.semantic_matcher:
             semantic_score = self.semantic_matcher.calculate_semantic_similarity(
-                resume_text, job_description
+                resume_text, job_description, job_embedding=jd_analysis.doc_embedding
             )
             scores["semantic_match"] = semantic_score
             # Extract key phrases for feedback
-            key_phrases = self.semantic_matcher.extract_key_phrases(job_description, 5)
+            key_phrases = jd_analysis.key_phrases[:5]
         else:
             # Fallback to keyword similarity
-            scores["keyword_match"] = self._keyword_similarity(resume_text, job_description)
+            scores["keyword_match"] = self._keyword_similarity(resume_text, job_description, jd_analysis)
             key_phrases = []
         
         # IMPROVED WEIGHTS - semantic matching gets highest weight when available
@@ -119,12 +163,12 @@ class ATSScanner:
         
         # Get missing keywords (using semantic if available)
         if self.semantic_matcher:
-            missing_keywords = self._extract_missing_keywords_semantic(resume_text, job_description)
+            missing_keywords = self._extract_missing_keywords_semantic(resume_text, job_description, jd_analysis)
         else:
-            missing_keywords = self._extract_missing_keywords(resume_text, job_description)
+            missing_keywords = self._extract_missing_keywords(resume_text, job_description, jd_analysis)
         
         # Generate enhanced feedback
-        feedback = self._generate_enhanced_feedback(scores, resume_data, job_description, final_score)
+        feedback = self._generate_enhanced_feedback(scores, resume_data, job_description, final_score, jd_analysis)
         
         result = {
             "overall_score": final_score,
@@ -141,58 +185,86 @@ class ATSScanner:
         
         return result
     
-    def _keyword_similarity(self, resume: str, jd: str) -> float:
-        """Fallback keyword similarity using TF-IDF"""
+    def _keyword_similarity(self, resume: str, jd: str, jd_analysis: Optional[JDAnalysis] = None) -> float:
+        """Fallback keyword similarity - cosine of pre-fitted TF-IDF vectors"""
         try:
-            vectorizer = TfidfVectorizer(
-                stop_words='english',
-                max_features=100,
-                ngram_range=(1, 2),
-                min_df=1
-            )
-            tfidf_matrix = vectorizer.fit_transform([resume, jd])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-            return 0.3 + (float(similarity[0][0]) * 0.7)
+            jd_vector = jd_analysis.term_vector if jd_analysis is not None else None
+            if jd_vector is None:
+                jd_vector = self.term_stats.transform([jd])
+            resume_vector = self.term_stats.transform([resume])
+            similarity = self.term_stats.similarity(resume_vector, jd_vector)
+            return 0.3 + (similarity * 0.7)
         except Exception as e:
             print(f"Keyword similarity error: {e}")
             return 0.4
     
-    def _extract_missing_keywords_semantic(self, resume: str, jd: str) -> List[str]:
+    def _extract_missing_keywords_semantic(self, resume: str, jd: str,
+                                           jd_analysis: Optional[JDAnalysis] = None) -> List[str]:
         """Extract missing keywords using semantic understanding"""
         if not self.semantic_matcher:
-            return self._extract_missing_keywords(resume, jd)
+            return self._extract_missing_keywords(resume, jd, jd_analysis)
         
         try:
             # Get key phrases from job description
-            key_phrases = self.semantic_matcher.extract_key_phrases(jd, 15)
+            if jd_analysis is None:
+                jd_analysis = self.analyze_job_description(jd)
+            key_phrases = jd_analysis.key_phrases[:15]
+            
+            # Resume skill bitset computed once - each phrase is then one bitwise and
+            resume_lower = resume.lower()
+            resume_mask = self.skill_taxonomy.text_mask(resume_lower)
             
-            missing = []
-            for phrase in key_phrases:
-                # Check if phrase or its semantic equivalent exists in resume
-                if not self.semantic_matcher.find_similar_skills(phrase, resume, threshold=0.7):
-                    missing.append(phrase)
+            # Check if each phrase or its semantic equivalent exists in resume
+            present = self._match_against_text(key_phrases, resume, resume_lower, resume_mask, threshold=0.7)
+            missing = [phrase for phrase, found in zip(key_phrases, present) if not found]
             
             return missing[:10]
         except Exception as e:
             print(f"Semantic keyword extraction error: {e}")
-            return self._extract_missing_keywords(resume, jd)
+            return self._extract_missing_keywords(resume, jd, jd_analysis)
     
-    def _skill_match_score(self, skills: List[str], jd: str) -> float:
+    def _match_against_text(self, items: List[str], text: str, text_lower: str, text_mask: int,
+                            threshold: float = 0.6, text_embedding=None) -> List[bool]:
+        """
+        find_similar_skills for many items against one text whose skill bitset is
+        precomputed: direct mention and shared taxonomy category first, then a
+        single batched embedding pass over whatever is left
+        """
+        if not text:
+            return [False] * len(items)
+        matched = [
+            bool(item) and (item.lower() in text_lower or bool(self.skill_taxonomy.mask(item) & text_mask))
+            for item in items
+        ]
+        pending = [index for index, item in enumerate(items) if item and not matched[index]]
+        if pending:
+            similar = self.semantic_matcher.embedding_matches(
+                [items[index] for index in pending], text, threshold, text_embedding=text_embedding
+            )
+            for index, is_similar in zip(pending, similar):
+                matched[index] = is_similar
+        return matched
+    
+    def _skill_match_score(self, skills: List[str], jd: str,
+                           jd_analysis: Optional[JDAnalysis] = None) -> float:
         """Calculate skill match using semantic similarity if available"""
         if not skills:
             return 0.2
         
         try:
+            if jd_analysis is None:
+                jd_analysis = self.analyze_job_description(jd)
+            jd_lower = jd_analysis.lower
+            jd_mask = jd_analysis.skill_mask
+            
             if self.semantic_matcher:
-                # Use semantic matching
-                matched = 0
-                for skill in skills[:15]:
-                    if self.semantic_matcher.find_similar_skills(skill, jd):
-                        matched += 1
+                # Use semantic matching - unmatched skills are embedded in one batch
+                matched = sum(self._match_against_text(
+                    skills[:15], jd, jd_lower, jd_mask, text_embedding=jd_analysis.probe_embedding
+                ))
                 return 0.2 + (matched / max(len(skills), 1) * 0.8)
             else:
                 # Fallback to keyword matching with variations
-                jd_lower = jd.lower()
                 matched_skills = []
                 partial_matches = []
                 
@@ -204,16 +276,10 @@ class ATSScanner:
                         matched_skills.append(skill)
                         continue
                     
-                    # Check for skill variations
-                    found = False
-                    for base_skill, variations in self.skill_variations.items():
-                        if skill_lower in variations or base_skill in skill_lower:
-                            if any(var in jd_lower for var in variations[:2]):
-                                partial_matches.append(skill)
-                                found = True
-                                break
-                    
-                    if not found:
+                    # Check for skill variations - shares a category with the JD
+                    if self.skill_taxonomy.mask(skill) & jd_mask:
+                        partial_matches.append(skill)
+                    else:
                         # Partial word match
                         words = skill_lower.split()
                         for word in words:
@@ -278,19 +344,21 @@ class ATSScanner:
             print(f"Formatting score error: {e}")
             return 0.8
     
-    def _experience_match_score(self, experience: List[Dict], jd: str) -> float:
+    def _experience_match_score(self, experience: List[Dict], jd: str,
+                                jd_analysis: Optional[JDAnalysis] = None) -> float:
         """Score based on experience relevance - FIXED for None values"""
         try:
-            jd_lower = jd.lower() if jd else ""
+            if jd_analysis is None:
+                jd_analysis = self.analyze_job_description(jd)
+            jd_lower = jd_analysis.lower
+            jd_mask = jd_analysis.skill_mask
             
-            # Extract required years from JD
-            years_pattern = r'(\d+)[\+]?\s*(?:years?|yrs?|yr)'
-            jd_years_match = re.search(years_pattern, jd_lower)
-            required_years = int(jd_years_match.group(1)) if jd_years_match else 2
+            # Required years from JD
+            required_years = jd_analysis.required_years
             
             # Base score for freshers
             if not experience:
-                if 'fresher' in jd_lower or '0 years' in jd_lower:
+                if jd_analysis.is_fresher_role:
                     return 0.9  # Fresher applying for fresher role
                 return 0.3  # Fresher applying for experienced role
             
@@ -299,7 +367,25 @@ class ATSScanner:
             relevance_score = 0
             leadership_score = 0
             
-            for exp in experience[:3]:  # Consider top 3 experiences
+            top_experience = experience[:3]  # Consider top 3 experiences
+            
+            # SAFELY get descriptions - handle None values
+            descriptions = [
+                "" if exp.get('description') is None else str(exp.get('description')).lower()
+                for exp in top_experience
+            ]
+            
+            # Semantic relevance of every description in one embedding batch
+            semantic_relevance = None
+            if self.semantic_matcher:
+                try:
+                    semantic_relevance = self._match_against_text(
+                        descriptions, jd, jd_lower, jd_mask, threshold=0.6, text_embedding=jd_analysis.probe_embedding
+                    )
+                except Exception as e:
+                    print(f"Experience relevance error: {e}")
+            
+            for index, exp in enumerate(top_experience):
                 # SAFELY get duration - handle None values
                 duration = exp.get('duration')
                 if duration is None:
@@ -307,12 +393,7 @@ class ATSScanner:
                 else:
                     duration = str(duration).lower()
                 
-                # SAFELY get description - handle None values
-                description = exp.get('description')
-                if description is None:
-                    description = ""
-                else:
-                    description = str(description).lower()
+                description = descriptions[index]
                 
                 # Extract years from duration
                 if 'present' in duration or 'current' in duration:
@@ -329,16 +410,11 @@ class ATSScanner:
                         total_years += 1  # Assume 1 year if only start date
                 
                 # Check for relevance using semantic if available
-                if self.semantic_matcher and description:
-                    try:
-                        if self.semantic_matcher.find_similar_skills(description, jd, threshold=0.6):
-                            relevance_score += 0.2
-                    except:
-                        # Simple relevance check as fallback
-                        if any(word in jd_lower for word in description.split()[:5] if word):
-                            relevance_score += 0.2
+                if semantic_relevance is not None:
+                    if semantic_relevance[index]:
+                        relevance_score += 0.2
                 else:
-                    # Simple relevance check
+                    # Simple relevance check (also the fallback if semantic matching failed)
                     if description and any(word in jd_lower for word in description.split()[:5] if word):
                         relevance_score += 0.2
                 
@@ -504,42 +580,22 @@ class ATSScanner:
             print(f"Bonus calculation error: {e}")
             return 0
     
-    def _extract_missing_keywords(self, resume: str, jd: str) -> List[str]:
+    def _extract_missing_keywords(self, resume: str, jd: str,
+                                  jd_analysis: Optional[JDAnalysis] = None) -> List[str]:
         """Fallback keyword extraction"""
         try:
             resume_lower = resume.lower() if resume else ""
-            jd_lower = jd.lower() if jd else ""
-            
-            # Extract meaningful keywords
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', jd_lower)
-            
-            # Stopwords
-            stopwords = {
-                'the', 'and', 'for', 'with', 'this', 'that', 'have', 'from', 
-                'will', 'your', 'would', 'should', 'candidate', 'position', 
-                'company', 'work', 'experience', 'skill', 'ability', 'knowledge',
-                'looking', 'hiring', 'join', 'team', 'role', 'job', 'required',
-                'preferred', 'qualifications', 'responsibilities', 'must', 'able'
-            }
-            
-            # Technical keywords to prioritize
-            tech_priority = [
-                'python', 'java', 'javascript', 'react', 'angular', 'node',
-                'django', 'flask', 'spring', 'aws', 'azure', 'docker',
-                'kubernetes', 'sql', 'mongodb', 'git', 'jenkins',
-                'machine learning', 'data science', 'tensorflow', 'pytorch'
-            ]
-            
-            keywords = [word for word in words if word not in stopwords and len(word) > 2]
-            word_counts = Counter(keywords)
+            if jd_analysis is None:
+                jd_analysis = self.analyze_job_description(jd)
+            term_weights = jd_analysis.term_weights
             
             # Score and rank missing keywords
             missing_scores = []
-            for word, count in word_counts.most_common(30):
+            for word, weight in term_weights:
                 if word not in resume_lower:
                     # Prioritize technical keywords
-                    priority = 3 if word in tech_priority else 1
-                    score = count * priority
+                    priority = 3 if word in TECH_PRIORITY_KEYWORDS else 1
+                    score = weight * priority
                     missing_scores.append((word, score))
             
             # Sort by score and return top keywords
@@ -549,7 +605,8 @@ class ATSScanner:
             print(f"Missing keywords extraction error: {e}")
             return []
     
-    def _generate_enhanced_feedback(self, scores: Dict, resume_data: Dict, jd: str, final_score: float) -> List[str]:
+    def _generate_enhanced_feedback(self, scores: Dict, resume_data: Dict, jd: str, final_score: float,
+                                    jd_analysis: Optional[JDAnalysis] = None) -> List[str]:
         """Generate enhanced, more specific feedback"""
         feedback = []
         
@@ -584,7 +641,7 @@ class ATSScanner:
             
             # Skill match feedback
             if scores.get('skill_match', 0) < 0.6:
-                missing = self._extract_missing_keywords(resume_data.get('raw_text', ''), jd)
+                missing = self._extract_missing_keywords(resume_data.get('raw_text', ''), jd, jd_analysis)
                 if missing:
                     feedback.append(f"💡 **Skills to add:** {', '.join(missing[:5])}")
             
@@ -613,7 +670,10 @@ class ATSScanner:
             # Certification feedback
             certs = resume_data.get('certifications', [])
             if len(certs) < 2:
-                cloud_in_jd = any(word in jd.lower() for word in ['aws', 'azure', 'gcp', 'cloud'])
+                if jd_analysis is not None:
+                    cloud_in_jd = jd_analysis.mentions_cloud
+                else:
+                    cloud_in_jd = any(word in jd.lower() for word in ['aws', 'azure', 'gcp', 'cloud'])
                 if cloud_in_jd:
                     feedback.append("☁️ **Certifications:** Job mentions cloud - consider adding AWS/Azure/Google Cloud certifications.")
                 else:
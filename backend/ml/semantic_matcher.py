@@ -2,19 +2,27 @@
 # SEMANTIC_MATCHER.PY - Sentence Transformers for semantic similarity
 # ============================================
 
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 import nltk
 from nltk.corpus import stopwords
 import re
 
+from .skill_taxonomy import SkillTaxonomy
+from .embedding_cache import embedding_cache_key, get_embedding_cache
+from .model_registry import DEFAULT_MODEL_NAME, get_model_registry
+
 class SemanticMatcher:
     def __init__(self):
         """Initialize the sentence transformer model"""
         print("🔄 Loading semantic matching model...")
         # Using all-MiniLM-L6-v2 - lightweight (80MB) and fast
-        self.model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+        self.model_name = DEFAULT_MODEL_NAME
+        # Shared with ResumeEmbeddingModel - one copy of the weights per process
+        registry = get_model_registry()
+        self.model = registry.encoder(self.model_name)
+        # Backend-specific id (PyTorch and int8 ONNX vectors never share cache entries)
+        self.model_id = registry.model_id(self.model_name)
         print("✅ Semantic model loaded successfully!")
         
         # Download NLTK stopwords if not already present
@@ -143,15 +151,16 @@ class SemanticMatcher:
             "capgemini": ["Capgemini", "Capgemini India"]
         }
         
+        # Synonym index built once - lookups below are hash lookups, not taxonomy scans
+        self.skill_taxonomy = SkillTaxonomy(self.skill_synonyms, related_size=5)
+        
         # Technical terms for preprocessing (expanded)
-        self.tech_terms = set()
-        for category, synonyms in self.skill_synonyms.items():
-            self.tech_terms.add(category)
-            for syn in synonyms:
-                self.tech_terms.add(syn.lower())
+        self.tech_terms = set(self.skill_taxonomy.keys())
+        # Only terms with dots need protecting in preprocess_text
+        self.dotted_terms = [term for term in self.tech_terms if '.' in term]
         
-        # Cache for embeddings to avoid recomputation
-        self.embedding_cache = {}
+        # Shared, bounded embedding cache (keyed by model + full-text digest)
+        self.embedding_cache = get_embedding_cache()
     
     def preprocess_text(self, text):
         """Clean and preprocess text for better embeddings"""
@@ -162,17 +171,15 @@ class SemanticMatcher:
         text = text.lower()
         
         # Preserve technical terms that might have dots (like node.js)
-        for term in self.tech_terms:
-            if '.' in term:
-                text = text.replace(term, term.replace('.', '_dot_'))
+        for term in self.dotted_terms:
+            text = text.replace(term, term.replace('.', '_dot_'))
         
         # Remove special characters but keep technical terms
         text = re.sub(r'[^a-z0-9\s\.]', ' ', text)
         
         # Restore dots for technical terms
-        for term in self.tech_terms:
-            if '.' in term:
-                text = text.replace(term.replace('.', '_dot_'), term)
+        for term in self.dotted_terms:
+            text = text.replace(term.replace('.', '_dot_'), term)
         
         # Remove extra whitespace
         text = ' '.join(text.split())
@@ -184,24 +191,44 @@ class SemanticMatcher:
         # Preprocess
         cleaned = self.preprocess_text(text)
         
-        # Check cache (using hash of first 1000 chars for performance)
-        cache_key = hash(cleaned[:1000])
-        if cache_key in self.embedding_cache:
-            return self.embedding_cache[cache_key]
+        encoded = cleaned[:5000]  # Limit length
+        
+        # Check cache (keyed on exactly the text that gets encoded)
+        cache_key = embedding_cache_key(self.model_id, encoded)
+        embedding = self.embedding_cache.get(cache_key)
+        if embedding is not None:
+            return embedding
         
         # Generate embedding
-        embedding = self.model.encode(cleaned[:5000])  # Limit length
-        self.embedding_cache[cache_key] = embedding
-        return embedding
+        return self.embedding_cache.put(cache_key, self.model.encode(encoded))
+    
+    def get_embeddings(self, texts):
+        """Embeddings for several texts - every uncached one goes through a single model.encode batch"""
+        encoded = [self.preprocess_text(text)[:5000] for text in texts]
+        cache_keys = [embedding_cache_key(self.model_id, e) for e in encoded]
+        embeddings = self.embedding_cache.get_many(cache_keys)
+        
+        pending = {}
+        for cache_key, e, embedding in zip(cache_keys, encoded, embeddings):
+            if embedding is None:
+                pending.setdefault(cache_key, e)
+        
+        if pending:
+            computed = self.embedding_cache.put_many(
+                dict(zip(pending, self.model.encode(list(pending.values()))))
+            )
+            embeddings = [computed[k] if e is None else e for k, e in zip(cache_keys, embeddings)]
+        
+        return np.array(embeddings)
     
-    def calculate_semantic_similarity(self, resume_text, job_text):
+    def calculate_semantic_similarity(self, resume_text, job_text, job_embedding=None):
         """Calculate semantic similarity between resume and job description"""
         if not resume_text or not job_text:
             return 0.0
         
-        # Get embeddings
+        # Get embeddings (job_embedding: precomputed, e.g. JDAnalysis.doc_embedding)
         resume_emb = self.get_embedding(resume_text)
-        job_emb = self.get_embedding(job_text)
+        job_emb = self.get_embedding(job_text) if job_embedding is None else job_embedding
         
         # Calculate cosine similarity
         similarity = cosine_similarity([resume_emb], [job_emb])[0][0]
@@ -211,6 +238,14 @@ class SemanticMatcher:
         
         return float(normalized)
     
+    def similarities_to(self, texts, embedding):
+        """Normalized (0-1) cosine similarity of every text to one precomputed embedding - one encode batch"""
+        return (cosine_similarity(self.get_embeddings(texts), [embedding])[:, 0] + 1) / 2
+    
+    def similarity_matrix(self, texts, others):
+        """Normalized (0-1) cosine similarity of every text against every other - two encode batches at most"""
+        return (cosine_similarity(self.get_embeddings(texts), self.get_embeddings(others)) + 1) / 2
+    
     def find_similar_skills(self, skill, text, threshold=0.6):
         """Enhanced skill matching with synonyms"""
         if not skill or not text:
@@ -223,15 +258,15 @@ class SemanticMatcher:
         if skill_lower in text_lower:
             return True
         
-        # Check synonyms
-        for base_skill, synonyms in self.skill_synonyms.items():
-            # Check if the skill matches this category
-            if skill_lower in base_skill or any(s.lower() in skill_lower for s in synonyms):
-                # Check if any synonym appears in text
-                if any(syn.lower() in text_lower for syn in synonyms[:5]):
-                    return True
+        # Check synonyms of every category the skill belongs to
+        if any(syn in text_lower for syn in self.skill_taxonomy.related_lower(skill)):
+            return True
         
         # Try semantic similarity for unmatched
+        return self.embedding_match(skill, text, threshold)
+    
+    def embedding_match(self, skill, text, threshold=0.6):
+        """Embedding-only half of find_similar_skills - for skills the taxonomy bitsets did not match"""
         try:
             skill_emb = self.get_embedding(skill)
             text_emb = self.get_embedding(text[:1000])
@@ -242,30 +277,52 @@ class SemanticMatcher:
             print(f"Semantic similarity error: {e}")
             return False
     
+    def embedding_matches(self, skills, text, threshold=0.6, text_embedding=None):
+        """
+        embedding_match for many skills against one text - one encode batch, one
+        similarity matrix. text_embedding: precomputed embedding of text[:1000].
+        """
+        if not skills or not text:
+            return [False] * len(skills)
+        try:
+            if text_embedding is None:
+                text_embedding = self.get_embedding(text[:1000])
+            similarities = self.similarities_to(skills, text_embedding)
+            return [bool(normalized > threshold) for normalized in similarities]
+        except Exception as e:
+            print(f"Semantic similarity error: {e}")
+            return [False] * len(skills)
+    
+    def split_sentences(self, text):
+        """Sentences long enough to be key phrase candidates"""
+        sentences = re.split(r'[.!?]+', text)
+        return [s.strip() for s in sentences if len(s.strip()) > 30]
+    
+    def embed_sentences(self, sentences):
+        """Embeddings of the first 20 sentences (the key phrase candidates)"""
+        return self.model.encode(sentences[:20])  # Limit for performance
+    
+    def rank_key_phrases(self, sentences, sent_embeddings, doc_embedding, top_k=5):
+        """Top sentences by similarity to the whole document"""
+        scores = cosine_similarity([doc_embedding], sent_embeddings)[0]
+        top_indices = np.argsort(scores)[-top_k:][::-1]
+        return [sentences[i][:100] for i in top_indices]
+    
     def extract_key_phrases(self, text, top_k=5):
         """Extract most important phrases using embeddings"""
         if not text:
             return []
         
         # Split into sentences
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 30]
-        
+        sentences = self.split_sentences(text)
         if not sentences:
             return []
         
         # Get embeddings for all sentences
-        sent_embeddings = self.model.encode(sentences[:20])  # Limit for performance
+        sent_embeddings = self.embed_sentences(sentences)
         doc_embedding = self.get_embedding(text)
         
-        # Calculate similarity scores
-        scores = cosine_similarity([doc_embedding], sent_embeddings)[0]
-        
-        # Get top sentences
-        top_indices = np.argsort(scores)[-top_k:][::-1]
-        key_phrases = [sentences[i][:100] for i in top_indices]
-        
-        return key_phrases
+        return self.rank_key_phrases(sentences, sent_embeddings, doc_embedding, top_k)
     
     def calculate_component_scores(self, resume_data, job_text):
         """Calculate semantic scores for different resume components"""
@@ -295,10 +352,10 @@ class SemanticMatcher:
     
     def get_synonyms_for_skill(self, skill):
         """Get all synonyms for a given skill"""
-        skill_lower = skill.lower()
-        for base_skill, synonyms in self.skill_synonyms.items():
-            if skill_lower in base_skill or any(s.lower() in skill_lower for s in synonyms):
-                return [base_skill] + synonyms[:8]
+        category_ids = self.skill_taxonomy.category_ids_for(skill)
+        if category_ids:
+            category_id = category_ids[0]
+            return [self.skill_taxonomy.categories[category_id]] + self.skill_taxonomy.synonyms(category_id)[:8]
         return [skill]
 
 # Singleton instance for reuse
@@ -0,0 +1,140 @@
+"""
+Skill Taxonomy - Precomputed index over a {category: [synonyms]} skill map
+Built once at startup: canonical category ids, a synonym -> category map and
+the related-skill closure of every synonym, so skill expansion and synonym
+lookup are hash lookups whose cost does not grow with the taxonomy. Skill sets
+are int bitsets over the category ids, so matching, gaps and overlap are
+bitwise operations.
+"""
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase and collapse whitespace - the form every index key uses"""
+    return ' '.join(skill.lower().split())
+
+def popcount(mask: int) -> int:
+    """Number of skills in a bitset"""
+    return mask.bit_count()
+
+def iter_ids(mask: int) -> Iterator[int]:
+    """Category ids set in a bitset, ascending"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class SkillTaxonomy:
+    """Reverse index of a skill synonym map"""
+
+    def __init__(self, synonyms: Dict[str, List[str]], related_size: int = 4):
+        """related_size: synonyms per category that make up a skill's related closure"""
+        self.categories: List[str] = list(synonyms)
+        self.category_ids: Dict[str, int] = {name: index for index, name in enumerate(self.categories)}
+        self._synonyms: List[List[str]] = [list(synonyms[name]) for name in self.categories]
+        self.related_size = related_size
+
+        # synonym (or category name) -> canonical category ids, in taxonomy order
+        index: Dict[str, List[int]] = {}
+        for category_id, name in enumerate(self.categories):
+            for term in [name] + self._synonyms[category_id]:
+                ids = index.setdefault(normalize_skill(term), [])
+                if category_id not in ids:
+                    ids.append(category_id)
+        self._index: Dict[str, Tuple[int, ...]] = {key: tuple(ids) for key, ids in index.items()}
+        self._max_key_words = max((len(key.split()) for key in self._index), default=1)
+
+        # Related-skill closure of every key, precomputed in original and lower case
+        self._closures: Dict[str, FrozenSet[str]] = {}
+        self._closures_lower: Dict[str, Tuple[str, ...]] = {}
+        for key, ids in self._index.items():
+            related = []
+            for category_id in ids:
+                related.extend(self._synonyms[category_id][:related_size])
+            self._closures[key] = frozenset(related)
+            self._closures_lower[key] = tuple(dict.fromkeys(term.lower() for term in related))
+
+        # Bitset of every key, and of every probe term (lowercased related synonym)
+        self._masks: Dict[str, int] = {key: sum(1 << i for i in ids) for key, ids in self._index.items()}
+        probes: Dict[str, int] = {}
+        for category_id, terms in enumerate(self._synonyms):
+            for term in terms[:related_size]:
+                probes[term.lower()] = probes.get(term.lower(), 0) | (1 << category_id)
+        self._probes: Tuple[Tuple[str, int], ...] = tuple(probes.items())
+
+    def keys(self) -> List[str]:
+        """Every indexed term (category names and synonyms, normalized)"""
+        return list(self._index)
+
+    def _matching_keys(self, skill: str) -> List[str]:
+        """Index keys for a skill: the whole skill, else any of its word n-grams"""
+        normalized = normalize_skill(skill)
+        if normalized in self._index:
+            return [normalized]
+
+        words = [word.strip(',;:()[]') for word in normalized.split()]
+        keys = []
+        for size in range(min(len(words), self._max_key_words), 0, -1):
+            for start in range(len(words) - size + 1):
+                gram = ' '.join(words[start:start + size])
+                if gram in self._index and gram not in keys:
+                    keys.append(gram)
+        return keys
+
+    def category_ids_for(self, skill: str) -> Tuple[int, ...]:
+        """Canonical ids of every category the skill belongs to (taxonomy order)"""
+        ids = []
+        for key in self._matching_keys(skill):
+            ids.extend(category_id for category_id in self._index[key] if category_id not in ids)
+        return tuple(sorted(ids))
+
+    def related(self, skill: str) -> FrozenSet[str]:
+        """Related skills (first related_size synonyms of each matching category)"""
+        keys = self._matching_keys(skill)
+        if len(keys) == 1:
+            return self._closures[keys[0]]
+        return frozenset().union(*(self._closures[key] for key in keys))
+
+    def related_lower(self, skill: str) -> Tuple[str, ...]:
+        """related(), lowercased - for substring probes against lowercased text"""
+        keys = self._matching_keys(skill)
+        if len(keys) == 1:
+            return self._closures_lower[keys[0]]
+        return tuple(dict.fromkeys(term for key in keys for term in self._closures_lower[key]))
+
+    def synonyms(self, category_id: int) -> List[str]:
+        """All synonyms of a category"""
+        return self._synonyms[category_id]
+
+    # ============= BITSETS =============
+
+    def mask(self, skill: str) -> int:
+        """Bitset of the categories a skill belongs to (0 if unknown)"""
+        mask = 0
+        for key in self._matching_keys(skill):
+            mask |= self._masks[key]
+        return mask
+
+    def encode(self, skills: Iterable[str]) -> int:
+        """Bitset of a whole skill list"""
+        mask = 0
+        for skill in skills:
+            if skill:
+                mask |= self.mask(skill)
+        return mask
+
+    def text_mask(self, text: str) -> int:
+        """
+        Bitset of the categories mentioned in free text - a category is present
+        when one of its related synonyms occurs in it, the same probe
+        related_lower() drives. Compute once per text and test skills with &.
+        """
+        text_lower = text.lower()
+        mask = 0
+        for term, term_mask in self._probes:
+            if term in text_lower:
+                mask |= term_mask
+        return mask
+
+    def decode(self, mask: int) -> List[str]:
+        """Category names in a bitset, in taxonomy order"""
+        return [self.categories[category_id] for category_id in iter_ids(mask)]
@@ -0,0 +1,253 @@
+"""
+Term Statistics - Pre-fitted TF-IDF weights for keyword similarity and JD keywords
+Document frequencies are fitted offline on a corpus of JDs and resumes and saved
+to a versioned artifact. The API loads it once and only ever transforms - no
+request fits a vectorizer on two documents any more.
+
+Fit an artifact (from backend/):
+    python -m ml.term_stats path/to/corpus [more paths...] [--hashing]
+The corpus is any mix of .txt, .pdf and .docx files (directories are walked).
+"""
+import os
+import time
+import hashlib
+import argparse
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# Bump when the artifact layout or tokenization changes - older artifacts are ignored
+TERM_STATS_FORMAT = 1
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+
+# Artifact loaded at startup; without one, keyword similarity is unweighted
+TERM_STATS_PATH = os.environ.get(
+    "ATS_TERM_STATS_PATH", os.path.join(MODELS_DIR, f"term_stats.v{TERM_STATS_FORMAT}.joblib")
+)
+
+# Hash buckets for hashing artifacts (unbounded vocabulary, fixed memory)
+HASHING_N_FEATURES = int(os.environ.get("ATS_TERM_STATS_N_FEATURES", 2 ** 18))
+
+VOCABULARY = "vocabulary"
+HASHING = "hashing"
+
+# JD boilerplate that is never a keyword, on top of the English stopwords
+JD_STOPWORDS = {
+    'candidate', 'position', 'company', 'work', 'experience', 'skill', 'ability',
+    'knowledge', 'looking', 'hiring', 'join', 'team', 'role', 'job', 'required',
+    'preferred', 'qualifications', 'responsibilities', 'able'
+}
+STOPWORDS = frozenset(ENGLISH_STOP_WORDS | JD_STOPWORDS)
+
+# A letter followed by letters/digits - "python3", "s3", "k8s"
+TOKEN_PATTERN = r"(?u)\b[a-zA-Z][a-zA-Z0-9]+\b"
+NGRAM_RANGE = (1, 2)
+
+def _vectorizer_options() -> Dict:
+    """Tokenization shared by fitting and transforming - changing it needs a new TERM_STATS_FORMAT"""
+    return {
+        "lowercase": True,
+        "token_pattern": TOKEN_PATTERN,
+        "stop_words": sorted(STOPWORDS),
+        "ngram_range": NGRAM_RANGE,
+    }
+
+def _hashing_vectorizer(n_features: int) -> HashingVectorizer:
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, **_vectorizer_options())
+
+def _whole_term(term: str) -> List[str]:
+    """Analyzer that hashes an already-tokenized term as-is"""
+    return [term]
+
+class TermStatistics:
+    """Loaded TF-IDF statistics - transform, similarity and term weights, never fit"""
+
+    def __init__(self, kind: str, vectorizer, idf: Optional[np.ndarray] = None,
+                 documents: int = 0, artifact_id: str = "unweighted"):
+        self.kind = kind
+        self.vectorizer = vectorizer
+        self.idf = idf                  # hashing only: per-bucket idf (None = unweighted)
+        self.documents = documents
+        self.artifact_id = artifact_id
+        self._analyzer = vectorizer.build_analyzer()
+
+        if kind == VOCABULARY:
+            self._vocabulary = vectorizer.vocabulary_
+            # Unseen terms are rarer than anything in the corpus
+            self._unseen_idf = float(vectorizer.idf_.max())
+        else:
+            self._term_hasher = HashingVectorizer(
+                n_features=vectorizer.n_features, analyzer=_whole_term, alternate_sign=False, norm=None
+            )
+
+    @classmethod
+    def unweighted(cls) -> "TermStatistics":
+        """Plain TF hashing - used until an artifact has been fitted"""
+        return cls(HASHING, _hashing_vectorizer(HASHING_N_FEATURES))
+
+    def transform(self, texts: List[str]):
+        """L2-normalised TF-IDF rows (scipy sparse)"""
+        if self.kind == VOCABULARY:
+            return self.vectorizer.transform(texts)
+        counts = self.vectorizer.transform(texts)
+        if self.idf is not None:
+            counts = counts.multiply(self.idf).tocsr()
+        return normalize(counts)
+
+    @staticmethod
+    def similarity(a, b) -> float:
+        """Cosine of two transform() rows"""
+        return float(a.multiply(b).sum())
+
+    def idf_of(self, terms: List[str]) -> np.ndarray:
+        """IDF of each term (1.0 everywhere when unweighted)"""
+        if self.kind == VOCABULARY:
+            idf = self.vectorizer.idf_
+            return np.array([
+                idf[self._vocabulary[term]] if term in self._vocabulary else self._unseen_idf
+                for term in terms
+            ])
+        if self.idf is None or not terms:
+            return np.ones(len(terms))
+        # One row per term, one bucket per row
+        buckets = self._term_hasher.transform(terms).tocsr().indices
+        return self.idf[buckets]
+
+    def term_weights(self, text: str, top_k: int = 30, max_words: int = 1) -> List[Tuple[str, float]]:
+        """Top terms of a text by tf * idf - terms of up to max_words words, at least 3 characters"""
+        if not text:
+            return []
+        counts = Counter(
+            term for term in self._analyzer(text)
+            if len(term) > 2 and term.count(' ') < max_words
+        )
+        if not counts:
+            return []
+        terms = list(counts)
+        weights = np.array([counts[term] for term in terms]) * self.idf_of(terms)
+        ranked = sorted(zip(terms, weights.tolist()), key=lambda item: item[1], reverse=True)
+        return [(term, round(weight, 3)) for term, weight in ranked[:top_k]]
+
+    def describe(self) -> Dict:
+        return {"artifact": self.artifact_id, "kind": self.kind, "documents": self.documents}
+
+# ============= FITTING (offline) =============
+
+def fit_term_statistics(texts: List[str], hashing: bool = False,
+                        n_features: int = HASHING_N_FEATURES, min_df: int = 2) -> Dict:
+    """Fit document frequencies on a corpus and return the artifact dict"""
+    import sklearn
+
+    if hashing:
+        vectorizer = _hashing_vectorizer(n_features)
+        counts = vectorizer.transform(texts).tocsr()
+        counts.sum_duplicates()
+        document_frequency = np.bincount(counts.indices, minlength=n_features)
+        # Same smoothed idf as TfidfVectorizer
+        idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+    else:
+        vectorizer = TfidfVectorizer(min_df=min_df, **_vectorizer_options()).fit(texts)
+        idf = None
+
+    return {
+        "format": TERM_STATS_FORMAT,
+        "kind": HASHING if hashing else VOCABULARY,
+        "vectorizer": vectorizer,
+        "idf": idf,
+        "documents": len(texts),
+        "fitted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sklearn_version": sklearn.__version__,
+    }
+
+def save_term_statistics(artifact: Dict, path: str = TERM_STATS_PATH):
+    import joblib
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    joblib.dump(artifact, path, compress=3)
+
+def load_term_statistics(path: str = TERM_STATS_PATH) -> TermStatistics:
+    """Load a fitted artifact, falling back to unweighted hashing"""
+    if not os.path.exists(path):
+        print(f"⚠️ No term statistics at {path} - keyword weights are unweighted (fit with: python -m ml.term_stats)")
+        return TermStatistics.unweighted()
+
+    try:
+        import joblib
+
+        artifact = joblib.load(path)
+        if artifact.get("format") != TERM_STATS_FORMAT:
+            print(f"⚠️ Term statistics {path} have format {artifact.get('format')}, expected {TERM_STATS_FORMAT} - refit them")
+            return TermStatistics.unweighted()
+
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:12]
+        stats = TermStatistics(
+            artifact["kind"], artifact["vectorizer"], artifact.get("idf"),
+            artifact.get("documents", 0), f"tfidf-v{TERM_STATS_FORMAT}-{digest}"
+        )
+        print(f"✅ Term statistics loaded: {stats.artifact_id} ({stats.kind}, {stats.documents} documents)")
+        return stats
+    except Exception as e:
+        print(f"⚠️ Could not load term statistics {path}: {e}")
+        return TermStatistics.unweighted()
+
+# Singleton instance - one per process
+_term_stats = None
+
+def get_term_statistics() -> TermStatistics:
+    """Get or load the term statistics singleton"""
+    global _term_stats
+    if _term_stats is None:
+        _term_stats = load_term_statistics()
+    return _term_stats
+
+def _iter_corpus(paths: List[str]) -> Iterator[str]:
+    """Text of every .txt/.pdf/.docx file under the given paths"""
+    from .pdf_extractors import extract_document_text
+
+    for root in paths:
+        files = [root] if os.path.isfile(root) else sorted(
+            os.path.join(folder, name) for folder, _, names in os.walk(root) for name in names
+        )
+        for file_path in files:
+            extension = os.path.splitext(file_path)[1].lower().lstrip('.')
+            try:
+                if extension == "txt":
+                    with open(file_path, encoding='utf-8', errors='ignore') as f:
+                        text = f.read()
+                elif extension in ("pdf", "docx"):
+                    with open(file_path, 'rb') as f:
+                        text = extract_document_text(f.read(), extension)
+                else:
+                    continue
+            except Exception as e:
+                print(f"⚠️ Skipping {file_path}: {e}")
+                continue
+            if text and text.strip():
+                yield text
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit TF-IDF term statistics on a corpus of JDs and resumes")
+    parser.add_argument("paths", nargs="+", help="Files or directories (.txt, .pdf, .docx)")
+    parser.add_argument("--output", default=TERM_STATS_PATH)
+    parser.add_argument("--hashing", action="store_true", help="Hash terms into buckets (unbounded vocabulary)")
+    parser.add_argument("--n-features", type=int, default=HASHING_N_FEATURES)
+    parser.add_argument("--min-df", type=int, default=2, help="Vocabulary mode: drop terms in fewer documents")
+    args = parser.parse_args()
+
+    texts = list(_iter_corpus(args.paths))
+    if not texts:
+        parser.error("no documents found")
+
+    start = time.perf_counter()
+    artifact = fit_term_statistics(texts, hashing=args.hashing, n_features=args.n_features, min_df=args.min_df)
+    save_term_statistics(artifact, args.output)
+    print(f"✅ Fitted {artifact['kind']} term statistics on {len(texts)} documents "
+          f"in {time.perf_counter() - start:.1f}s -> {args.output}")
+
+if __name__ == "__main__":
+    main()
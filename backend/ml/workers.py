@@ -0,0 +1,316 @@
+"""
+Execution Layer - Keeps CPU-bound parsing and scoring off the asyncio event loop
+Parsing and keyword scoring run in a bounded process pool; the semantic model
+stays in the API process and runs in a small thread pool. Text extraction from
+uploads runs in the supervised extraction sandbox (see sandbox.py).
+"""
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .parse_cache import get_parse_cache, document_cache_key, text_cache_key
+from .pdf_extractors import (
+    MAX_PDF_PAGES, check_document_size, count_pdf_pages, extract_pdf_pages, join_pages
+)
+from .sandbox import SANDBOX_ENABLED, get_sandbox, main_hidden, shutdown_sandbox
+from .parser import NER_BATCH_SIZE
+from .jd_analysis import JDAnalysis
+
+# Number of worker processes (defaults to one per core)
+WORKER_POOL_SIZE = int(os.environ.get("ATS_WORKER_POOL_SIZE", os.cpu_count() or 2))
+
+# Threads that may run the (GIL-releasing) semantic model concurrently
+ML_THREAD_POOL_SIZE = int(os.environ.get("ATS_ML_THREAD_POOL_SIZE", 4))
+
+# Max tasks queued or running in the process pool before callers wait
+MAX_PENDING_TASKS = int(os.environ.get("ATS_MAX_PENDING_TASKS", WORKER_POOL_SIZE * 4))
+
+# Workers start from a forkserver (spawn where there is none) - by the first request the
+# API process runs ML, broker and sandbox threads, and a fork could inherit a held lock
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# PDFs with more pages than this are split across workers (0 disables)
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get("ATS_PARALLEL_PAGE_THRESHOLD", 8))
+
+# Pages extracted per worker task in parallel mode
+PAGES_PER_TASK = int(os.environ.get("ATS_PAGES_PER_TASK", 4))
+
+# ============= WORKER-SIDE FUNCTIONS (run inside pool processes) =============
+
+# Per-process components - built once by _init_worker, never shared
+_worker_parser = None
+_worker_scanner = None
+
+def _init_worker():
+    """Load parser and keyword scanner once per worker process"""
+    global _worker_parser, _worker_scanner
+    from .parser import IndianResumeParser
+    from .scorer import ATSScanner
+
+    _worker_parser = IndianResumeParser()
+    # The semantic model stays in the API process - workers only do CPU-bound work
+    _worker_scanner = ATSScanner(use_semantic=False)
+
+def extract_document(content: bytes, file_type: str) -> str:
+    """Extract text from uploaded file bytes in memory (runs inside a worker, sandbox disabled)"""
+    return _worker_parser.extract_text(content, file_type)
+
+def extract_page_range(content: bytes, start: int, end: int) -> List[str]:
+    """Extract pages [start, end) of a PDF (runs inside a worker)"""
+    return extract_pdf_pages(content, engine=_worker_parser.pdf_engine, page_numbers=list(range(start, end)))
+
+def parse_text(text: str, mode: Optional[str] = None) -> Dict:
+    """Parse plain resume text (runs inside a worker)"""
+    return _worker_parser.parse_resume(text, mode=mode)
+
+def parse_texts(texts: List[str], mode: Optional[str] = None) -> List[Dict]:
+    """Parse several resume texts with batched NER (runs inside a worker)"""
+    # Pool workers are daemonic and cannot fork spaCy processes of their own
+    return _worker_parser.parse_resumes(texts, n_process=1, mode=mode)
+
+def score_resume(resume_data: Dict, job_description: str, jd_analysis: Optional[JDAnalysis] = None) -> Dict:
+    """Keyword-only ATS scoring (runs inside a worker)"""
+    return _worker_scanner.calculate_ats_score(resume_data, job_description, jd_analysis)
+
+def scan_text(text: str, job_description: str, jd_analysis: Optional[JDAnalysis] = None,
+              mode: Optional[str] = None) -> Tuple[Dict, Dict]:
+    """Parse and keyword-score plain resume text in one worker round trip"""
+    resume_data = parse_text(text, mode)
+    return resume_data, score_resume(resume_data, job_description, jd_analysis)
+
+# ============= POOLS =============
+
+# Singletons - created on first use
+_worker_pool = None
+_ml_thread_pool = None
+_pending_tasks = None
+
+class _WorkerPool(ProcessPoolExecutor):
+    """Process pool whose workers never re-run the API's __main__ script"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        # Non-fork pools start workers on demand, inside submit
+        with main_hidden():
+            return super().submit(fn, *args, **kwargs)
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """Get or create the shared process pool"""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = _WorkerPool(
+            max_workers=WORKER_POOL_SIZE,
+            mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+            initializer=_init_worker
+        )
+    return _worker_pool
+
+def get_ml_thread_pool() -> ThreadPoolExecutor:
+    """Get or create the thread pool that runs the semantic model"""
+    global _ml_thread_pool
+    if _ml_thread_pool is None:
+        _ml_thread_pool = ThreadPoolExecutor(
+            max_workers=ML_THREAD_POOL_SIZE,
+            thread_name_prefix="ml"
+        )
+    return _ml_thread_pool
+
+def _get_pending_tasks() -> asyncio.Semaphore:
+    """Semaphore bounding how much work can pile up in the process pool"""
+    global _pending_tasks
+    if _pending_tasks is None:
+        _pending_tasks = asyncio.Semaphore(MAX_PENDING_TASKS)
+    return _pending_tasks
+
+def shutdown_worker_pool():
+    """Stop worker processes, sandbox processes and ML threads (called on API shutdown)"""
+    global _worker_pool, _ml_thread_pool
+    shutdown_sandbox()
+    if _worker_pool is not None:
+        _worker_pool.shutdown(wait=False, cancel_futures=True)
+        _worker_pool = None
+    if _ml_thread_pool is not None:
+        _ml_thread_pool.shutdown(wait=False, cancel_futures=True)
+        _ml_thread_pool = None
+
+# ============= ASYNC HELPERS (called from API endpoints) =============
+
+async def run_in_worker(func: Callable, *args) -> Any:
+    """Run a picklable function in the process pool without blocking the event loop"""
+    async with _get_pending_tasks():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_worker_pool(), func, *args)
+
+async def run_in_ml_thread(func: Callable, *args) -> Any:
+    """Run a call that uses the in-process semantic model on the ML thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_ml_thread_pool(), func, *args)
+
+async def _long_pdf_page_count(content: bytes, file_type: str) -> int:
+    """Page count when a PDF is long enough for parallel extraction, else 0"""
+    if file_type != 'pdf' or PARALLEL_PAGE_THRESHOLD <= 0:
+        return 0
+    if SANDBOX_ENABLED:
+        page_count = await get_sandbox().page_count(content)
+    else:
+        page_count = await run_in_worker(count_pdf_pages, content)
+    if page_count <= PARALLEL_PAGE_THRESHOLD:
+        return 0
+    return min(page_count, MAX_PDF_PAGES)
+
+async def _extract_page_range_async(content: bytes, start: int, end: int) -> List[str]:
+    if SANDBOX_ENABLED:
+        return await get_sandbox().extract_pages(content, start, end)
+    return await run_in_worker(extract_page_range, content, start, end)
+
+async def _extract_pages_parallel(content: bytes, page_count: int) -> str:
+    """Fan page ranges out over the extraction processes and join the text in page order"""
+    ranges = [
+        (start, min(start + PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    chunks = await asyncio.gather(*[
+        _extract_page_range_async(content, start, end) for start, end in ranges
+    ])
+    return join_pages([page for chunk in chunks for page in chunk])
+
+async def extract_text_async(content: bytes, file_type: str) -> str:
+    """
+    Extract upload text off the event loop - in the sandbox when enabled (raises
+    DocumentRejectedError for files that break its limits), long PDFs page-parallel
+    """
+    check_document_size(content)
+    page_count = await _long_pdf_page_count(content, file_type)
+    if page_count:
+        return await _extract_pages_parallel(content, page_count)
+    if SANDBOX_ENABLED:
+        return await get_sandbox().extract_text(content, file_type)
+    return await run_in_worker(extract_document, content, file_type)
+
+async def parse_document_async(content: bytes, file_type: str, mode: Optional[str] = None) -> Dict:
+    """Extract + parse an uploaded file off the event loop (cached by content digest)"""
+    check_document_size(content)
+    cache = get_parse_cache()
+    key = document_cache_key(content, file_type, mode)
+    resume_data = cache.get(key)
+    if resume_data is None:
+        text = await extract_text_async(content, file_type)
+        resume_data = await run_in_worker(parse_text, text, mode)
+        cache.put(key, resume_data)
+    return resume_data
+
+async def parse_text_async(text: str, mode: Optional[str] = None) -> Dict:
+    """Parse resume text off the event loop (cached by content digest)"""
+    cache = get_parse_cache()
+    key = text_cache_key(text, mode)
+    resume_data = cache.get(key)
+    if resume_data is None:
+        resume_data = await run_in_worker(parse_text, text, mode)
+        cache.put(key, resume_data)
+    return resume_data
+
+async def parse_batch_async(documents: List[Dict], mode: Optional[str] = None) -> List[Any]:
+    """
+    Parse many resumes at once - each document is {"text": ...} or
+    {"content": ..., "file_type": ...}. Cache misses are parsed in chunks of
+    NER_BATCH_SIZE so NER runs through nlp.pipe, chunks spread over the pool.
+    mode selects the parser mode ("full"/"fast") for the whole batch.
+    Returns one parse result per document, or the exception that stopped it.
+    """
+    cache = get_parse_cache()
+    results: List[Any] = [None] * len(documents)
+    keys: List[Optional[str]] = [None] * len(documents)
+    missing = []
+    for index, document in enumerate(documents):
+        try:
+            if document.get("text") is not None:
+                keys[index] = text_cache_key(document["text"], mode)
+            else:
+                check_document_size(document["content"])
+                keys[index] = document_cache_key(document["content"], document["file_type"], mode)
+        except Exception as e:
+            results[index] = e
+            continue
+        results[index] = cache.get(keys[index])
+        if results[index] is None:
+            missing.append(index)
+
+    async def _text_of(index: int) -> str:
+        document = documents[index]
+        if document.get("text") is not None:
+            return document["text"]
+        return await extract_text_async(document["content"], document["file_type"])
+
+    texts = await asyncio.gather(*[_text_of(index) for index in missing], return_exceptions=True)
+    to_parse = []
+    for index, text in zip(missing, texts):
+        if isinstance(text, Exception):
+            results[index] = text
+        else:
+            to_parse.append((index, text))
+
+    chunks = [to_parse[i:i + NER_BATCH_SIZE] for i in range(0, len(to_parse), NER_BATCH_SIZE)]
+    parsed_chunks = await asyncio.gather(*[
+        run_in_worker(parse_texts, [text for _, text in chunk], mode) for chunk in chunks
+    ], return_exceptions=True)
+    for chunk, parsed in zip(chunks, parsed_chunks):
+        for position, (index, _) in enumerate(chunk):
+            if isinstance(parsed, Exception):
+                results[index] = parsed
+            else:
+                results[index] = parsed[position]
+                cache.put(keys[index], parsed[position])
+    return results
+
+async def score_resume_async(scanner, resume_data: Dict, job_description: str,
+                             jd_analysis: Optional[JDAnalysis] = None) -> Dict:
+    """
+    Score off the event loop: keyword scoring goes to the process pool,
+    semantic scoring uses the API process's model on the ML thread pool
+    """
+    if scanner.semantic_matcher is None:
+        return await run_in_worker(score_resume, resume_data, job_description, jd_analysis)
+    return await run_in_ml_thread(scanner.calculate_ats_score, resume_data, job_description, jd_analysis)
+
+async def analyze_job_async(scanner, job_description: str) -> JDAnalysis:
+    """Run JD-only analysis (may embed the JD) off the event loop"""
+    return await run_in_ml_thread(scanner.analyze_job_description, job_description)
+
+async def scan_async(scanner, job_description: str, jd_analysis: Optional[JDAnalysis] = None,
+                     content: Optional[bytes] = None, file_type: Optional[str] = None,
+                     text: Optional[str] = None, resume_data: Optional[Dict] = None,
+                     parser_mode: Optional[str] = None) -> Tuple[Dict, Dict]:
+    """
+    Parse + score one resume (file bytes or text) with the fewest pool round trips.
+    Pass resume_data when the resume was already parsed (e.g. by parse_batch_async).
+    """
+    if resume_data is not None:
+        ats_results = await score_resume_async(scanner, resume_data, job_description, jd_analysis)
+        return resume_data, ats_results
+
+    if text is None:
+        check_document_size(content)
+    cache = get_parse_cache()
+    if text is not None:
+        key = text_cache_key(text, parser_mode)
+    else:
+        key = document_cache_key(content, file_type, parser_mode)
+    resume_data = cache.get(key)
+
+    if resume_data is None:
+        if text is None:
+            text = await extract_text_async(content, file_type)
+
+        if scanner.semantic_matcher is None:
+            # Keyword scoring is pure CPU work - do parse + score in one worker trip
+            resume_data, ats_results = await run_in_worker(
+                scan_text, text, job_description, jd_analysis, parser_mode)
+            cache.put(key, resume_data)
+            return resume_data, ats_results
+
+        resume_data = await run_in_worker(parse_text, text, parser_mode)
+        cache.put(key, resume_data)
+
+    ats_results = await score_resume_async(scanner, resume_data, job_description, jd_analysis)
+    return resume_data, ats_results
@@ -36,6 +36,12 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
         .catch(error => sendResponse({ error: error.message }));
       break;
       
+    case 'scanJobs':
+      handleJobsBatchScan(request.jobs, request.resume)
+        .then(result => sendResponse(result))
+        .catch(error => sendResponse({ error: error.message }));
+      break;
+      
     case 'saveResume':
       chrome.storage.local.set({ resume: request.resume });
       sendResponse({ success: true });
@@ -124,15 +130,78 @@ async function handleJobScan(jobDetails, resume) {
   }
 }
 
-// Save scan to history
+// Handle scanning a whole page of jobs in one request
+async function handleJobsBatchScan(jobs, resume) {
+  if (!jobs || !jobs.length || !resume) {
+    throw new Error('Missing jobs or resume');
+  }
+
+  try {
+    const settings = await chrome.storage.local.get(['settings']);
+    const apiUrl = settings.settings?.apiUrl || 'http://localhost:8000';
+
+    // Resume is sent (and parsed) once for every job on the page
+    const body = new URLSearchParams({ resume_text: resume.content });
+    jobs.forEach(job => {
+      body.append('job_descriptions', job.description || '');
+      body.append('job_titles', job.title || '');
+    });
+
+    const response = await fetch(`${apiUrl}/api/analyze-text/batch`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/x-www-form-urlencoded',
+      },
+      body
+    });
+
+    if (!response.ok) {
+      throw new Error(`API error: ${response.status}`);
+    }
+
+    const result = await response.json();
+
+    // Attach job details to each per-JD result
+    const historyEntries = [];
+    result.results.forEach(item => {
+      const job = jobs[item.index] || {};
+      item.job = {
+        title: job.title,
+        company: job.company,
+        location: job.location
+      };
+
+      if (!item.error) {
+        historyEntries.push({
+          timestamp: new Date().toISOString(),
+          job: item.job,
+          score: item.overall_score,
+          skills: result.parsed_data.skills,
+          missing_keywords: item.missing_keywords
+        });
+      }
+    });
+
+    // Save to history if enabled
+    if (settings.settings?.saveHistory && historyEntries.length) {
+      saveToHistory(historyEntries);
+    }
+
+    return result;
+  } catch (error) {
+    console.error('Batch scan error:', error);
+    throw error;
+  }
+}
+
+// Save scan (or a list of scans) to history
 function saveToHistory(scanData) {
   chrome.storage.local.get(['history'], (result) => {
     const history = result.history || [];
-    history.unshift(scanData); // Add to beginning
+    const entries = Array.isArray(scanData) ? scanData : [scanData];
+    history.unshift(...entries); // Add to beginning
     // Keep last 50 scans
-    if (history.length > 50) {
-      history.pop();
-    }
+    history.splice(50);
     chrome.storage.local.set({ history });
   });
 }
@@ -3,7 +3,7 @@
 # ============================================
 
 import streamlit as st
-from company_templates import COMPANY_REQUIREMENTS, calculate_company_score
+from company_templates import COMPANY_REQUIREMENTS, calculate_company_score, missing_skills, resume_skill_mask
 
 def show_company_simulator(resume_skills=None, cgpa=None, experience=None):
     """Display company-specific ATS simulator"""
@@ -100,13 +100,15 @@ def show_company_simulator(resume_skills=None, cgpa=None, experience=None):
             st.markdown("### 📊 Company Scores")
             
             # Create score cards for each company
+            skill_mask = resume_skill_mask(resume_skills)
             scores = []
             for company in filtered_companies[:6]:  # Show top 6
                 score, details = calculate_company_score(
                     resume_skills, 
                     company, 
                     cgpa_input, 
-                    experience_input
+                    experience_input,
+                    skill_mask=skill_mask
                 )
                 scores.append((company, score, details))
             
@@ -181,10 +183,7 @@ def show_company_simulator(resume_skills=None, cgpa=None, experience=None):
                     
                     # Missing critical skills
                     st.markdown("**❌ Missing Critical Skills:**")
-                    missing = []
-                    for skill in company_data['skills']['critical']:
-                        if not any(skill.lower() in s.lower() for s in resume_skills):
-                            missing.append(skill)
+                    missing = missing_skills(skill_mask, company)
                     
                     if missing:
                         for skill in missing[:5]:
@@ -199,9 +198,10 @@ def get_company_recommendations(resume_skills, cgpa, experience):
     
     recommendations = []
     scores = []
+    skill_mask = resume_skill_mask(resume_skills)
     
     for company in COMPANY_REQUIREMENTS.keys():
-        score, _ = calculate_company_score(resume_skills, company, cgpa, experience)
+        score, _ = calculate_company_score(resume_skills, company, cgpa, experience, skill_mask=skill_mask)
         scores.append((company, score))
     
     scores.sort(key=lambda x: x[1], reverse=True)
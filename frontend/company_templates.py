@@ -180,7 +180,57 @@ COMPANY_REQUIREMENTS = {
     }
 }
 
-def calculate_company_score(resume_skills, company_name, cgpa, experience_years):
+# ============================================
+# SKILL VOCABULARY - integer ids and bitsets for requirement skills
+# ============================================
+
+# Every requirement skill across all companies, lowercased; list index = skill id
+SKILL_VOCABULARY = sorted({
+    skill.lower()
+    for company in COMPANY_REQUIREMENTS.values()
+    for tier_skills in company["skills"].values()
+    for skill in tier_skills
+})
+SKILL_IDS = {skill: skill_id for skill_id, skill in enumerate(SKILL_VOCABULARY)}
+
+def skills_to_mask(skills):
+    """Bitset of the vocabulary skills in a list of requirement names"""
+    mask = 0
+    for skill in skills:
+        skill_id = SKILL_IDS.get(skill.lower())
+        if skill_id is not None:
+            mask |= 1 << skill_id
+    return mask
+
+# Company -> tier ("critical", "preferred", "bonus") -> requirement bitset
+COMPANY_SKILL_MASKS = {
+    name: {tier: skills_to_mask(tier_skills) for tier, tier_skills in company["skills"].items()}
+    for name, company in COMPANY_REQUIREMENTS.items()
+}
+
+def resume_skill_mask(resume_skills):
+    """
+    Bitset of the requirement skills a resume covers - a requirement counts when
+    it appears inside any resume skill ("sql" in "MySQL"). Compute once per
+    resume and reuse it for every company.
+    """
+    joined = "\n".join(s.lower() for s in resume_skills)
+    mask = 0
+    for skill_id, skill in enumerate(SKILL_VOCABULARY):
+        if skill in joined:
+            mask |= 1 << skill_id
+    return mask
+
+def has_skill(skill_mask, skill):
+    """Whether a requirement skill is set in a bitset"""
+    return bool(skill_mask >> SKILL_IDS[skill.lower()] & 1)
+
+def missing_skills(skill_mask, company_name, tier="critical"):
+    """Requirement skills of one tier the resume does not cover, in listed order"""
+    return [skill for skill in COMPANY_REQUIREMENTS[company_name]["skills"][tier]
+            if not has_skill(skill_mask, skill)]
+
+def calculate_company_score(resume_skills, company_name, cgpa, experience_years, skill_mask=None):
     """Calculate company-specific ATS score"""
     
     company = COMPANY_REQUIREMENTS.get(company_name)
@@ -194,46 +244,26 @@ def calculate_company_score(resume_skills, company_name, cgpa, experience_years)
     # Convert resume skills to lowercase for matching
     resume_skills_lower = [s.lower() for s in resume_skills]
     resume_text = ' '.join(resume_skills_lower)
+    if skill_mask is None:
+        skill_mask = resume_skill_mask(resume_skills)
     
-    # Skill Match (50 points)
-    critical_skills = company["skills"]["critical"]
-    preferred_skills = company["skills"]["preferred"]
-    bonus_skills = company["skills"]["bonus"]
-    
-    # Critical skills (30 points)
-    critical_match = 0
-    for skill in critical_skills:
-        skill_lower = skill.lower()
-        if any(skill_lower in s for s in resume_skills_lower):
-            critical_match += 1
-            details.append(f"✅ {skill} - Critical skill matched")
-    
-    critical_score = (critical_match / len(critical_skills)) * 30
-    score += critical_score
-    
-    # Preferred skills (15 points)
-    preferred_match = 0
-    for skill in preferred_skills:
-        skill_lower = skill.lower()
-        if any(skill_lower in s for s in resume_skills_lower):
-            preferred_match += 1
-            details.append(f"✓ {skill} - Preferred skill matched")
-    
-    if preferred_skills:
-        preferred_score = (preferred_match / len(preferred_skills)) * 15
-        score += preferred_score
-    
-    # Bonus skills (5 points)
-    bonus_match = 0
-    for skill in bonus_skills:
-        skill_lower = skill.lower()
-        if any(skill_lower in s for s in resume_skills_lower):
-            bonus_match += 1
-            details.append(f"+ {skill} - Bonus skill matched")
+    # Skill Match (50 points) - critical 30, preferred 15, bonus 5
+    tier_points = {"critical": 30, "preferred": 15, "bonus": 5}
+    tier_labels = {
+        "critical": "✅ {} - Critical skill matched",
+        "preferred": "✓ {} - Preferred skill matched",
+        "bonus": "+ {} - Bonus skill matched"
+    }
     
-    if bonus_skills:
-        bonus_score = (bonus_match / len(bonus_skills)) * 5
-        score += bonus_score
+    for tier, points in tier_points.items():
+        tier_mask = COMPANY_SKILL_MASKS[company_name][tier]
+        if not tier_mask:
+            continue
+        matched_mask = skill_mask & tier_mask
+        score += (matched_mask.bit_count() / tier_mask.bit_count()) * points
+        for skill in company["skills"][tier]:
+            if has_skill(matched_mask, skill):
+                details.append(tier_labels[tier].format(skill))
     
     # CGPA Check (10 points)
     try:
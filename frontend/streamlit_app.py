@@ -13,7 +13,7 @@ import os
 from constants import INDUSTRY_TEMPLATES, EXPERIENCE_LEVELS, get_sample_jd
 from utils import clear_history, init_db, save_scan_history, load_scan_history, check_ml_status_realtime, get_ml_insights, enhance_bullet_point, calculate_optimized_score
 from utils import generate_ats_pdf, update_pdf_export_flag, update_company_sim_count, get_user_stats
-from utils import delete_scan, delete_multiple_scans, get_scan_by_id
+from utils import delete_scan, delete_multiple_scans, get_scan_by_id, run_scan_job
 from components import render_sidebar, render_resume_input, render_job_description, display_ml_insights
 from components import display_score_tab, display_keyword_tab, display_normalization_tab, display_recommendations_tab
 from achievements import display_achievements, check_achievements, calculate_user_level, ACHIEVEMENTS
@@ -614,26 +614,20 @@ if app_mode == "📤 Scan Resume":
                             "job_description": job_description,
                             "job_title": job_title if job_title else industry.replace("💻 ", "").replace("🏦 ", "").replace("🏭 ", "").replace("🏛️ ", "").replace("📊 ", "").replace("📱 ", "")
                         }
-                        response = requests.post(f"{API_URL}/api/scan", files=files, data=data)
+                        results, scan_error = run_scan_job(API_URL, files=files, data=data)
                         resume_name = uploaded_file.name
                         text_for_ml = "Resume from file"
-                        if response.status_code == 200:
-                            results = response.json()
-                            st.session_state.company_skills = results.get("parsed_data", {}).get("skills", [])
                     else:
                         data = {
                             "resume_text": resume_text,
                             "job_description": job_description
                         }
-                        response = requests.post(f"{API_URL}/api/analyze-text", data=data)
+                        results, scan_error = run_scan_job(API_URL, data=data)
                         resume_name = "Pasted Resume"
                         text_for_ml = resume_text
-                        if response.status_code == 200:
-                            results = response.json()
-                            st.session_state.company_skills = results.get("parsed_data", {}).get("skills", [])
                     
-                    if response.status_code == 200:
-                        results = response.json()
+                    if results is not None:
+                        st.session_state.company_skills = results.get("parsed_data", {}).get("skills", [])
                         
                         save_scan_history(
                             resume_name=resume_name,
@@ -796,7 +790,7 @@ GENERATED BY INDIAN ATS RESUME SCANNER v3.0
                                         """, unsafe_allow_html=True)
                         
                     else:
-                        st.error(f"❌ Error: {response.status_code}")
+                        st.error(f"❌ Error: {scan_error}")
                 except requests.exceptions.ConnectionError:
                     st.error("⚠️ Backend server not running! Start with: python app.py")
                 except Exception as e:
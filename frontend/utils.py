@@ -10,6 +10,7 @@ import json
 import streamlit as st
 import os
 import tempfile
+import time
 
 # ============= PDF LIBRARY CHECK =============
 # Try to import FPDF, provide helpful error if not installed
@@ -204,6 +205,52 @@ def get_ml_insights(resume_text, job_description):
         pass
     return None
 
+# ============= SCAN JOB FUNCTIONS =============
+def _response_json(response):
+    """Parsed JSON body, or None when the body is not JSON (proxy 502/504, plain-text 500)"""
+    try:
+        return response.json()
+    except ValueError:
+        return None
+
+def _error_message(response):
+    """'<status> - <detail>' from a FastAPI error body, falling back to the raw text"""
+    body = _response_json(response)
+    detail = body.get('detail') if isinstance(body, dict) else None
+    return f"{response.status_code} - {detail or response.text}"
+
+def run_scan_job(api_url, files=None, data=None, timeout=180, poll_interval=1.0):
+    """
+    Submit a scan to the backend job queue and poll until it finishes.
+    Returns (results, error) - exactly one of them is None.
+    """
+    response = requests.post(f"{api_url}/api/jobs", files=files, data=data, timeout=30)
+    if response.status_code != 202:
+        return None, _error_message(response)
+    
+    body = _response_json(response)
+    poll_path = body.get('poll_url') if isinstance(body, dict) else None
+    if not poll_path:
+        return None, f"{response.status_code} - No poll URL in response: {response.text[:200]}"
+    
+    poll_url = f"{api_url}{poll_path}"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(poll_interval)
+        response = requests.get(poll_url, timeout=10)
+        if response.status_code != 200:
+            return None, _error_message(response)
+        job = _response_json(response)
+        if not isinstance(job, dict):
+            return None, f"{response.status_code} - Unexpected response: {response.text[:200]}"
+        status = job.get("status")
+        if status == "completed":
+            return job.get("result"), None
+        if status == "failed":
+            return None, job.get("error") or "Scan failed"
+    
+    return None, f"Scan still running after {timeout}s - please try again"
+
 # ============= TEXT UTILITIES =============
 def enhance_bullet_point(text):
     """Enhance bullet points with strong action verbs"""